@@ -0,0 +1,294 @@
+"""
+pycam benchmark suite.
+
+Runs against SimulatedCameraAPI, so results only depend on pycam overhead and
+the simulated latency. Writes machine-readable JSON to compare versions:
+
+    python -m benchmarks.run --output bench.json --latency 0.02 --jitter 0.005
+"""
+
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from pycam.api.cached import CachedCameraAPI
+from pycam.api.simulated import SimulatedCameraAPI
+from pycam.calibration import compute_calibration
+from pycam.camera import Camera
+from pycam.config.config import CameraConfig
+from pycam.fleet import CameraFleet
+from pycam.pipeline import FramePipeline
+from pycam.stream import SyntheticReader
+
+CONFIG_YAML = """
+host: {host}
+user:
+  camera: admin
+  cloud: admin
+flip_image: true
+daynight_mode: day
+start_position:
+   pan: 10.0
+   tilt: 25.0
+homing:
+   mode: {homing}
+"""
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "mean": statistics.fmean(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+    }
+
+
+def timed(fn: Callable[[], Any], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+class Bench:
+    def __init__(self, args: argparse.Namespace, workdir: Path):
+        self.args = args
+        self.workdir = workdir
+        os.environ.setdefault("PASSWORD_CAMERA", "benchmark")
+        os.environ.setdefault("PASSWORD_CLOUD", "benchmark")
+
+    def config(self, host: str = "sim-0", homing: str = "auto") -> CameraConfig:
+        path = self.workdir / f"{host}-{homing}.yaml"
+        path.write_text(CONFIG_YAML.format(host=host, homing=homing))
+        return CameraConfig(str(path))
+
+    def api(self, host: str = "sim-0") -> SimulatedCameraAPI:
+        return SimulatedCameraAPI(
+            host,
+            latency=self.args.latency,
+            jitter=self.args.jitter,
+            failure_rate=self.args.failure_rate,
+            seed=0,
+        )
+
+    def import_time(self) -> Dict[str, Any]:
+        results = {}
+        for statement in IMPORT_STATEMENTS:
+            script = (
+                "import sys, time\n"
+                "start = time.perf_counter()\n"
+                f"{statement}\n"
+                "elapsed = time.perf_counter() - start\n"
+                "loaded = [m for m in HEAVY_MODULES if m in sys.modules\n"
+                "          and not type(sys.modules[m]).__name__ == 'LazyModule']\n"
+                "print(elapsed, ','.join(loaded))\n"
+            ).replace("HEAVY_MODULES", repr(HEAVY_MODULES))
+            samples, loaded = [], ""
+            for _ in range(self.args.repeat):
+                # A fresh interpreter per sample, so nothing is already imported
+                out = subprocess.run(
+                    [sys.executable, "-c", script], capture_output=True, text=True, check=True
+                ).stdout.split(" ")
+                samples.append(float(out[0]))
+                loaded = out[1].strip()
+            results[statement] = {
+                **summarize(samples),
+                "loaded": loaded.split(",") if loaded else [],
+            }
+        return results
+
+    def camera_construction(self) -> Dict[str, Any]:
+        config = self.config()
+        cameras: List[Camera] = []
+        samples = timed(lambda: cameras.append(Camera(self.api(), config)), self.args.repeat)
+        for camera in cameras:
+            camera.close()
+        return summarize(samples)
+
+    def queries(self) -> Dict[str, Any]:
+        results: Dict[str, Any] = {}
+        n = self.args.calls
+        for name, api in (("direct", self.api()), ("cached", CachedCameraAPI(self.api()))):
+            for method in ("get_info", "get_video_specs"):
+                fn = getattr(api, method)
+                start = time.perf_counter()
+                errors = 0
+                for _ in range(n):
+                    try:
+                        fn()
+                    except Exception:
+                        errors += 1
+                elapsed = time.perf_counter() - start
+                results[f"{method}.{name}"] = {
+                    "calls_per_second": n / elapsed,
+                    "errors": errors,
+                }
+        return results
+
+    def move_motor(self) -> Dict[str, Any]:
+        camera = Camera(self.api(), self.config())
+        try:
+            samples = timed(lambda: camera.move_motor(1.0, 0.5), self.args.calls)
+        finally:
+            camera.close()
+        return summarize(samples)
+
+    def fleet_bringup(self) -> Dict[str, Any]:
+        configs = [self.config(f"sim-{i}") for i in range(self.args.cameras)]
+        factory = lambda config: Camera(self.api(config.host), config)
+        results = {}
+        for workers in (1, self.args.workers):
+            # Leaving the fleet closes its cameras, outside of the measurement
+            with CameraFleet(configs, max_workers=workers, camera_factory=factory) as fleet:
+                start = time.perf_counter()
+                started = fleet.start()
+                elapsed = time.perf_counter() - start
+            results[f"workers_{workers}"] = {
+                "seconds": elapsed,
+                "failed": sum(1 for r in started.values() if not r.ok),
+            }
+        return results
+
+    def calibration(self) -> Dict[str, Any]:
+        directory = self.workdir / "calibration"
+        directory.mkdir(exist_ok=True)
+        write_chessboards(directory, self.args.images)
+        pattern = str(directory / "*.png")
+        results = {}
+        for workers in (1, self.args.workers):
+            start = time.perf_counter()
+            _, stats = compute_calibration(pattern, workers=workers, return_stats=True)
+            elapsed = time.perf_counter() - start
+            results[f"workers_{workers}"] = {
+                "seconds": elapsed,
+                "images_per_second": len(stats.detections) / elapsed,
+                "found": stats.found,
+            }
+        return results
+
+    def pipeline(self) -> Dict[str, Any]:
+        variants = {
+            "full": {},
+            "every_5": {"every": 5},
+            "width_640": {"width": 640},
+            "width_640_gray": {"width": 640, "grayscale": True},
+            "roi_width_640_gray": {
+                "roi": (576, 324, 1152, 648),
+                "width": 640,
+                "grayscale": True,
+            },
+        }
+        results = {}
+        for name, options in variants.items():
+            reader = SyntheticReader(2304, 1296, fps=0)
+            pipeline = FramePipeline(reader, **options)
+            pipeline.open()
+            start = time.perf_counter()
+            for _ in range(self.args.frames):
+                pipeline.read()
+            elapsed = time.perf_counter() - start
+            results[name] = {
+                "frames_per_second": self.args.frames / elapsed,
+                "source_frames_per_second": self.args.frames
+                * options.get("every", 1)
+                / elapsed,
+            }
+        return results
+
+
+def write_chessboards(directory: Path, count: int, size=(1920, 1080)):
+    square = 80
+    board = np.kron(
+        (np.indices((7, 10)).sum(axis=0) % 2).astype(np.uint8) * 255,
+        np.ones((square, square), dtype=np.uint8),
+    )
+    board = cv2.copyMakeBorder(board, 80, 80, 80, 80, cv2.BORDER_CONSTANT, value=255)
+    h, w = board.shape
+    src = np.float32([[0, 0], [w, 0], [w, h], [0, h]])
+    rng = np.random.default_rng(0)
+    for i in range(count):
+        dst = src + np.float32([400, 150]) + rng.uniform(-80, 80, (4, 2)).astype(np.float32)
+        H = cv2.getPerspectiveTransform(src, dst)
+        image = cv2.warpPerspective(board, H, size, borderValue=255)
+        cv2.imwrite(str(directory / f"board_{i:03d}.png"), image)
+
+
+IMPORT_STATEMENTS = (
+    "import pycam",
+    "from pycam import CameraConfig",
+    "from pycam import Camera",
+    "from pycam import PytapoClient",
+)
+HEAVY_MODULES = ("cv2", "numpy", "pytapo")
+
+BENCHMARKS = (
+    "import_time",
+    "camera_construction",
+    "queries",
+    "move_motor",
+    "fleet_bringup",
+    "calibration",
+    "pipeline",
+)
+
+
+def pycam_version() -> str:
+    try:
+        return metadata.version("pycam")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="pycam benchmarks")
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--only", nargs="*", choices=BENCHMARKS, default=BENCHMARKS)
+    parser.add_argument("--latency", type=float, default=0.01, help="seconds per call")
+    parser.add_argument("--jitter", type=float, default=0.002)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--cameras", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--images", type=int, default=16)
+    parser.add_argument("--frames", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    report: Dict[str, Any] = {
+        "pycam_version": pycam_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "parameters": {k: v for k, v in vars(args).items() if k not in ("output", "only")},
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        bench = Bench(args, Path(workdir))
+        for name in args.only:
+            print(f"Running {name}...", file=sys.stderr)
+            report["results"][name] = getattr(bench, name)()
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report["results"], indent=2))
+
+
+if __name__ == "__main__":
+    main()
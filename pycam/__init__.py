@@ -1,29 +1,100 @@
-from .camera import Camera
-from .api.api import CameraAPI
-from .api.tapo import PytapoClient
-from .schemas import Info, VideoQuality, VideoCapability, DayNightMode
-from .errors import CameraError, CommandError, ConnectionError, AuthenticationError
-from .wrappers.tapo_camera import TapoCamera
+from typing import TYPE_CHECKING
+import importlib
 
-from .config.secrets import CameraSecrets
-from .config.settings import CameraSettings
-from .config.config import CameraConfig
+# Submodules are imported on first attribute access, so `import pycam` stays
+# cheap and OpenCV, numpy or pytapo are only loaded by the features using them.
+_EXPORTS = {
+    "Camera": ".camera",
+    "AsyncCamera": ".async_camera",
+    "CameraFleet": ".fleet",
+    "FleetResult": ".fleet",
+    "Frame": ".stream",
+    "FrameSource": ".stream",
+    "FramePipeline": ".pipeline",
+    "DecodeMode": ".pipeline",
+    "MotionRecorder": ".recorder",
+    "PTZTracker": ".tracking",
+    "TrackingPolicy": ".tracking",
+    "FramePublisher": ".framebus",
+    "FrameSubscriber": ".framebus",
+    "TapoCamera": ".wrappers.tapo_camera",
+    "CameraAPI": ".api.api",
+    "AsyncCameraAPI": ".api.async_api",
+    "ExecutorCameraAPI": ".api.async_api",
+    "CameraConfig": ".config.config",
+    "PytapoClient": ".api.tapo",
+    "CameraAPIProxy": ".api.proxy",
+    "CachedCameraAPI": ".api.cached",
+    "ResilientCameraAPI": ".api.resilient",
+    "SimulatedCameraAPI": ".api.simulated",
+    "RetryPolicy": ".resilience",
+    "CircuitBreaker": ".resilience",
+    "BreakerState": ".resilience",
+    "CameraCalibration": ".calibration",
+    "PositionStore": ".position",
+    "QualityController": ".quality",
+    "QualityPolicy": ".quality",
+    "Info": ".schemas",
+    "VideoQuality": ".schemas",
+    "VideoCapability": ".schemas",
+    "DayNightMode": ".schemas",
+    "CameraError": ".errors",
+    "CommandError": ".errors",
+    "CircuitOpenError": ".errors",
+    "ConnectionError": ".errors",
+    "AuthenticationError": ".errors",
+    "CameraSecrets": ".config.secrets",
+    "CameraSettings": ".config.settings",
+    "ConfigWatcher": ".config.watcher",
+}
 
 # Clean namespace for `from camera import *`
-__all__ = [
-    "Camera",
-    "TapoCamera",
-    "CameraAPI",
-    "CameraConfig",
-    "PytapoClient",
-    "Info",
-    "VideoQuality",
-    "VideoCapability",
-    "DayNightMode",
-    "CameraError",
-    "CommandError",
-    "ConnectionError",
-    "AuthenticationError",
-    "CameraSecrets",
-    "CameraSettings",
-]
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *_EXPORTS])
+
+
+if TYPE_CHECKING:
+    from .camera import Camera
+    from .async_camera import AsyncCamera
+    from .fleet import CameraFleet, FleetResult
+    from .stream import Frame, FrameSource
+    from .framebus import FramePublisher, FrameSubscriber
+    from .pipeline import FramePipeline, DecodeMode
+    from .recorder import MotionRecorder
+    from .tracking import PTZTracker, TrackingPolicy
+    from .wrappers.tapo_camera import TapoCamera
+    from .api.api import CameraAPI
+    from .api.async_api import AsyncCameraAPI, ExecutorCameraAPI
+    from .api.tapo import PytapoClient
+    from .api.proxy import CameraAPIProxy
+    from .api.cached import CachedCameraAPI
+    from .api.resilient import ResilientCameraAPI
+    from .api.simulated import SimulatedCameraAPI
+    from .resilience import RetryPolicy, CircuitBreaker, BreakerState
+    from .calibration import CameraCalibration
+    from .position import PositionStore
+    from .quality import QualityController, QualityPolicy
+    from .schemas import Info, VideoQuality, VideoCapability, DayNightMode
+    from .errors import (
+        CameraError,
+        CommandError,
+        CircuitOpenError,
+        ConnectionError,
+        AuthenticationError,
+    )
+    from .config.secrets import CameraSecrets
+    from .config.settings import CameraSettings
+    from .config.config import CameraConfig
+    from .config.watcher import ConfigWatcher
@@ -4,6 +4,8 @@ from typing import Optional
 from ..schemas import (
     DayNightMode,
     Info,
+    VideoQuality,
+    VideoSettings,
     VideoSpecs,
     VideoCapability,
 )
@@ -22,12 +24,20 @@ class CameraAPI(ABC):
     @abstractmethod
     def get_video_capabilities(self) -> VideoCapability: ...
 
+    def set_video_specs(self, settings: VideoSettings):
+        """Changes main stream parameters. Optional, not every camera supports it."""
+        raise NotImplementedError
+
     @abstractmethod
     def move_motor(self, pan: float, tilt: float) -> bool: ...
 
     @abstractmethod
     def calibrate_motor(self): ...
 
+    def is_motor_moving(self) -> bool:
+        """Returns if the motor is moving. Optional, not every camera reports it."""
+        raise NotImplementedError
+
     @abstractmethod
     def reboot(self): ...
 
@@ -44,4 +54,7 @@ class CameraAPI(ABC):
     def flip_image(self, flag: bool): ...
 
     @abstractmethod
-    def get_url(self, config: Optional[CameraConfig]) -> str: ...
+    def get_url(
+        self, config: Optional[CameraConfig], quality: Optional[VideoQuality] = None
+    ) -> str:
+        """RTSP url of the stream for quality, by default config.video_quality."""
@@ -0,0 +1,164 @@
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+import asyncio
+import functools
+import threading
+
+from .api import CameraAPI
+from ..schemas import (
+    DayNightMode,
+    Info,
+    VideoQuality,
+    VideoSettings,
+    VideoSpecs,
+    VideoCapability,
+)
+from ..config.config import CameraConfig
+
+R = TypeVar("R")
+
+DEFAULT_MAX_WORKERS = 64
+
+_default_executor: Optional[ThreadPoolExecutor] = None
+_default_executor_lock = threading.Lock()
+
+
+def get_default_executor() -> ThreadPoolExecutor:
+    """Shared thread pool used by ExecutorCameraAPI instances without their own executor."""
+    global _default_executor
+    with _default_executor_lock:
+        if _default_executor is None:
+            _default_executor = ThreadPoolExecutor(
+                max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="pycam"
+            )
+        return _default_executor
+
+
+class AsyncCameraAPI(ABC):
+    """Abstract asyncio interface for any camera implementation."""
+
+    @abstractmethod
+    async def get_info(self) -> Info: ...
+
+    @abstractmethod
+    async def get_video_specs(self) -> VideoSpecs: ...
+
+    @abstractmethod
+    async def get_video_capabilities(self) -> VideoCapability: ...
+
+    async def set_video_specs(self, settings: VideoSettings):
+        """Changes main stream parameters. Optional, not every camera supports it."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def move_motor(self, pan: float, tilt: float) -> bool: ...
+
+    @abstractmethod
+    async def calibrate_motor(self): ...
+
+    async def is_motor_moving(self) -> bool:
+        """Returns if the motor is moving. Optional, not every camera reports it."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def reboot(self): ...
+
+    @abstractmethod
+    async def set_daynight_mode(self, mode): ...
+
+    @abstractmethod
+    async def get_daynight_mode(self) -> DayNightMode: ...
+
+    @abstractmethod
+    async def is_image_flipped(self) -> bool: ...
+
+    @abstractmethod
+    async def flip_image(self, flag: bool): ...
+
+    @abstractmethod
+    def get_url(
+        self, config: Optional[CameraConfig], quality: Optional[VideoQuality] = None
+    ) -> str: ...
+
+
+class ExecutorCameraAPI(AsyncCameraAPI):
+    """
+    Runs a blocking CameraAPI in a thread pool.
+
+    Calls to the same camera are serialized (max_concurrency), while calls to
+    different cameras run in parallel up to the executor size.
+    """
+
+    def __init__(
+        self,
+        api: CameraAPI,
+        executor: Optional[Executor] = None,
+        max_concurrency: int = 1,
+    ):
+        self._api = api
+        self._executor = executor
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @classmethod
+    async def connect(
+        cls,
+        factory: Callable[[], CameraAPI],
+        executor: Optional[Executor] = None,
+        max_concurrency: int = 1,
+    ) -> "ExecutorCameraAPI":
+        """Builds the blocking API (e.g. PytapoClient login) without blocking the loop."""
+        loop = asyncio.get_running_loop()
+        api = await loop.run_in_executor(executor or get_default_executor(), factory)
+        return cls(api, executor, max_concurrency)
+
+    @property
+    def api(self) -> CameraAPI:
+        return self._api
+
+    async def get_info(self) -> Info:
+        return await self._run(self._api.get_info)
+
+    async def get_video_specs(self) -> VideoSpecs:
+        return await self._run(self._api.get_video_specs)
+
+    async def get_video_capabilities(self) -> VideoCapability:
+        return await self._run(self._api.get_video_capabilities)
+
+    async def set_video_specs(self, settings: VideoSettings):
+        return await self._run(self._api.set_video_specs, settings)
+
+    async def move_motor(self, pan: float, tilt: float) -> bool:
+        return await self._run(self._api.move_motor, pan, tilt)
+
+    async def calibrate_motor(self):
+        return await self._run(self._api.calibrate_motor)
+
+    async def is_motor_moving(self) -> bool:
+        return await self._run(self._api.is_motor_moving)
+
+    async def reboot(self):
+        return await self._run(self._api.reboot)
+
+    async def set_daynight_mode(self, mode: DayNightMode):
+        return await self._run(self._api.set_daynight_mode, mode)
+
+    async def get_daynight_mode(self) -> DayNightMode:
+        return await self._run(self._api.get_daynight_mode)
+
+    async def is_image_flipped(self) -> bool:
+        return await self._run(self._api.is_image_flipped)
+
+    async def flip_image(self, flag: bool):
+        return await self._run(self._api.flip_image, flag)
+
+    def get_url(
+        self, config: Optional[CameraConfig], quality: Optional[VideoQuality] = None
+    ) -> str:
+        return self._api.get_url(config, quality)
+
+    async def _run(self, fn: Callable[..., R], *args) -> R:
+        loop = asyncio.get_running_loop()
+        executor = self._executor or get_default_executor()
+        async with self._semaphore:
+            return await loop.run_in_executor(executor, functools.partial(fn, *args))
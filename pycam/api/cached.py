@@ -0,0 +1,149 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+import copy
+import threading
+import time
+
+from .api import CameraAPI
+from .proxy import CameraAPIProxy
+from ..schemas import (
+    DayNightMode,
+    Info,
+    VideoSettings,
+    VideoSpecs,
+    VideoCapability,
+)
+
+R = TypeVar("R")
+
+# Time to live (seconds) of each cached query
+DEFAULT_TTLS: Dict[str, float] = {
+    "get_info": 60.0,
+    "get_video_specs": 30.0,
+    "get_video_capabilities": 300.0,
+    "get_daynight_mode": 10.0,
+    "is_image_flipped": 10.0,
+}
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+class CachedCameraAPI(CameraAPIProxy):
+    """
+    CameraAPI caching read-mostly device queries for a configurable time.
+
+    Setters invalidate the queries they affect. A TTL of 0 disables caching
+    for that query.
+    """
+
+    def __init__(
+        self,
+        api: CameraAPI,
+        ttls: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(api)
+        self._ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._clock = clock
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._stats = {name: CacheStats() for name in self._ttls}
+        # Bumped on invalidation, so values fetched before it are not stored
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> Dict[str, CacheStats]:
+        """Hit/miss counters per query."""
+        with self._lock:
+            return {name: copy.copy(stats) for name, stats in self._stats.items()}
+
+    @property
+    def hits(self) -> int:
+        with self._lock:
+            return sum(stats.hits for stats in self._stats.values())
+
+    @property
+    def misses(self) -> int:
+        with self._lock:
+            return sum(stats.misses for stats in self._stats.values())
+
+    def invalidate(self, *names: str):
+        """Drops the cached value of the given queries, or of every query if none given."""
+        with self._lock:
+            self._generation += 1
+            if not names:
+                self._entries.clear()
+            for name in names:
+                self._entries.pop(name, None)
+
+    # --- Cached queries ---
+    def get_info(self) -> Info:
+        return self._cached("get_info", self._api.get_info)
+
+    def get_video_specs(self) -> VideoSpecs:
+        return self._cached("get_video_specs", self._api.get_video_specs)
+
+    def get_video_capabilities(self) -> VideoCapability:
+        return self._cached("get_video_capabilities", self._api.get_video_capabilities)
+
+    def get_daynight_mode(self) -> DayNightMode:
+        return self._cached("get_daynight_mode", self._api.get_daynight_mode)
+
+    def is_image_flipped(self) -> bool:
+        return self._cached("is_image_flipped", self._api.is_image_flipped)
+
+    # --- Invalidating commands ---
+    def calibrate_motor(self):
+        try:
+            return self._api.calibrate_motor()
+        finally:
+            self.invalidate("get_info")
+
+    def reboot(self):
+        try:
+            return self._api.reboot()
+        finally:
+            self.invalidate()
+
+    def set_daynight_mode(self, mode: DayNightMode):
+        try:
+            return self._api.set_daynight_mode(mode)
+        finally:
+            self.invalidate("get_daynight_mode")
+
+    def flip_image(self, flag: bool):
+        try:
+            return self._api.flip_image(flag)
+        finally:
+            self.invalidate("is_image_flipped")
+
+    def set_video_specs(self, settings: VideoSettings):
+        try:
+            return self._api.set_video_specs(settings)
+        finally:
+            self.invalidate("get_video_specs")
+
+    ### INTERNAL
+
+    def _cached(self, name: str, fn: Callable[[], R]) -> R:
+        ttl = self._ttls.get(name, 0.0)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and now < entry[0]:
+                self._stats[name].hits += 1
+                # Results hold nested lists (capabilities), never share the cached one
+                return copy.deepcopy(entry[1])
+            self._stats[name].misses += 1
+            generation = self._generation
+
+        value = fn()
+        if ttl > 0:
+            with self._lock:
+                if generation == self._generation:
+                    self._entries[name] = (now + ttl, value)
+        return copy.deepcopy(value)
@@ -0,0 +1,70 @@
+from typing import Optional
+
+from .api import CameraAPI
+from ..schemas import (
+    DayNightMode,
+    Info,
+    VideoQuality,
+    VideoSettings,
+    VideoSpecs,
+    VideoCapability,
+)
+from ..config.config import CameraConfig
+
+
+class CameraAPIProxy(CameraAPI):
+    """
+    CameraAPI that forwards every call to another CameraAPI.
+
+    Base class for layers adding behaviour (caching, retries...) on top of a
+    concrete implementation. Subclasses override only the methods they change.
+    """
+
+    def __init__(self, api: CameraAPI):
+        self._api = api
+
+    @property
+    def api(self) -> CameraAPI:
+        """Wrapped CameraAPI."""
+        return self._api
+
+    def get_info(self) -> Info:
+        return self._api.get_info()
+
+    def get_video_specs(self) -> VideoSpecs:
+        return self._api.get_video_specs()
+
+    def get_video_capabilities(self) -> VideoCapability:
+        return self._api.get_video_capabilities()
+
+    def set_video_specs(self, settings: VideoSettings):
+        return self._api.set_video_specs(settings)
+
+    def move_motor(self, pan: float, tilt: float) -> bool:
+        return self._api.move_motor(pan, tilt)
+
+    def calibrate_motor(self):
+        return self._api.calibrate_motor()
+
+    def is_motor_moving(self) -> bool:
+        return self._api.is_motor_moving()
+
+    def reboot(self):
+        return self._api.reboot()
+
+    def set_daynight_mode(self, mode: DayNightMode):
+        return self._api.set_daynight_mode(mode)
+
+    def get_daynight_mode(self) -> DayNightMode:
+        return self._api.get_daynight_mode()
+
+    def is_image_flipped(self) -> bool:
+        return self._api.is_image_flipped()
+
+    def flip_image(self, flag: bool):
+        return self._api.flip_image(flag)
+
+    def get_url(
+        self, config: Optional[CameraConfig], quality: Optional[VideoQuality] = None
+    ) -> str:
+        return self._api.get_url(config, quality)
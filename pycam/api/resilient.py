@@ -0,0 +1,87 @@
+from typing import Callable, Optional, TypeVar
+import time
+
+from .api import CameraAPI
+from .proxy import CameraAPIProxy
+from ..resilience import CircuitBreaker, RetryPolicy, call_with_retry
+from ..schemas import (
+    DayNightMode,
+    Info,
+    VideoSettings,
+    VideoSpecs,
+    VideoCapability,
+)
+
+R = TypeVar("R")
+
+NO_RETRY = RetryPolicy(attempts=1)
+
+
+class ResilientCameraAPI(CameraAPIProxy):
+    """
+    CameraAPI with retries and a circuit breaker per camera.
+
+    Idempotent calls (queries and absolute setters) are retried with jittered
+    exponential backoff. Relative moves, motor calibration and reboot are sent
+    once. Every call goes through the breaker, so an unreachable camera fails
+    fast with CircuitOpenError.
+    """
+
+    def __init__(
+        self,
+        api: CameraAPI,
+        policy: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        super().__init__(api)
+        self._policy = policy or RetryPolicy()
+        self._breaker = breaker or CircuitBreaker()
+        self._sleep = sleep
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self._breaker
+
+    # --- Idempotent ---
+    def get_info(self) -> Info:
+        return self._retry(self._api.get_info)
+
+    def get_video_specs(self) -> VideoSpecs:
+        return self._retry(self._api.get_video_specs)
+
+    def get_video_capabilities(self) -> VideoCapability:
+        return self._retry(self._api.get_video_capabilities)
+
+    def get_daynight_mode(self) -> DayNightMode:
+        return self._retry(self._api.get_daynight_mode)
+
+    def is_image_flipped(self) -> bool:
+        return self._retry(self._api.is_image_flipped)
+
+    def set_daynight_mode(self, mode: DayNightMode):
+        return self._retry(lambda: self._api.set_daynight_mode(mode))
+
+    def flip_image(self, flag: bool):
+        return self._retry(lambda: self._api.flip_image(flag))
+
+    def set_video_specs(self, settings: VideoSettings):
+        return self._retry(lambda: self._api.set_video_specs(settings))
+
+    # --- Sent once ---
+    def move_motor(self, pan: float, tilt: float) -> bool:
+        return self._once(lambda: self._api.move_motor(pan, tilt))
+
+    def calibrate_motor(self):
+        return self._once(self._api.calibrate_motor)
+
+    def reboot(self):
+        return self._once(self._api.reboot)
+
+    ### INTERNAL
+
+    def _retry(self, fn: Callable[[], R]) -> R:
+        return call_with_retry(fn, self._policy, self._breaker, self._sleep)
+
+    def _once(self, fn: Callable[[], R]) -> R:
+        return call_with_retry(fn, NO_RETRY, self._breaker, self._sleep)
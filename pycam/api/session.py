@@ -0,0 +1,139 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Tuple, TypeVar
+import copy
+import threading
+import time
+import weakref
+
+R = TypeVar("R")
+
+# Fragments of pytapo error messages raised when the session token expired
+SESSION_ERROR_MARKERS = ("-40401", "invalid stok", "unauthorized", "expired")
+
+
+@dataclass
+class SessionStats:
+    logins: int = 0
+    reauths: int = 0
+    last_reauth_latency: float = 0.0
+    total_reauth_latency: float = 0.0
+
+
+def is_session_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return any(marker in message for marker in SESSION_ERROR_MARKERS)
+
+
+class TapoSession:
+    """
+    Authenticated connection to one device, shared by every client of that host.
+
+    Calls are serialized, since the underlying client is not thread safe. When
+    a call fails because the session expired, the session is re-established and
+    the call retried once.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._lock = threading.RLock()
+        self._stats = SessionStats()
+        self._client = self._login()
+
+    @property
+    def stats(self) -> SessionStats:
+        with self._lock:
+            return copy.copy(self._stats)
+
+    @property
+    def client(self) -> "SessionClient":
+        """Client whose methods run through call()."""
+        return SessionClient(self)
+
+    def call(self, fn: Callable[[Any], R]) -> R:
+        with self._lock:
+            try:
+                return fn(self._client)
+            except Exception as e:
+                if not is_session_error(e):
+                    raise
+            start = time.monotonic()
+            self._relogin()
+            try:
+                return fn(self._client)
+            finally:
+                latency = time.monotonic() - start
+                self._stats.reauths += 1
+                self._stats.last_reauth_latency = latency
+                self._stats.total_reauth_latency += latency
+
+    ### INTERNAL
+
+    def _login(self) -> Any:
+        client = self._factory()
+        self._stats.logins += 1
+        return client
+
+    def _relogin(self):
+        close = getattr(self._client, "close", None)
+        if close is not None:
+            try:
+                # Drops the token, the next request authenticates on the same connection
+                close()
+                self._stats.logins += 1
+                return
+            except Exception:
+                pass
+        self._client = self._login()
+
+
+class SessionClient:
+    """Forwards method calls to the session client, with transparent re-login."""
+
+    def __init__(self, session: TapoSession):
+        self._session = session
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        def method(*args, **kwargs):
+            return self._session.call(lambda client: getattr(client, name)(*args, **kwargs))
+
+        return method
+
+
+class SessionManager:
+    """
+    Pool of TapoSessions keyed by host and credentials.
+
+    Sessions live as long as a client holds them, so clients of the same
+    device created at the same time share a single login.
+    """
+
+    def __init__(self):
+        self._sessions: "weakref.WeakValueDictionary[Tuple[str, str, str], TapoSession]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._key_locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def acquire(
+        self, host: str, user: str, password: str, factory: Callable[[], Any]
+    ) -> TapoSession:
+        key = (host, user, password)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # Logins of different hosts run in parallel, the same host logs in once
+        with key_lock:
+            with self._lock:
+                session = self._sessions.get(key)
+            if session is None:
+                session = TapoSession(factory)
+                with self._lock:
+                    self._sessions[key] = session
+            return session
+
+    def stats(self) -> Dict[str, SessionStats]:
+        """Session counters per host."""
+        with self._lock:
+            return {key[0]: session.stats for key, session in self._sessions.items()}
+
+
+default_session_manager = SessionManager()
@@ -0,0 +1,166 @@
+from typing import Optional
+import copy
+import random
+import threading
+import time
+
+from .api import CameraAPI
+from ..errors import handle_errors
+from ..motion import MotorTimingProfile, get_motor_profile
+from ..schemas import (
+    Info,
+    VideoQuality,
+    VideoSpecs,
+    VideoCapability,
+    VideoSettings,
+    DayNightMode,
+    VideoEncodeType,
+    VideoBitrate,
+    VideoResolution,
+    VideoBitrateType,
+)
+from ..config.config import CameraConfig
+
+
+class SimulatedCameraAPI(CameraAPI):
+    """
+    In-process Tapo-like device for tests and benchmarks.
+
+    Every call sleeps latency +/- jitter seconds and fails with probability
+    failure_rate. Motor moves take the time given by motor_profile (by default
+    the device model timing profile), and are reported by is_motor_moving().
+    """
+
+    def __init__(
+        self,
+        host: str = "simulated",
+        device_model: str = "C200",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        resolution: VideoResolution = VideoResolution.RES_SUPER_HD,
+        motor_profile: Optional[MotorTimingProfile] = None,
+        seed: Optional[int] = None,
+    ):
+        self.host = host
+        self._device_model = device_model
+        self._latency = latency
+        self._jitter = jitter
+        self._failure_rate = failure_rate
+        self._specs: VideoSpecs = {
+            "bitrate": VideoBitrate.BR_2048,
+            "default_bitrate": VideoBitrate.BR_2048,
+            "bitrate_type": VideoBitrateType.VBR,
+            "frame_rate": 15,
+            "encode_type": VideoEncodeType.H264,
+            "resolution": resolution,
+            "quality": VideoQuality.HIGH,
+        }
+        self._profile = (
+            motor_profile
+            or get_motor_profile(device_model)
+            or MotorTimingProfile(pan_speed=100.0, tilt_speed=50.0)
+        )
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self._daynight_mode = DayNightMode.AUTO
+        self._flipped = False
+        self._motor_busy_until = 0.0
+        self.calls = 0
+
+    @handle_errors()
+    def get_info(self) -> Info:
+        self._request()
+        return {
+            "device_model": self._device_model,
+            "sw_version": "1.0.0 Build simulated",
+            "hw_version": "1.0",
+            "is_calibrated": True,
+        }
+
+    @handle_errors()
+    def get_video_specs(self) -> VideoSpecs:
+        self._request()
+        with self._lock:
+            return copy.copy(self._specs)
+
+    @handle_errors()
+    def set_video_specs(self, settings: VideoSettings):
+        self._request()
+        with self._lock:
+            self._specs.update(settings)  # type: ignore[typeddict-item]
+
+    @handle_errors()
+    def get_video_capabilities(self) -> VideoCapability:
+        self._request()
+        return {
+            "bitrates": list(VideoBitrate),
+            "bitrate_types": list(VideoBitrateType),
+            "frame_rates": [15, 20, 25],
+            "encode_types": list(VideoEncodeType),
+            "resolutions": list(VideoResolution),
+            "qualitys": list(VideoQuality),
+        }
+
+    @handle_errors()
+    def move_motor(self, pan: float, tilt: float) -> bool:
+        self._request()
+        with self._lock:
+            start = max(time.monotonic(), self._motor_busy_until)
+            self._motor_busy_until = start + self._profile.duration(pan, tilt)
+        return True
+
+    @handle_errors()
+    def calibrate_motor(self):
+        self._request()
+
+    @handle_errors()
+    def is_motor_moving(self) -> bool:
+        self._request()
+        with self._lock:
+            return time.monotonic() < self._motor_busy_until
+
+    @handle_errors()
+    def reboot(self):
+        self._request()
+
+    @handle_errors()
+    def set_daynight_mode(self, mode: DayNightMode):
+        self._request()
+        self._daynight_mode = mode
+
+    @handle_errors()
+    def get_daynight_mode(self) -> DayNightMode:
+        self._request()
+        return self._daynight_mode
+
+    @handle_errors()
+    def is_image_flipped(self) -> bool:
+        self._request()
+        return self._flipped
+
+    @handle_errors()
+    def flip_image(self, flag: bool):
+        self._request()
+        self._flipped = flag
+
+    def get_url(
+        self, config: Optional[CameraConfig], quality: Optional[VideoQuality] = None
+    ) -> str:
+        if quality is None:
+            quality = config.video_quality if config is not None else VideoQuality.HIGH
+        stream = "stream1" if quality == VideoQuality.HIGH else "stream2"
+        return f"rtsp://{self.host}/{stream}"
+
+    ### INTERNAL
+
+    def _request(self):
+        with self._lock:
+            self.calls += 1
+            delay = self._latency + self._rng.uniform(-self._jitter, self._jitter)
+            failed = self._rng.random() < self._failure_rate
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            raise RuntimeError("Simulated device error")
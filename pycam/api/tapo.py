@@ -4,12 +4,14 @@ from enum import IntFlag
 from pytapo import Tapo
 
 from .api import CameraAPI
+from .session import SessionManager, SessionStats, default_session_manager
 from ..errors import AuthenticationError, CommandError, handle_errors
 from ..schemas import (
     Info,
     VideoQuality,
     VideoSpecs,
     VideoCapability,
+    VideoSettings,
     DayNightMode,
     VideoEncodeType,
     VideoBitrate,
@@ -30,8 +32,23 @@ class PytapoClient(CameraAPI):
     """Wrapper around pytapo."""
 
     @handle_errors(error_type=AuthenticationError)
-    def __init__(self, config: CameraConfig):
-        self._client = Tapo(config.host, config.user_cloud, config.password_cloud)
+    def __init__(
+        self,
+        config: CameraConfig,
+        session_manager: SessionManager = default_session_manager,
+    ):
+        host, user, password = config.host, config.user_cloud, config.password_cloud
+        self.host = host
+        # Clients of the same device share one authenticated session
+        self._session = session_manager.acquire(
+            host, user, password, lambda: Tapo(host, user, password)
+        )
+        self._client = self._session.client
+
+    @property
+    def session_stats(self) -> SessionStats:
+        """Login count and re-authentication latency of the device session."""
+        return self._session.stats
 
     @handle_errors()
     def get_info(self) -> Info:
@@ -87,6 +104,21 @@ class PytapoClient(CameraAPI):
             ],
         }
 
+    @handle_errors()
+    def set_video_specs(self, settings: VideoSettings):
+        main = {}
+        if "bitrate" in settings:
+            main["bitrate"] = str(int(settings["bitrate"]))
+        if "frame_rate" in settings:
+            main["frame_rate"] = str(int(settings["frame_rate"]))
+        if "resolution" in settings:
+            main["resolution"] = settings["resolution"].value
+        if "quality" in settings:
+            main["quality"] = str(int(settings["quality"]))
+        if main:
+            # pytapo has no setter, the request mirrors getVideoQualities
+            self._client.executeFunction("setVideoQualities", {"video": {"main": main}})
+
     @handle_errors()
     def move_motor(self, pan: float, tilt: float) -> bool:
         try:
@@ -120,13 +152,16 @@ class PytapoClient(CameraAPI):
     def flip_image(self, flag: bool):
         self._client.setImageFlipVertical(flag)
 
-    def get_url(self, config: Optional[CameraConfig]) -> str:
+    def get_url(
+        self, config: Optional[CameraConfig], quality: Optional[VideoQuality] = None
+    ) -> str:
         if config is None:
             return ""
         user = config.user_camera
         pwd = config.password_camera
         port = config.port
         host = config.host
-        stream = "stream1" if config.video_quality == VideoQuality.HIGH else "stream2"
+        quality = config.video_quality if quality is None else quality
+        stream = "stream1" if quality == VideoQuality.HIGH else "stream2"
 
         return f"rtsp://{user}:{pwd}@{host}:{port}/{stream}"
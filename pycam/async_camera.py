@@ -0,0 +1,389 @@
+from typing import Awaitable, Callable, Optional, Tuple, TypeVar
+import asyncio
+import time
+
+from pycam.config.config import RuntimeConfig
+from .api.async_api import AsyncCameraAPI
+from .errors import CommandError, AuthenticationError
+from .schemas import Info, VideoSpecs, VideoCapability, DayNightMode, VideoQuality
+from .config.config import CameraConfig
+from .calibration import CameraCalibration
+from .camera import InitResult
+from .position import PositionStore
+from .motion import (
+    FALLBACK_MOTOR_PROFILE,
+    HomingMode,
+    MotionTimeModel,
+    MotorTimingProfile,
+    PAN_RANGE,
+    TILT_RANGE,
+    async_wait_until_arrived,
+    clamp_move,
+    get_motor_profile,
+    motor_wait,
+    plan_preset_move,
+    settle_preset_move,
+    start_move,
+    trusted_position,
+)
+
+R = TypeVar("R")
+
+
+class AsyncCamera:
+    """
+    Asyncio counterpart of Camera.
+
+    Can control any camera implementing the AsyncCameraAPI interface. Use
+    AsyncCamera.create() to build and initialize it, or create(lazy=True) to
+    initialize it in a background task awaited by ready() or first use.
+    """
+
+    def __init__(
+        self,
+        api: AsyncCameraAPI,
+        config: CameraConfig,
+        calib_path: Optional[str] = None,
+        position_store: Optional[PositionStore] = None,
+    ):
+        """
+        api: an instance of a concrete AsyncCameraAPI implementation (e.g., ExecutorCameraAPI)
+        position_store: last known motor positions, defaults to the store shared at config.state_path
+        """
+        self._api = api
+        self._config = config
+        self._calib_path = calib_path
+        if position_store is None and config.state_path:
+            position_store = PositionStore.shared(config.state_path)
+        self._positions = position_store
+        self._init_result = InitResult()
+
+        self._tilt = 90.0
+        self._pan = 360.0
+        self._homing_time = 0.0
+        self._motion_model: Optional[MotionTimeModel] = None
+        # time.monotonic() the last preset move is predicted to settle
+        self._arrival = 0.0
+        self._calibration: Optional[CameraCalibration] = None
+        self._init_task: Optional["asyncio.Task[None]"] = None
+
+    @classmethod
+    async def create(
+        cls,
+        api: AsyncCameraAPI,
+        config: CameraConfig,
+        calib_path: Optional[str] = None,
+        lazy: bool = False,
+        position_store: Optional[PositionStore] = None,
+    ) -> "AsyncCamera":
+        """
+        Builds the camera and sends the configured options to the device.
+
+        With lazy=True it returns immediately and initialization runs in a
+        background task, and the default calibration is only resolved by
+        get_calibration().
+        """
+        camera = cls(api, config, calib_path, position_store)
+        if calib_path:
+            camera._calibration = CameraCalibration.from_yaml(calib_path)
+        camera.start()
+        if not lazy:
+            await camera.ready()
+            await camera.get_calibration()
+        return camera
+
+    @property
+    def calibration(self) -> CameraCalibration:
+        if self._calibration is None:
+            raise RuntimeError(
+                "Calibration not resolved, use AsyncCamera.get_calibration()"
+            )
+        return self._calibration
+
+    @property
+    def init_result(self) -> InitResult:
+        """Which configured options had to be written to the device on initialization."""
+        return self._init_result
+
+    @property
+    def initialized(self) -> bool:
+        """True once the device was successfully initialized."""
+        task = self._init_task
+        return (
+            task is not None
+            and task.done()
+            and not task.cancelled()
+            and task.exception() is None
+        )
+
+    def start(self) -> "AsyncCamera":
+        """
+        Schedules device initialization on the running loop, if not started.
+
+        Calling it again after a failed initialization retries it.
+        """
+        task = self._init_task
+        if task is None or (task.done() and (task.cancelled() or task.exception())):
+            self._init_task = asyncio.get_running_loop().create_task(self._init_camera())
+        return self
+
+    async def ready(self):
+        """Starts initialization if needed and waits for it to finish."""
+        if self._init_task is None:
+            self.start()
+        # Shielded, so a cancelled caller does not cancel the shared initialization
+        await asyncio.shield(self._init_task)
+
+    async def get_calibration(self) -> CameraCalibration:
+        """Camera calibration, the default one is built on first call."""
+        if self._calibration is None:
+            width, height = await self._get_resolution()
+            self._calibration = CameraCalibration.default(width, height)
+        return self._calibration
+
+    async def get_motion_model(self) -> MotionTimeModel:
+        """
+        Motion time of this camera, seeded from its timing profile.
+
+        Learns from preset moves waited on, only if the API reports motor activity.
+        """
+        if self._motion_model is None:
+            profile = await self._motor_profile()
+            self._motion_model = MotionTimeModel(profile or FALLBACK_MOTOR_PROFILE)
+        return self._motion_model
+
+    @property
+    def tilt(self) -> float:
+        return self._tilt
+
+    @property
+    def pan(self) -> float:
+        return self._pan
+
+    @property
+    def homing_time(self) -> float:
+        """
+        Seconds initialization waited for the homing move.
+
+        Measured when the device reports motor activity; with a timing profile
+        or fixed homing it is the predicted wait, not the actual travel time.
+        """
+        return self._homing_time
+
+    ### Config
+    def get_config(self) -> RuntimeConfig:
+
+        return RuntimeConfig.from_config(self._config)
+
+    ### API
+    # --- Info / status methods ---
+    async def get_info(self) -> Info:
+        """Returns basic camera information including device_model, sw_version, hw_version..."""
+        return await self._api.get_info()
+
+    async def get_video_specs(self) -> VideoSpecs:
+        """Returns video configuration information such as encoding type, frame rate or bitrate"""
+        return await self._api.get_video_specs()
+
+    async def get_video_capabilities(self) -> VideoCapability:
+        """Returns video configuration options"""
+        return await self._api.get_video_capabilities()
+
+    async def get_daynight_mode(self) -> DayNightMode:
+        """Returns DayNightMode (nigh vision or day)"""
+        await self.ready()
+        return await self._api.get_daynight_mode()
+
+    # --- Motor control ---
+    async def move_motor(self, pan: float, tilt: float):
+        """Command motor to move in specicied pan and tilt angles (degrees)"""
+        await self.ready()
+        await self._move_motor(pan, tilt)
+
+    async def goto_preset(self, name: str, wait: bool = False) -> float:
+        """Moves to a preset of the config, see Camera.goto_preset()."""
+        await self.ready()
+        presets = self._config.presets
+        if name not in presets:
+            raise KeyError(f"Unknown preset: {name}")
+        move = plan_preset_move(
+            (self._pan, self._tilt),
+            presets[name],
+            time.monotonic(),
+            self._arrival,
+            await self.get_motion_model(),
+        )
+        if move.empty:
+            return move.arrival
+
+        await self._move_motor(move.pan, move.tilt)
+        self._arrival = move.arrival
+        if not wait:
+            return move.arrival
+
+        predicted = move.arrival - move.sent
+        settled = None
+        try:
+            settled = await async_wait_until_arrived(
+                self._api.is_motor_moving,
+                start_timeout=predicted,
+                timeout=predicted + self._config.homing_timeout,
+            )
+        except (NotImplementedError, CommandError):
+            pass
+        if settled is None:
+            # Motor activity is not observable, trust the prediction
+            await asyncio.sleep(max(move.arrival - time.monotonic(), 0.0))
+        self._arrival = settle_preset_move(move, settled, await self.get_motion_model())
+        return self._arrival
+
+    async def calibrate_motor(self):
+        """Run motor calibration routine"""
+        await self.ready()
+        await self._api.calibrate_motor()
+
+    async def reboot(self):
+        """Reboot camera"""
+        await self.ready()
+        # The device re-homes itself on boot
+        if self._positions:
+            await self._in_executor(self._positions.discard, self._config.host)
+        await self._api.reboot()
+
+    async def is_image_flipped(self) -> bool:
+        """Returns if image is flipped"""
+        await self.ready()
+        return await self._api.is_image_flipped()
+
+    async def flip_image(self, flag: bool) -> None:
+        """Command to flip image"""
+        await self.ready()
+        await self._api.flip_image(flag)
+
+    async def set_daynight_mode(self, mode: DayNightMode):
+        """Command to configure DayNight mode"""
+        await self.ready()
+        await self._api.set_daynight_mode(mode)
+
+    def get_url(self, quality: Optional[VideoQuality] = None) -> str:
+        """Get RTSP url, by default of the stream of the config"""
+        return self._api.get_url(self._config, quality)
+
+    async def close(self):
+        """Writes the pending motor position."""
+        if self._positions:
+            await self._in_executor(self._positions.flush)
+
+    ### INTERNAL
+
+    async def _in_executor(self, func: Callable[..., R], *args) -> R:
+        """Runs blocking file I/O off the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def _move_motor(self, pan: float, tilt: float):
+        pan, tilt = clamp_move((self._pan, self._tilt), pan, tilt)
+        self._pan += pan
+        self._tilt += tilt
+
+        await self._safe_call(self._api.move_motor(pan, tilt))
+        if self._positions:
+            self._positions.save(self._config.host, self._pan, self._tilt)
+
+    async def _get_resolution(self) -> tuple[int, int]:
+        info = await self._api.get_video_specs()
+        resolution = info.get("resolution")
+        if resolution:
+            width, height = map(int, resolution.value.split("*"))
+        else:
+            width, height = 0, 0
+        return width, height
+
+    async def _safe_call(self, call: Awaitable[R]) -> Optional[R]:
+        try:
+            return await call
+        except CommandError as e:
+            return None
+        except AuthenticationError as e:
+            raise
+
+    async def _init_camera(self):
+        result = InitResult()
+        result.flip_written = await self._apply_setting(
+            self._api.is_image_flipped, self._api.flip_image, self._config.flip_image
+        )
+        result.daynight_written = await self._apply_setting(
+            self._api.get_daynight_mode,
+            self._api.set_daynight_mode,
+            self._config.daynight_mode,
+        )
+
+        position = await self._known_position()
+        if position is None:
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await self._move_motor(-PAN_RANGE[1], -TILT_RANGE[1])
+            await self._wait_for_motor(PAN_RANGE[1], TILT_RANGE[1])
+            self._homing_time = loop.time() - start
+            result.homed = True
+        else:
+            self._pan, self._tilt = position
+
+        move = start_move((self._pan, self._tilt), self._config.start_position, result.homed)
+        if move is not None:
+            await self._move_motor(*move)
+        self._init_result = result
+
+    async def _apply_setting(
+        self,
+        read: Callable[[], Awaitable[R]],
+        write: Callable[[R], Awaitable[None]],
+        wanted: R,
+    ) -> bool:
+        """Writes wanted unless the device already reports it. Returns if it was written."""
+        try:
+            if await read() == wanted:
+                return False
+        except (CommandError, NotImplementedError):
+            pass
+        await write(wanted)
+        return True
+
+    async def _known_position(self) -> Optional[Tuple[float, float]]:
+        """Stored (pan, tilt) if it can be trusted instead of homing the motor."""
+        if self._positions is None:
+            return None
+        position = await self._in_executor(self._positions.load, self._config.host)
+        if position is None:
+            return None
+        return trusted_position(position, await self._safe_call(self._api.get_info()))
+
+    async def _motor_profile(self) -> Optional[MotorTimingProfile]:
+        """Timing profile of the settings, else of the device model."""
+        if self._config.motor_profile is not None:
+            return self._config.motor_profile
+        info = await self._safe_call(self._api.get_info())
+        return get_motor_profile(info["device_model"]) if info else None
+
+    async def _wait_for_motor(self, pan: float, tilt: float):
+        """Waits until a move of (pan, tilt) degrees has settled."""
+        mode = self._config.homing_mode
+        timeout = self._config.homing_timeout
+        profile = None
+        if mode in (HomingMode.AUTO, HomingMode.PROFILE):
+            profile = await self._motor_profile()
+        predicted = motor_wait(mode, profile, pan, tilt, timeout)
+        start = time.monotonic()
+
+        if mode in (HomingMode.AUTO, HomingMode.POLL):
+            try:
+                # The motor starts after the command latency, see it move then stop
+                settled = await async_wait_until_arrived(
+                    self._api.is_motor_moving, predicted, timeout
+                )
+                if settled is not None:
+                    return
+            except (NotImplementedError, CommandError):
+                pass
+
+        # Never seen moving or not settled in time: wait out the prediction
+        await asyncio.sleep(max(predicted - (time.monotonic() - start), 0.0))
@@ -1,9 +1,28 @@
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 import numpy as np
 import yaml
-import cv2
-from typing import Any, Dict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import functools
 import glob
+import hashlib
+import os
+import time
+
+from .utils import lazy_import
+
+# OpenCV is only loaded once calibration is actually used
+cv2 = lazy_import("cv2")
+
+DEFAULT_BOARD_SIZE = (9, 6)
+# Width of the downscaled copy used to find the chessboard
+DEFAULT_DETECT_WIDTH = 1024
+# Values of cv2.CALIB_CB_ADAPTIVE_THRESH | cv2.CALIB_CB_NORMALIZE_IMAGE and
+# cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, spelled out so that
+# importing this module does not load OpenCV
+DETECT_FLAGS = 1 | 2
+SUBPIX_CRITERIA = (2 + 1, 30, 0.001)
+INTER_LINEAR = 1
 
 
 @dataclass
@@ -18,6 +37,14 @@ class CameraCalibration:
     R: np.ndarray  # 3x3 rectification matrix
     P: np.ndarray  # 3x4 projection matrix
 
+    # Undistort/rectify maps per output size, with the fingerprint they were built from
+    _maps: Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _maps_fingerprint: bytes = field(
+        default=b"", init=False, repr=False, compare=False
+    )
+
     @classmethod
     def default(cls, width: int, height: int) -> "CameraCalibration":
         """Default uncalibrated pinhole model."""
@@ -62,6 +89,101 @@ class CameraCalibration:
         with open(path, "w") as f:
             yaml.safe_dump(data, f)
 
+    def rectify_maps(
+        self, size: Optional[Tuple[int, int]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the fixed-point (CV_16SC2) undistort/rectify maps for a (width, height) output.
+
+        Maps are built on first use and cached per size. Intrinsics are scaled when size
+        differs from the calibrated resolution. Changing K, D, R or P invalidates the cache.
+        """
+        size = size or (self.width, self.height)
+        fingerprint = self._fingerprint()
+        if fingerprint != self._maps_fingerprint:
+            self._maps.clear()
+            self._maps_fingerprint = fingerprint
+
+        maps = self._maps.get(size)
+        if maps is None:
+            sx = size[0] / self.width if self.width else 1.0
+            sy = size[1] / self.height if self.height else 1.0
+            scale = np.diag([sx, sy, 1.0])
+            maps = cv2.initUndistortRectifyMap(
+                scale @ self.K,
+                self.D,
+                self.R,
+                scale @ self.P[:, :3],
+                size,
+                cv2.CV_16SC2,
+            )
+            self._maps[size] = maps
+        return maps
+
+    def rectify(
+        self,
+        frame: np.ndarray,
+        interpolation: int = INTER_LINEAR,
+        dst: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Undistorts and rectifies a frame using the cached maps for its size."""
+        height, width = frame.shape[:2]
+        map1, map2 = self.rectify_maps((width, height))
+        return cv2.remap(frame, map1, map2, interpolation, dst=dst)
+
+    def invalidate_maps(self):
+        """Drops every cached rectify map."""
+        self._maps.clear()
+        self._maps_fingerprint = b""
+
+    def undistort_points(
+        self, points: np.ndarray, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Maps Nx2 distorted pixel coordinates to rectified pixel coordinates (through R and P)."""
+        src = _as_points(points, 2)
+        dst = _output(out, (len(src), 2))
+        if len(src):
+            cv2.undistortPoints(
+                src.reshape(-1, 1, 2),
+                self.K,
+                self.D,
+                dst=dst.reshape(-1, 1, 2),
+                R=self.R,
+                P=self.P,
+            )
+        return dst
+
+    def pixel_to_ray(
+        self, points: np.ndarray, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Maps Nx2 pixel coordinates to Nx3 unit view rays in the camera frame."""
+        src = _as_points(points, 2)
+        dst = _output(out, (len(src), 3))
+        if len(src):
+            normalized = cv2.undistortPoints(src.reshape(-1, 1, 2), self.K, self.D)
+            dst[:, :2] = normalized.reshape(-1, 2)
+            dst[:, 2] = 1.0
+            dst /= np.linalg.norm(dst, axis=1, keepdims=True)
+        return dst
+
+    def project(
+        self, points: np.ndarray, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Projects Nx3 points of the rectified camera frame to Nx2 pixel coordinates with P."""
+        src = _as_points(points, 3)
+        dst = _output(out, (len(src), 2))
+        homogeneous = src @ self.P[:, :3].T
+        homogeneous += self.P[:, 3]
+        np.divide(homogeneous[:, :2], homogeneous[:, 2:3], out=dst)
+        return dst
+
+    def _fingerprint(self) -> bytes:
+        # Cheap enough to run per frame, and catches in-place edits of the matrices
+        return b"".join(
+            np.ascontiguousarray(m, dtype=np.float64).tobytes()
+            for m in (self.K, self.D, self.R, self.P)
+        )
+
     def to_dict(self) -> Dict[str, Any]:
         """Return as serializable dictionary."""
         return {
@@ -75,31 +197,447 @@ class CameraCalibration:
         }
 
 
-def compute_calibration(images_glob: str, board_size=(9, 6), square_size=0.024):
+def _as_points(points: np.ndarray, dims: int) -> np.ndarray:
+    """Returns points as a contiguous float64 Nx<dims> array, without copying when possible."""
+    points = np.ascontiguousarray(points, dtype=np.float64)
+    if points.ndim != 2 or points.shape[1] != dims:
+        raise ValueError(f"Expected an Nx{dims} array, got shape {points.shape}")
+    return points
+
+
+def _output(out: Optional[np.ndarray], shape: Tuple[int, int]) -> np.ndarray:
+    if out is None:
+        return np.empty(shape, dtype=np.float64)
+    if out.shape != shape or out.dtype != np.float64 or not out.flags.c_contiguous:
+        raise ValueError(
+            f"Expected a contiguous float64 {shape} output array, got {out.dtype} {out.shape}"
+        )
+    return out
+
+
+@dataclass
+class CornerDetection:
+    """Chessboard detection result of one calibration image."""
+
+    path: str
+    found: bool
+    corners: Optional[np.ndarray] = None  # Nx1x2 float32, full resolution
+    image_size: Optional[Tuple[int, int]] = None  # (width, height)
+    elapsed: float = 0.0
+    cached: bool = False
+
+
+@dataclass
+class CalibrationStats:
+    """Per-image detection results and timings of compute_calibration."""
+
+    detections: List[CornerDetection]
+    detection_time: float
+    calibration_time: float
+    rms: float
+
+    @property
+    def found(self) -> int:
+        return sum(1 for detection in self.detections if detection.found)
+
+    @property
+    def cached(self) -> int:
+        return sum(1 for detection in self.detections if detection.cached)
+
+
+class CornerCache:
+    """
+    On-disk (.npz) cache of chessboard detections.
+
+    Entries are keyed by image path and file signature (mtime and size, or a
+    content hash). The whole cache is discarded when the board size or the
+    detector parameters change.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        board_size: Tuple[int, int] = DEFAULT_BOARD_SIZE,
+        detect_width: Optional[int] = DEFAULT_DETECT_WIDTH,
+        content_hash: bool = False,
+    ):
+        self._path = path
+        self._board_size = tuple(board_size)
+        self._content_hash = content_hash
+        self._params = repr(
+            (self._board_size, detect_width, DETECT_FLAGS, SUBPIX_CRITERIA, content_hash)
+        )
+        self._entries: Dict[str, Tuple[str, CornerDetection]] = {}
+        self.load()
+
+    def load(self):
+        self._entries.clear()
+        if not os.path.exists(self._path):
+            return
+        with np.load(self._path, allow_pickle=False) as data:
+            if str(data["params"]) != self._params:
+                return
+            for i, path in enumerate(data["paths"]):
+                found = bool(data["found"][i])
+                self._entries[str(path)] = (
+                    str(data["signatures"][i]),
+                    CornerDetection(
+                        str(path),
+                        found,
+                        data["corners"][i] if found else None,
+                        tuple(int(v) for v in data["image_sizes"][i]),  # type: ignore[arg-type]
+                        cached=True,
+                    ),
+                )
+
+    def get(self, path: str) -> Optional[CornerDetection]:
+        """Returns the cached detection of path, None if missing or the file changed."""
+        entry = self._entries.get(path)
+        if entry is None or entry[0] != self._signature(path):
+            return None
+        return entry[1]
+
+    def put(self, detection: CornerDetection):
+        if detection.image_size is None:
+            # Unreadable images are retried on the next run
+            return
+        self._entries[detection.path] = (self._signature(detection.path), detection)
+
+    def save(self, paths: Optional[List[str]] = None):
+        """Writes the cache, keeping only the given paths if any."""
+        keys = [p for p in (paths if paths is not None else self._entries) if p in self._entries]
+        n = self._board_size[0] * self._board_size[1]
+        corners = np.zeros((len(keys), n, 1, 2), np.float32)
+        found = np.zeros(len(keys), bool)
+        image_sizes = np.zeros((len(keys), 2), np.int32)
+        for i, key in enumerate(keys):
+            detection = self._entries[key][1]
+            found[i] = detection.found
+            image_sizes[i] = detection.image_size
+            if detection.found:
+                corners[i] = detection.corners
+        tmp_path = f"{self._path}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            params=np.array(self._params),
+            paths=np.array(keys, dtype=str),
+            signatures=np.array([self._entries[k][0] for k in keys], dtype=str),
+            found=found,
+            image_sizes=image_sizes,
+            corners=corners,
+        )
+        os.replace(tmp_path, self._path)
+
+    def _signature(self, path: str) -> str:
+        if self._content_hash:
+            with open(path, "rb") as f:
+                return hashlib.sha1(f.read()).hexdigest()
+        stat = os.stat(path)
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def find_corners(
+    gray: np.ndarray,
+    board_size: Tuple[int, int] = DEFAULT_BOARD_SIZE,
+    detect_width: Optional[int] = DEFAULT_DETECT_WIDTH,
+    flags: int = DETECT_FLAGS,
+    retry_full_resolution: bool = True,
+) -> Optional[np.ndarray]:
+    """
+    Finds chessboard corners in a grayscale image, None if the board is not found.
+
+    Detection runs on a copy downscaled to detect_width pixels wide, then corners
+    are refined with cornerSubPix at full resolution. If the board is not found
+    on the downscaled copy, detection is optionally retried at full resolution.
+    """
+    width = gray.shape[1]
+    found, corners = False, None
+    scale = detect_width / width if detect_width and width > detect_width else 1.0
+    if scale < 1.0:
+        small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        found, corners = cv2.findChessboardCorners(small, board_size, flags=flags)
+        if found:
+            corners /= scale
+    if not found and (scale == 1.0 or retry_full_resolution):
+        found, corners = cv2.findChessboardCorners(gray, board_size, flags=flags)
+    if not found:
+        return None
+
+    corners = cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1), SUBPIX_CRITERIA)
+    return corners.reshape(-1, 1, 2)
+
+
+def detect_corners(
+    path: str,
+    board_size: Tuple[int, int] = DEFAULT_BOARD_SIZE,
+    detect_width: Optional[int] = DEFAULT_DETECT_WIDTH,
+) -> CornerDetection:
+    """Finds chessboard corners in an image file (see find_corners)."""
+    start = time.perf_counter()
+    gray = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        return CornerDetection(path, False, elapsed=time.perf_counter() - start)
+    height, width = gray.shape
+
+    corners = find_corners(gray, board_size, detect_width)
+    return CornerDetection(
+        path,
+        corners is not None,
+        corners,
+        (width, height),
+        time.perf_counter() - start,
+    )
+
+
+def compute_calibration(
+    images_glob: str,
+    board_size=DEFAULT_BOARD_SIZE,
+    square_size=0.024,
+    workers: Optional[int] = None,
+    detect_width: Optional[int] = DEFAULT_DETECT_WIDTH,
+    return_stats: bool = False,
+    cache_path: Optional[str] = None,
+):
+    """
+    Calibrates a camera from chessboard images.
+
+    Corner detection runs in a pool of worker processes (os.cpu_count() by
+    default, 1 to run in-process). Images are processed in sorted path order,
+    so the result does not depend on scheduling. With return_stats, returns
+    (calibration, CalibrationStats).
+
+    With cache_path, detections are stored in a CornerCache and only new or
+    changed images are processed on the next run.
+    """
+    images = sorted(glob.glob(images_glob))
+
+    start = time.perf_counter()
+    cache = CornerCache(cache_path, board_size, detect_width) if cache_path else None
+    cached = [cache.get(path) if cache else None for path in images]
+    missing = [path for path, detection in zip(images, cached) if detection is None]
+    detected = iter(_detect_all(missing, tuple(board_size), detect_width, workers))
+    detections = [detection or next(detected) for detection in cached]
+    if cache:
+        for detection in detections:
+            if not detection.cached:
+                cache.put(detection)
+        cache.save(images)
+    detection_time = time.perf_counter() - start
+
+    found = [detection for detection in detections if detection.found]
+    if not found:
+        raise ValueError(f"No chessboard found in images matching {images_glob}")
+
+    objp = _board_points(board_size, square_size)
+    objpoints = [objp] * len(found)
+    imgpoints = [detection.corners for detection in found]
+    width, height = found[0].image_size  # type: ignore[misc]
+
+    start = time.perf_counter()
+    rms, K, D, rvecs, tvecs = cv2.calibrateCamera(  # type: ignore[call-overload]
+        objpoints, imgpoints, (width, height), None, None
+    )
+    calibration_time = time.perf_counter() - start
+
+    R = np.eye(3)
+    P = np.hstack((K, np.zeros((3, 1))))
+
+    calibration = CameraCalibration(width, height, "plumb_bob", K, D, R, P)
+    if return_stats:
+        stats = CalibrationStats(detections, detection_time, calibration_time, rms)
+        return calibration, stats
+    return calibration
+
+
+def _board_points(board_size: Tuple[int, int], square_size: float) -> np.ndarray:
     objp = np.zeros((board_size[0] * board_size[1], 3), np.float32)
     objp[:, :2] = np.mgrid[0 : board_size[0], 0 : board_size[1]].T.reshape(-1, 2)
     objp *= square_size
+    return objp
+
 
-    objpoints = []
-    imgpoints = []
-
-    images = glob.glob(images_glob)
-    for fname in images:
-        img = cv2.imread(fname)
-        if img is None:
-            continue
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        ret, corners = cv2.findChessboardCorners(gray, board_size)
-        if ret:
-            objpoints.append(objp)
-            imgpoints.append(corners)
-
-    ret, K, D, rvecs, tvecs = cv2.calibrateCamera(  # type: ignore[call-overload]
-        objpoints, imgpoints, gray.shape[::-1], None, None
+def _detect_all(
+    images: List[str],
+    board_size: Tuple[int, int],
+    detect_width: Optional[int],
+    workers: Optional[int],
+) -> List[CornerDetection]:
+    workers = workers or os.cpu_count() or 1
+    detect = functools.partial(
+        detect_corners, board_size=board_size, detect_width=detect_width
     )
+    if workers == 1 or len(images) <= 1:
+        return [detect(path) for path in images]
+    with ProcessPoolExecutor(max_workers=min(workers, len(images))) as pool:
+        # map() yields results in input order
+        return list(pool.map(detect, images, chunksize=4))
 
-    width, height = gray.shape[::-1]
-    R = np.eye(3)
-    P = np.hstack((K, np.zeros((3, 1))))
 
-    return CameraCalibration(width, height, "plumb_bob", K, D, R, P)
+class StreamingCalibrator:
+    """
+    Calibrates a camera from a live stream of frames.
+
+    Frames are searched for the chessboard on a downscaled copy. A view is kept
+    only if its pose (board position, size and skew) differs enough from the
+    kept ones, or if it covers new areas of the image. The estimate is updated
+    every update_every kept views and calibration stops once the reprojection
+    error changes by less than rms_tolerance (relative) between updates.
+    """
+
+    def __init__(
+        self,
+        board_size: Tuple[int, int] = DEFAULT_BOARD_SIZE,
+        square_size: float = 0.024,
+        detect_width: Optional[int] = 640,
+        min_views: int = 10,
+        max_views: int = 40,
+        update_every: int = 5,
+        min_pose_distance: float = 0.2,
+        coverage_grid: Tuple[int, int] = (4, 4),
+        rms_tolerance: float = 0.02,
+    ):
+        self._board_size = tuple(board_size)
+        self._objp = _board_points(self._board_size, square_size)
+        self._detect_width = detect_width
+        self._min_views = min_views
+        self._max_views = max_views
+        self._update_every = update_every
+        self._min_pose_distance = min_pose_distance
+        self._coverage = np.zeros(coverage_grid[::-1], bool)
+        self._rms_tolerance = rms_tolerance
+
+        self._views: List[np.ndarray] = []
+        self._poses: List[np.ndarray] = []
+        self._image_size: Optional[Tuple[int, int]] = None
+        self._since_update = 0
+        self._calibration: Optional[CameraCalibration] = None
+        self._rms: Optional[float] = None
+        self._converged = False
+        self.frames = 0
+
+    @property
+    def calibration(self) -> Optional[CameraCalibration]:
+        """Latest estimate, None until min_views views are kept."""
+        return self._calibration
+
+    @property
+    def rms(self) -> Optional[float]:
+        return self._rms
+
+    @property
+    def views(self) -> int:
+        return len(self._views)
+
+    @property
+    def coverage(self) -> float:
+        """Fraction of the image grid cells covered by board corners."""
+        return float(self._coverage.mean())
+
+    @property
+    def converged(self) -> bool:
+        return self._converged
+
+    def add_frame(self, frame: Any) -> bool:
+        """Processes a frame (BGR/gray array or stream Frame). Returns True if the view was kept."""
+        image = getattr(frame, "image", frame)
+        self.frames += 1
+        if self._converged or len(self._views) >= self._max_views:
+            return False
+
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        height, width = gray.shape
+        if self._image_size is None:
+            self._image_size = (width, height)
+        elif self._image_size != (width, height):
+            raise ValueError(f"Frame size {(width, height)} != {self._image_size}")
+
+        corners = find_corners(
+            gray,
+            self._board_size,
+            self._detect_width,
+            DETECT_FLAGS | cv2.CALIB_CB_FAST_CHECK,
+            retry_full_resolution=False,
+        )
+        if corners is None or not self._is_new_view(corners):
+            return False
+
+        self._views.append(corners)
+        self._since_update += 1
+        if len(self._views) >= self._min_views and (
+            self._since_update >= self._update_every
+            or len(self._views) == self._max_views
+        ):
+            self._update()
+        return True
+
+    def run(
+        self, frames: Iterable[Any], timeout: Optional[float] = None
+    ) -> Optional[CameraCalibration]:
+        """Consumes frames until convergence, max_views, timeout or the end of the stream."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for frame in frames:
+            self.add_frame(frame)
+            if self._converged or len(self._views) >= self._max_views:
+                break
+            if deadline is not None and time.monotonic() > deadline:
+                break
+        if self._since_update and len(self._views) >= self._min_views:
+            self._update()
+        return self._calibration
+
+    ### INTERNAL
+
+    def _is_new_view(self, corners: np.ndarray) -> bool:
+        width, height = self._image_size  # type: ignore[misc]
+        points = corners.reshape(-1, 2)
+
+        rows, cols = self._coverage.shape
+        cells = np.zeros_like(self._coverage)
+        cx = np.clip((points[:, 0] * cols / width).astype(int), 0, cols - 1)
+        cy = np.clip((points[:, 1] * rows / height).astype(int), 0, rows - 1)
+        cells[cy, cx] = True
+        new_coverage = bool((cells & ~self._coverage).any())
+
+        pose = self._pose(points, width, height)
+        distance = (
+            min(np.abs(pose - kept).sum() for kept in self._poses)
+            if self._poses
+            else np.inf
+        )
+        if not new_coverage and distance < self._min_pose_distance:
+            return False
+        self._coverage |= cells
+        self._poses.append(pose)
+        return True
+
+    def _pose(self, points: np.ndarray, width: int, height: int) -> np.ndarray:
+        """Coarse board pose: normalized center, relative size and skew."""
+        cols, rows = self._board_size
+        up_left, up_right = points[0], points[cols - 1]
+        down_left, down_right = points[-cols], points[-1]
+        center = points.mean(axis=0) / (width, height)
+        area = cv2.contourArea(
+            np.float32([up_left, up_right, down_right, down_left])
+        )
+        size = np.sqrt(area / (width * height))
+        a, b = up_right - up_left, down_left - up_left
+        angle = np.arccos(
+            np.clip(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)), -1.0, 1.0)
+        )
+        skew = min(1.0, 2.0 * abs(np.pi / 2 - angle))
+        return np.array([center[0], center[1], size, skew])
+
+    def _update(self):
+        self._since_update = 0
+        objpoints = [self._objp] * len(self._views)
+        rms, K, D, rvecs, tvecs = cv2.calibrateCamera(  # type: ignore[call-overload]
+            objpoints, self._views, self._image_size, None, None
+        )
+        width, height = self._image_size  # type: ignore[misc]
+        P = np.hstack((K, np.zeros((3, 1))))
+        self._calibration = CameraCalibration(
+            width, height, "plumb_bob", K, D, np.eye(3), P
+        )
+        if self._rms is not None and rms > 0:
+            self._converged = abs(self._rms - rms) / rms < self._rms_tolerance
+        self._rms = rms
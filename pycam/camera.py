@@ -1,49 +1,150 @@
-from typing import Optional, Callable, TypeVar
+from dataclasses import dataclass
+from typing import Optional, Callable, Tuple, TypeVar
+import threading
 import time
 
 from pycam.config.config import RuntimeConfig
 from .api.api import CameraAPI
 from .errors import CommandError, AuthenticationError
-from .schemas import Info, VideoSpecs, VideoCapability, DayNightMode
+from .schemas import (
+    Info,
+    VideoQuality,
+    VideoSettings,
+    VideoSpecs,
+    VideoCapability,
+    DayNightMode,
+)
 from .config.config import CameraConfig
-from .utils import clamp
+from .config.watcher import (
+    ConfigDiff,
+    ConfigWatcher,
+    DEFAULT_DEBOUNCE,
+    DEFAULT_POLL_INTERVAL,
+)
 from .calibration import CameraCalibration
+from .stream import FrameSource
+from .pipeline import ROI, DecodeMode, FramePipeline, open_pipeline, probe_size
+from .recorder import MotionDetector, MotionRecorder
+from .position import PositionStore
+from .motion import (
+    HomingMode,
+    MotionScheduler,
+    MotionStats,
+    get_motor_profile,
+    wait_until_arrived,
+    motor_wait,
+    FALLBACK_MOTOR_PROFILE,
+    MotionTimeModel,
+    MotorTimingProfile,
+    PAN_RANGE,
+    TILT_RANGE,
+    PresetMove,
+    clamp_move,
+    plan_preset_move,
+    settle_preset_move,
+    start_move,
+    trusted_position,
+)
 
 R = TypeVar("R")
 
 
+@dataclass
+class InitResult:
+    """Device writes actually performed by the last initialization."""
+
+    flip_written: bool = False
+    daynight_written: bool = False
+    homed: bool = False
+
+
 class Camera:
     """
     Generic camera wrapper.
 
     Can control any camera implementing the CameraAPI interface.
+
+    With lazy=True the constructor does not talk to the device. The configured
+    options are sent and the motor homed in a background thread on start(), or
+    on the first call that controls the device. Info and video queries do not
+    wait for initialization.
     """
 
     def __init__(
-        self, api: CameraAPI, config: CameraConfig, calib_path: Optional[str] = None
+        self,
+        api: CameraAPI,
+        config: CameraConfig,
+        calib_path: Optional[str] = None,
+        lazy: bool = False,
+        position_store: Optional[PositionStore] = None,
     ):
         """
         api: an instance of a concrete CameraAPI implementation (e.g., PytapoClient)
-        settings: optional CameraSettings to apply on initialization
+        config: camera configuration applied on initialization
+        calib_path: optional calibration YAML, defaults to a calibration for the stream resolution
+        lazy: defer device initialization until start() or first use
+        position_store: last known motor positions, defaults to the store shared at config.state_path
         """
         self._api = api
         self._config = config
+        if position_store is None and config.state_path:
+            position_store = PositionStore.shared(config.state_path)
+        self._positions = position_store
+        self._init_result = InitResult()
 
         self._tilt = 90.0
         self._pan = 360.0
-
-        self._init_camera()
-
+        self._homing_time = 0.0
+        self._motion_model: Optional[MotionTimeModel] = None
+        # time.monotonic() the last preset move is predicted to settle
+        self._arrival = 0.0
+        self._scheduler: Optional[MotionScheduler] = None
+        # Guards replacing the scheduler against moves being submitted to it
+        self._scheduler_lock = threading.Lock()
+        self._frame_source: Optional[FrameSource] = None
+        self._watcher: Optional[ConfigWatcher] = None
+        self._stream_quality: Optional[VideoQuality] = None
+        self._resolution: Optional[tuple[int, int]] = None
+        self._low_stream_size: Optional[tuple[int, int]] = None
+        self._calibration: Optional[CameraCalibration] = None
+
+        self._init_lock = threading.Lock()
+        self._init_thread: Optional[threading.Thread] = None
+        self._init_done = threading.Event()
+        self._init_error: Optional[BaseException] = None
+
+        self._calib_path = calib_path
         if calib_path:
             self._calibration = CameraCalibration.from_yaml(calib_path)
-        else:
-            width, height = self._get_resolution()
-            self._calibration = CameraCalibration.default(width, height)
+
+        self._scheduler = self._make_scheduler(config.motion_min_interval)
+
+        if not lazy:
+            self._run_init()
+            if self._init_error is not None:
+                self.close()
+                raise self._init_error
 
     @property
     def calibration(self) -> CameraCalibration:
+        """Camera calibration, the default one is built on first access."""
+        if self._calibration is None:
+            width, height = self.resolution
+            self._calibration = CameraCalibration.default(width, height)
         return self._calibration
 
+    @property
+    def initialized(self) -> bool:
+        """True once the device was successfully initialized."""
+        return self._init_done.is_set() and self._init_error is None
+
+    @property
+    def resolution(self) -> tuple[int, int]:
+        """(width, height) of the main video stream, queried once."""
+        if self._resolution is None:
+            self._resolution = self._get_resolution()
+        return self._resolution
+
     @property
     def tilt(self) -> float:
         return self._tilt
@@ -52,11 +153,115 @@ class Camera:
     def pan(self) -> float:
         return self._pan
 
+    @property
+    def motion_model(self) -> MotionTimeModel:
+        """
+        Motion time of this camera, seeded from its timing profile.
+
+        Learns from preset moves waited on, only if the API reports motor activity.
+        """
+        if self._motion_model is None:
+            self._motion_model = MotionTimeModel(self._motor_profile() or FALLBACK_MOTOR_PROFILE)
+        return self._motion_model
+
+    @property
+    def homing_time(self) -> float:
+        """
+        Seconds initialization waited for the homing move.
+
+        Measured when the device reports motor activity; with a timing profile
+        or fixed homing it is the predicted wait, not the actual travel time.
+        """
+        return self._homing_time
+
+    @property
+    def init_result(self) -> InitResult:
+        """Which configured options had to be written to the device on initialization."""
+        return self._init_result
+
+    @property
+    def motion_stats(self) -> Optional[MotionStats]:
+        """Motion scheduler counters, None if moves are sent immediately."""
+        scheduler = self._scheduler
+        return scheduler.stats if scheduler else None
+
+    def start(self) -> "Camera":
+        """
+        Starts device initialization in a background thread, if not started.
+
+        Calling it again after a failed initialization retries it.
+        """
+        with self._init_lock:
+            failed = self._init_done.is_set() and self._init_error is not None
+            if self._init_thread is None or failed:
+                self._init_done.clear()
+                self._init_error = None
+                self._init_thread = threading.Thread(
+                    target=self._run_init, name="pycam-camera-init", daemon=True
+                )
+                self._init_thread.start()
+        return self
+
+    def ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Starts initialization if needed and waits for it to finish.
+
+        Returns False on timeout, and raises the initialization error if it failed.
+        """
+        if not self._init_done.is_set():
+            self.start()
+        if not self._init_done.wait(timeout):
+            return False
+        if self._init_error is not None:
+            raise self._init_error
+        return True
+
     ### Config
     def get_config(self) -> RuntimeConfig:
 
         return RuntimeConfig.from_config(self._config)
 
+    def apply_config_changes(self, changes: ConfigDiff) -> list[str]:
+        """
+        Applies changed settings to the running camera. Returns the fields applied.
+
+        Flip, day/night mode and start position are sent to the device and the
+        motion scheduler is rebuilt for a new min_interval. Other settings are
+        read on use; connection settings only apply to a new client.
+        """
+        applied = []
+        if "flip_image" in changes:
+            self.flip_image(changes["flip_image"].new)
+            applied.append("flip_image")
+        if "daynight_mode" in changes:
+            self.set_daynight_mode(changes["daynight_mode"].new)
+            applied.append("daynight_mode")
+        if "motion_min_interval" in changes:
+            self._replace_scheduler(self._make_scheduler(changes["motion_min_interval"].new))
+            applied.append("motion_min_interval")
+        if "motor_profile" in changes:
+            # Relearned from the new profile, or the device model one on next use
+            profile = changes["motor_profile"].new
+            self._motion_model = MotionTimeModel(profile) if profile is not None else None
+            applied.append("motor_profile")
+        if "start_position" in changes:
+            position = changes["start_position"].new
+            self.move_motor(position["pan"] - self._pan, position["tilt"] - self._tilt)
+            applied.append("start_position")
+        return applied
+
+    def watch_config(
+        self,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+    ) -> ConfigWatcher:
+        """Reloads the settings YAML when it changes and applies the changes, until close()."""
+        if self._watcher is None:
+            self._watcher = ConfigWatcher(
+                self._config, self.apply_config_changes, poll_interval, debounce
+            ).start()
+        return self._watcher
+
     ### API
     # --- Info / status methods ---
     def get_info(self) -> Info:
@@ -71,46 +276,241 @@ class Camera:
         """Returns video configuration options"""
         return self._api.get_video_capabilities()
 
+    def set_video_specs(self, settings: VideoSettings):
+        """
+        Changes main stream bitrate, frame rate, resolution or quality.
+
+        The resolution is queried again on next use, a default calibration is
+        rebuilt for it and a frame source decoding the main stream is reopened.
+        A calibration loaded from a file is kept.
+        """
+        self._api.set_video_specs(settings)
+        self._resolution = None
+        if self._calibration is not None and self._calib_path is None:
+            self._calibration = None
+        if self._frame_source is not None and self.stream_quality == VideoQuality.HIGH:
+            self._frame_source.switch(self.get_url())
+
     def get_daynight_mode(self) -> DayNightMode:
         """Returns DayNightMode (nigh vision or day)"""
+        self.ready()
         return self._api.get_daynight_mode()
 
     # --- Motor control ---
     def move_motor(self, pan: float, tilt: float):
         """Command motor to move in specicied pan and tilt angles (degrees)"""
-        pan = clamp(self._pan, pan, 0.0, 360.0)
-        tilt = clamp(self._tilt, tilt, 0.0, 90)
-        self._pan += pan
-        self._tilt += tilt
+        self.ready()
+        self._move_motor(pan, tilt, schedule=True)
+
+    def wait_motion(self, timeout: Optional[float] = None) -> bool:
+        """Waits until every scheduled move has been sent to the device."""
+        scheduler = self._scheduler
+        if scheduler:
+            return scheduler.flush(timeout)
+        return True
 
-        self._safe_call(self._api.move_motor, pan, tilt)
+    def goto_preset(self, name: str, wait: bool = False) -> float:
+        """
+        Moves to a preset of the config by the delta from the tracked position.
+
+        Returns the time.monotonic() the motor is predicted to settle at, so a
+        capture can be scheduled on arrival. A move sent before the previous
+        one settled is predicted to start once it did. With wait=True, blocks
+        until the motor settled and returns when it did; if the device reports
+        motor activity, the motion model learns from the measured time.
+        """
+        self.ready()
+        presets = self._config.presets
+        if name not in presets:
+            raise KeyError(f"Unknown preset: {name}")
+        # Scheduled moves land first, the delta is taken from where they leave the motor
+        self.wait_motion()
+        move = plan_preset_move(
+            (self._pan, self._tilt),
+            presets[name],
+            time.monotonic(),
+            self._arrival,
+            self.motion_model,
+        )
+        if move.empty:
+            return move.arrival
+
+        self._move_motor(move.pan, move.tilt)
+        self._arrival = move.arrival
+        if not wait:
+            return move.arrival
+        return self._wait_arrival(move)
 
     def calibrate_motor(self):
         """Run motor calibration routine"""
+        self.ready()
         self._api.calibrate_motor()
 
     def reboot(self):
         """Reboot camera"""
+        self.ready()
+        # The device re-homes itself on boot
+        if self._positions:
+            self._positions.discard(self._config.host)
         self._api.reboot()
 
     def is_image_flipped(self) -> bool:
         """Returns if image is flipped"""
+        self.ready()
         return self._api.is_image_flipped()
 
     def flip_image(self, flag: bool) -> None:
-        """Command to configure DayNight mode"""
+        """Command to flip image"""
+        self.ready()
         self._api.flip_image(flag)
 
     def set_daynight_mode(self, mode: DayNightMode):
         """Command to configure DayNight mode"""
+        self.ready()
         self._api.set_daynight_mode(mode)
 
-    def get_url(self) -> str:
-        """Get RTSP url"""
-        return self._api.get_url(self._config)
+    def get_url(self, quality: Optional[VideoQuality] = None) -> str:
+        """Get RTSP url, by default of the stream selected by switch_stream() or the config"""
+        if quality is None:
+            quality = self._stream_quality
+        return self._api.get_url(self._config, quality)
+
+    ### Video
+    @property
+    def stream_quality(self) -> VideoQuality:
+        """Stream decoded by frame_source(): HIGH (stream1) or LOW (stream2)."""
+        if self._stream_quality is None:
+            return self._config.video_quality
+        return self._stream_quality
+
+    def switch_stream(self, quality: VideoQuality):
+        """Selects the high or low stream, switching the running frame source to it."""
+        if quality == self.stream_quality:
+            return
+        self._stream_quality = quality
+        if self._frame_source is not None:
+            self._frame_source.switch(self.get_url())
+
+    def frame_source(self) -> FrameSource:
+        """Shared decoder of the camera RTSP stream, started on first use."""
+        if self._frame_source is None:
+            self._frame_source = FrameSource(self.get_url())
+        return self._frame_source.start()
+
+    def open_pipeline(
+        self,
+        mode: DecodeMode = DecodeMode.ALL,
+        every: int = 1,
+        roi: Optional[ROI] = None,
+        width: Optional[int] = None,
+        grayscale: bool = False,
+    ) -> FrameSource:
+        """
+        Dedicated decoder producing only the frames needed, cropped and downscaled early.
+
+        Unlike frame_source() it is not shared, the caller stops it.
+        """
+        input_size = None
+        if self.stream_quality == VideoQuality.HIGH:
+            input_size = self.resolution
+        elif mode == DecodeMode.KEYFRAMES:
+            input_size = self._low_resolution()
+        reader = open_pipeline(self.get_url(), mode, every, roi, width, grayscale, input_size)
+        return FrameSource(reader).start()
+
+    def motion_recorder(
+        self,
+        directory: str,
+        pre_roll: float = 5.0,
+        post_roll: float = 5.0,
+        segment_seconds: float = 60.0,
+        detector: Optional[MotionDetector] = None,
+    ) -> MotionRecorder:
+        """
+        Recorder of the high stream around motion detected on the low stream.
+
+        The high stream is remuxed without decoding; motion is detected on
+        every other frame of the low stream, downscaled to 160 pixels wide
+        grayscale. Call start() on the returned recorder.
+        """
+        detect_source = FrameSource(
+            FramePipeline(
+                self.get_url(VideoQuality.LOW), every=2, width=160, grayscale=True
+            )
+        )
+        return MotionRecorder(
+            self.get_url(VideoQuality.HIGH),
+            directory,
+            detect_source=detect_source,
+            detector=detector,
+            pre_roll=pre_roll,
+            post_roll=post_roll,
+            segment_seconds=segment_seconds,
+        )
+
+    def attach_frame_source(self, source: FrameSource):
+        """Replaces the RTSP decoder, e.g. with a file or synthetic source for testing."""
+        if self._frame_source is not None:
+            self._frame_source.stop()
+        self._frame_source = source
+
+    def close(self):
+        """Sends pending moves and releases background resources."""
+        if self._watcher:
+            self._watcher.stop()
+            self._watcher = None
+        init_thread = self._init_thread
+        if init_thread is not None and init_thread is not threading.current_thread():
+            init_thread.join()
+        self._replace_scheduler(None)
+        if self._frame_source:
+            self._frame_source.stop()
+        if self._positions:
+            self._positions.flush()
 
     ### INTERNAL
 
+    def _make_scheduler(self, min_interval: Optional[float]) -> Optional[MotionScheduler]:
+        if min_interval is None:
+            return None
+        # Failed moves are counted in motion_stats, the scheduler keeps running
+        return MotionScheduler(self._api.move_motor, min_interval)
+
+    def _replace_scheduler(self, scheduler: Optional[MotionScheduler]):
+        """Swaps in scheduler, then sends the moves pending in the previous one."""
+        with self._scheduler_lock:
+            previous, self._scheduler = self._scheduler, scheduler
+        if previous:
+            previous.close()
+
+    def _move_motor(self, pan: float, tilt: float, schedule: bool = False):
+        pan, tilt = clamp_move((self._pan, self._tilt), pan, tilt)
+        self._pan += pan
+        self._tilt += tilt
+
+        with self._scheduler_lock:
+            scheduled = schedule and self._scheduler is not None
+            if scheduled:
+                self._scheduler.submit(pan, tilt)
+        if not scheduled:
+            self._safe_call(self._api.move_motor, pan, tilt)
+        if self._positions:
+            self._positions.save(self._config.host, self._pan, self._tilt)
+
+    def _run_init(self):
+        try:
+            self._init_camera()
+        except BaseException as e:
+            self._init_error = e
+        finally:
+            self._init_done.set()
+
+    def _low_resolution(self) -> tuple[int, int]:
+        """(width, height) of the low stream, which the API does not report, probed once."""
+        if self._low_stream_size is None:
+            self._low_stream_size = probe_size(self.get_url(VideoQuality.LOW))
+        return self._low_stream_size
+
     def _get_resolution(self) -> tuple[int, int]:
         info = self._api.get_video_specs()
         resolution = info.get("resolution")
@@ -129,11 +529,92 @@ class Camera:
             raise
 
     def _init_camera(self):
-        self._api.flip_image(self._config.flip_image)
-        self._api.set_daynight_mode(self._config.daynight_mode)
+        result = InitResult()
+        result.flip_written = self._apply_setting(
+            self._api.is_image_flipped, self._api.flip_image, self._config.flip_image
+        )
+        result.daynight_written = self._apply_setting(
+            self._api.get_daynight_mode,
+            self._api.set_daynight_mode,
+            self._config.daynight_mode,
+        )
+
+        position = self._known_position()
+        if position is None:
+            start = time.monotonic()
+            self._move_motor(-PAN_RANGE[1], -TILT_RANGE[1])
+            self._wait_for_motor(PAN_RANGE[1], TILT_RANGE[1])
+            self._homing_time = time.monotonic() - start
+            result.homed = True
+        else:
+            self._pan, self._tilt = position
 
-        self.move_motor(-360.0, -90)
-        time.sleep(5)
+        move = start_move((self._pan, self._tilt), self._config.start_position, result.homed)
+        if move is not None:
+            self._move_motor(*move)
+        self._init_result = result
 
-        start_position = self._config.start_position
-        self.move_motor(start_position["pan"], start_position["tilt"])
+    def _apply_setting(
+        self, read: Callable[[], R], write: Callable[[R], None], wanted: R
+    ) -> bool:
+        """Writes wanted unless the device already reports it. Returns if it was written."""
+        try:
+            if read() == wanted:
+                return False
+        except (CommandError, NotImplementedError):
+            pass
+        write(wanted)
+        return True
+
+    def _known_position(self) -> Optional[Tuple[float, float]]:
+        """Stored (pan, tilt) if it can be trusted instead of homing the motor."""
+        if self._positions is None:
+            return None
+        position = self._positions.load(self._config.host)
+        if position is None:
+            return None
+        return trusted_position(position, self._safe_call(self._api.get_info))
+
+    def _wait_arrival(self, move: PresetMove) -> float:
+        """Waits until a preset move settled, and learns its duration."""
+        predicted = move.arrival - move.sent
+        settled = None
+        try:
+            settled = wait_until_arrived(
+                self._api.is_motor_moving,
+                start_timeout=predicted,
+                timeout=predicted + self._config.homing_timeout,
+            )
+        except (NotImplementedError, CommandError):
+            pass
+        if settled is None:
+            # Motor activity is not observable, trust the prediction
+            time.sleep(max(move.arrival - time.monotonic(), 0.0))
+        self._arrival = settle_preset_move(move, settled, self.motion_model)
+        return self._arrival
+
+    def _motor_profile(self) -> Optional[MotorTimingProfile]:
+        """Timing profile of the settings, else of the device model."""
+        if self._config.motor_profile is not None:
+            return self._config.motor_profile
+        info = self._safe_call(self._api.get_info)
+        return get_motor_profile(info["device_model"]) if info else None
+
+    def _wait_for_motor(self, pan: float, tilt: float):
+        """Blocks until a move of (pan, tilt) degrees has settled."""
+        mode = self._config.homing_mode
+        timeout = self._config.homing_timeout
+        profile = self._motor_profile() if mode in (HomingMode.AUTO, HomingMode.PROFILE) else None
+        predicted = motor_wait(mode, profile, pan, tilt, timeout)
+        start = time.monotonic()
+
+        if mode in (HomingMode.AUTO, HomingMode.POLL):
+            try:
+                # The motor starts after the command latency, see it move then stop
+                if wait_until_arrived(self._api.is_motor_moving, predicted, timeout) is not None:
+                    return
+            except (NotImplementedError, CommandError):
+                pass
+
+        # Never seen moving or not settled in time: wait out the prediction
+        time.sleep(max(predicted - (time.monotonic() - start), 0.0))
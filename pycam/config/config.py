@@ -1,7 +1,9 @@
 from ..schemas import DayNightMode, VideoQuality
+from ..motion import HomingMode, MotorTimingProfile
 from .secrets import CameraSecrets
 from .settings import CameraSettings
 from dataclasses import dataclass
+from typing import Dict, Optional
 
 
 class CameraConfig:
@@ -56,6 +58,30 @@ class CameraConfig:
     def start_position(self):
         return self.settings.start_position
 
+    @property
+    def homing_mode(self) -> HomingMode:
+        return self.settings.homing_mode
+
+    @property
+    def homing_timeout(self) -> float:
+        return self.settings.homing_timeout
+
+    @property
+    def motion_min_interval(self) -> Optional[float]:
+        return self.settings.motion_min_interval
+
+    @property
+    def motor_profile(self) -> Optional[MotorTimingProfile]:
+        return self.settings.motor_profile
+
+    @property
+    def state_path(self) -> Optional[str]:
+        return self.settings.state_path
+
+    @property
+    def presets(self) -> Dict[str, Dict[str, float]]:
+        return self.settings.presets
+
 
 @dataclass
 class RuntimeConfig:
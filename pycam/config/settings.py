@@ -1,6 +1,8 @@
 import yaml
 from pathlib import Path
+from typing import Dict, Optional
 from ..schemas import DayNightMode, VideoQuality
+from ..motion import HomingMode, MotorTimingProfile
 
 DEFAULT_HOST = "127.0.0.1"
 DEFAULT_USER = "admin"
@@ -10,6 +12,8 @@ DEFAULT_DAYNIGHT_MODE = "day"
 DEFAULT_VIDEO_QUALITY = "high"
 DEFAULT_INITIAL_TILT = 0.0
 DEFAULT_INITIAL_PAN = 0.0
+DEFAULT_HOMING_MODE = "auto"
+DEFAULT_HOMING_TIMEOUT = 5.0
 
 
 class CameraSettings:
@@ -44,3 +48,35 @@ class CameraSettings:
         self.start_position = data.get(
             "start_position", {"pan": DEFAULT_INITIAL_PAN, "tilt": DEFAULT_INITIAL_TILT}
         )
+
+        homing = data.get("homing", {})
+        self.homing_mode = HomingMode(homing.get("mode", DEFAULT_HOMING_MODE))
+        self.homing_timeout = float(homing.get("timeout", DEFAULT_HOMING_TIMEOUT))
+
+        # Minimum seconds between motor commands, None sends every move immediately
+        motion = data.get("motion", {})
+        min_interval = motion.get("min_interval")
+        self.motion_min_interval: Optional[float] = (
+            float(min_interval) if min_interval is not None else None
+        )
+        # Motor timing of this camera, None uses the profile of its device model
+        profile = motion.get("profile")
+        self.motor_profile: Optional[MotorTimingProfile] = (
+            MotorTimingProfile(
+                pan_speed=float(profile["pan_speed"]),
+                tilt_speed=float(profile["tilt_speed"]),
+                latency=float(profile.get("latency", MotorTimingProfile.latency)),
+            )
+            if profile is not None
+            else None
+        )
+
+        # File where the last known motor position is kept across restarts
+        state = data.get("state", {})
+        self.state_path: Optional[str] = state.get("path")
+
+        # Named positions, {name: {"pan": degrees, "tilt": degrees}}
+        self.presets: Dict[str, Dict[str, float]] = {
+            str(name): {"pan": float(position["pan"]), "tilt": float(position["tilt"])}
+            for name, position in (data.get("presets") or {}).items()
+        }
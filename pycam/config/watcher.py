@@ -0,0 +1,177 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+import os
+import threading
+import time
+
+from .config import CameraConfig
+from .settings import CameraSettings
+
+# Settings compared on reload
+SETTINGS_FIELDS = (
+    "host",
+    "user_camera",
+    "user_cloud",
+    "port",
+    "flip_image",
+    "daynight_mode",
+    "video_quality",
+    "start_position",
+    "homing_mode",
+    "homing_timeout",
+    "motion_min_interval",
+    "motor_profile",
+    "state_path",
+    "presets",
+)
+
+# Settings only used when connecting, changing them needs a new client
+RESTART_FIELDS = ("host", "user_camera", "user_cloud", "port")
+
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_DEBOUNCE = 0.5
+
+
+@dataclass(frozen=True)
+class ConfigChange:
+    field: str
+    old: Any
+    new: Any
+
+
+ConfigDiff = Dict[str, ConfigChange]
+
+
+def diff_settings(old: CameraSettings, new: CameraSettings) -> ConfigDiff:
+    """Settings whose value differs between old and new, by field name."""
+    changes = {}
+    for field in SETTINGS_FIELDS:
+        old_value, new_value = getattr(old, field), getattr(new, field)
+        if old_value != new_value:
+            changes[field] = ConfigChange(field, old_value, new_value)
+    return changes
+
+
+class ConfigWatcher:
+    """
+    Reloads the settings YAML of a CameraConfig when the file changes.
+
+    The file is polled with os.stat, which costs one syscall per interval. A
+    change is applied once the file has been stable for debounce seconds, so a
+    burst of writes causes a single reload. on_change receives the fields that
+    changed, then the new settings replace config.settings. If on_change
+    raises, the previous settings are kept and the reload is retried on the
+    next poll. A file that fails to parse keeps the previous settings and is
+    reported to on_error.
+    """
+
+    def __init__(
+        self,
+        config: CameraConfig,
+        on_change: Callable[[ConfigDiff], None],
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._config = config
+        self._on_change = on_change
+        self._on_error = on_error
+        self._poll_interval = poll_interval
+        self._debounce = debounce
+        self._clock = clock
+
+        self._applied = self._stat()
+        self._seen = self._applied
+        self._changed_at = 0.0
+
+        self.reloads = 0
+        self.errors = 0
+        self.last_error: Optional[Exception] = None
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def path(self) -> str:
+        return str(self._config.settings.path)
+
+    def start(self) -> "ConfigWatcher":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="pycam-config-watcher", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def check(self) -> Optional[ConfigDiff]:
+        """
+        Polls the file once, reloading it if it changed and settled.
+
+        Returns the applied changes, or None when nothing was reloaded.
+        """
+        stat = self._stat()
+        now = self._clock()
+        if stat != self._seen:
+            self._seen = stat
+            self._changed_at = now
+            return None
+        if stat == self._applied or now - self._changed_at < self._debounce:
+            return None
+        applied, self._applied = self._applied, stat
+        try:
+            return self._reload()
+        except Exception:
+            # Not applied, the next check retries
+            self._applied = applied
+            raise
+
+    def __enter__(self) -> "ConfigWatcher":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    ### INTERNAL
+
+    def _run(self):
+        while not self._stop.wait(self._poll_interval):
+            try:
+                self.check()
+            except Exception as e:
+                self._report(e)
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _reload(self) -> Optional[ConfigDiff]:
+        try:
+            settings = CameraSettings(self.path)
+        except Exception as e:
+            self._report(e)
+            return None
+
+        changes = diff_settings(self._config.settings, settings)
+        if changes:
+            self._on_change(changes)
+        # Only once applied, so a failed change is retried instead of skipped
+        self._config.settings = settings
+        self.reloads += 1
+        return changes
+
+    def _report(self, error: Exception):
+        self.errors += 1
+        self.last_error = error
+        if self._on_error is not None:
+            self._on_error(error)
@@ -1,3 +1,7 @@
+import time
+
+from . import metrics
+
 class CameraError(Exception):
     """Base class for all camera-related errors."""
 
@@ -9,6 +13,14 @@ class CommandError(CameraError):
         self.message = message
 
 
+class CircuitOpenError(CommandError):
+    """Raised without contacting the device while its circuit breaker is open."""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class ConnectionError(CameraError):
     pass
 
@@ -18,13 +30,39 @@ class AuthenticationError(CameraError):
 
 
 def handle_errors(error_type=CommandError):
+    """
+    Converts any exception raised by fn into error_type.
+
+    Latency and errors of every call are recorded in pycam.metrics.registry,
+    labelled with the method name and the host attribute of the instance.
+    """
+
     def decorator(fn):
+        method = "connect" if fn.__name__ == "__init__" else fn.__name__
+
         def wrapper(*args, **kwargs):
+            registry = metrics.registry
+            if not registry.enabled:
+                try:
+                    return fn(*args, **kwargs)
+                except Exception as e:
+                    raise error_type(str(e)) from e
+
+            start = time.time()
+            t0 = time.perf_counter()
             try:
-                return fn(*args, **kwargs)
+                result = fn(*args, **kwargs)
             except Exception as e:
+                registry.record(method, _host_of(args), start, time.perf_counter() - t0, e)
                 raise error_type(str(e)) from e
+            registry.record(method, _host_of(args), start, time.perf_counter() - t0)
+            return result
 
         return wrapper
 
     return decorator
+
+
+def _host_of(args: tuple) -> str:
+    host = getattr(args[0], "host", "") if args else ""
+    return host if isinstance(host, str) else ""
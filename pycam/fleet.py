@@ -0,0 +1,122 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Generic, List, Optional, TypeVar
+import time
+
+from .camera import Camera
+from .config.config import CameraConfig
+from .schemas import DayNightMode, Info
+
+R = TypeVar("R")
+
+DEFAULT_MAX_WORKERS = 8
+
+
+@dataclass
+class FleetResult(Generic[R]):
+    """Outcome of an operation on a single camera of the fleet."""
+
+    host: str
+    value: Optional[R] = None
+    error: Optional[Exception] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def default_camera_factory(config: CameraConfig) -> Camera:
+    """Builds a Tapo camera from an already loaded configuration."""
+    from .api.tapo import PytapoClient
+
+    return Camera(PytapoClient(config), config)
+
+
+class CameraFleet:
+    """
+    Group of cameras initialized and controlled concurrently.
+
+    Every operation returns a FleetResult per camera host, so hosts must be
+    unique. A failing camera does not stop the operation on the rest of the
+    fleet.
+    """
+
+    def __init__(
+        self,
+        configs: List[CameraConfig],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        camera_factory: Callable[[CameraConfig], Camera] = default_camera_factory,
+    ):
+        hosts = [config.host for config in configs]
+        duplicates = sorted({host for host in hosts if hosts.count(host) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate camera hosts: {', '.join(duplicates)}")
+        self._configs = configs
+        self._factory = camera_factory
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="pycam-fleet"
+        )
+        self._cameras: Dict[str, Camera] = {}
+
+    @property
+    def cameras(self) -> Dict[str, Camera]:
+        """Successfully started cameras, by host."""
+        return dict(self._cameras)
+
+    def start(self) -> Dict[str, FleetResult[Camera]]:
+        """Initializes all cameras concurrently."""
+        results = self._map(
+            {config.host: config for config in self._configs}, self._factory
+        )
+        for host, result in results.items():
+            if result.ok and result.value is not None:
+                self._cameras[host] = result.value
+        return results
+
+    def run(self, fn: Callable[[Camera], R]) -> Dict[str, FleetResult[R]]:
+        """Runs fn on every started camera concurrently."""
+        return self._map(self._cameras, fn)
+
+    def reboot_all(self) -> Dict[str, FleetResult[None]]:
+        return self.run(lambda camera: camera.reboot())
+
+    def set_daynight_mode_all(self, mode: DayNightMode) -> Dict[str, FleetResult[None]]:
+        return self.run(lambda camera: camera.set_daynight_mode(mode))
+
+    def flip_image_all(self, flag: bool) -> Dict[str, FleetResult[None]]:
+        return self.run(lambda camera: camera.flip_image(flag))
+
+    def get_info_all(self) -> Dict[str, FleetResult[Info]]:
+        return self.run(lambda camera: camera.get_info())
+
+    def close(self):
+        """Closes the started cameras and stops the worker threads."""
+        # A camera failing to close does not keep the others open
+        self.run(lambda camera: camera.close())
+        self._cameras.clear()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "CameraFleet":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    ### INTERNAL
+
+    def _map(self, targets: Dict[str, object], fn: Callable) -> Dict[str, FleetResult]:
+        futures = {
+            host: self._executor.submit(self._timed, host, fn, target)
+            for host, target in targets.items()
+        }
+        return {host: future.result() for host, future in futures.items()}
+
+    @staticmethod
+    def _timed(host: str, fn: Callable, target: object) -> FleetResult:
+        start = time.monotonic()
+        try:
+            value = fn(target)
+        except Exception as e:
+            return FleetResult(host, error=e, elapsed=time.monotonic() - start)
+        return FleetResult(host, value=value, elapsed=time.monotonic() - start)
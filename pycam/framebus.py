@@ -0,0 +1,280 @@
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Optional, Tuple
+import threading
+import time
+
+import numpy as np
+
+from .camera import Camera
+from .stream import FrameSource
+
+DEFAULT_SLOTS = 4
+DEFAULT_POLL_INTERVAL = 0.002
+# Seconds from_camera() waits for the first frame, which sets the ring shape
+DEFAULT_FIRST_FRAME_TIMEOUT = 10.0
+
+_MAGIC = 0x70796361  # "pyca"
+_HEADER_FIELDS = 8  # magic, slots, height, width, channels, latest seq, reserved
+_ALIGN = 64
+
+# Header field indices
+_SLOTS, _HEIGHT, _WIDTH, _CHANNELS, _LATEST = 1, 2, 3, 4, 5
+
+
+def _data_offset(slots: int) -> int:
+    header = (_HEADER_FIELDS + slots) * 8
+    return (header + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _attach(name: str) -> SharedMemory:
+    """Attaches to an existing block without letting this process unlink it on exit."""
+    try:
+        return SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    except TypeError:
+        # Python < 3.13 always registers the block with the resource tracker
+        shm = SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        return shm
+
+
+class _FrameRing:
+    """NumPy views over the header, slot sequence numbers and frame slots of a block."""
+
+    def __init__(self, shm: SharedMemory, slots: int, shape: Tuple[int, int, int]):
+        self.shm = shm
+        self.header = np.ndarray((_HEADER_FIELDS,), np.int64, shm.buf, 0)
+        self.slot_seq = np.ndarray((slots,), np.int64, shm.buf, _HEADER_FIELDS * 8)
+        self.frames = np.ndarray(
+            (slots, *shape), np.uint8, shm.buf, _data_offset(slots)
+        )
+
+    def release(self):
+        """
+        Closes the block.
+
+        Raises BufferError while views into it are still referenced, e.g.
+        frames returned by FrameSubscriber.read(); the block stays mapped.
+        """
+        # Our own views must be dropped before the block can be closed
+        del self.header, self.slot_seq, self.frames
+        self.shm.close()
+
+
+class FramePublisher:
+    """
+    Writes frames into a ring of shared memory buffers readable by other processes.
+
+    Each slot is stamped with the sequence number of the frame it holds, -1
+    while it is being written, so subscribers can detect overwritten slots.
+
+    The ring has a fixed frame shape. When publishing from a source, frames
+    of another shape (e.g. after a resolution change) are dropped and
+    counted in errors; the publisher has to be recreated to follow them.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        shape: Tuple[int, int, int],
+        slots: int = DEFAULT_SLOTS,
+    ):
+        """
+        name: shared memory block name, used by subscribers to attach
+        shape: (height, width, channels) of the published frames
+        """
+        size = _data_offset(slots) + slots * int(np.prod(shape))
+        self._shm = SharedMemory(name=name, create=True, size=size)
+        self._ring = _FrameRing(self._shm, slots, shape)
+        self._ring.header[:] = 0
+        self._ring.header[0] = _MAGIC
+        self._ring.header[_SLOTS] = slots
+        self._ring.header[_HEIGHT : _CHANNELS + 1] = shape
+        self._ring.slot_seq[:] = 0
+        self._slots = slots
+        self._shape = shape
+        self._seq = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._errors = 0
+        self._last_error: Optional[Exception] = None
+
+    @classmethod
+    def from_camera(
+        cls,
+        camera: Camera,
+        name: Optional[str] = None,
+        slots: int = DEFAULT_SLOTS,
+        timeout: float = DEFAULT_FIRST_FRAME_TIMEOUT,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ) -> "FramePublisher":
+        """
+        Publishes the camera frame source.
+
+        The frame shape is taken from the first decoded frame, as the active
+        stream (see Camera.stream_quality) may not have the main resolution.
+        Raises TimeoutError if no frame is decoded within timeout seconds.
+        """
+        source = camera.frame_source()
+        frame = source.wait_frame(timeout=timeout)
+        if frame is None:
+            raise TimeoutError(f"No frame from {camera.get_config().host} in {timeout}s")
+        publisher = cls(name or f"pycam-{camera.get_config().host}", frame.image.shape, slots)
+        publisher.attach(source, on_error)
+        return publisher
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    @property
+    def errors(self) -> int:
+        """Frames of the attached source that could not be published."""
+        return self._errors
+
+    @property
+    def last_error(self) -> Optional[Exception]:
+        return self._last_error
+
+    def publish(self, image: np.ndarray) -> int:
+        """Copies a frame into the next slot and returns its sequence number."""
+        if image.shape != self._shape:
+            raise ValueError(f"Frame shape {image.shape} != bus shape {self._shape}")
+        seq = self._seq + 1
+        slot = seq % self._slots
+        self._ring.slot_seq[slot] = -1
+        np.copyto(self._ring.frames[slot], image)
+        self._ring.slot_seq[slot] = seq
+        self._ring.header[_LATEST] = seq
+        self._seq = seq
+        return seq
+
+    def attach(
+        self, source: FrameSource, on_error: Optional[Callable[[Exception], None]] = None
+    ):
+        """
+        Publishes every frame of source from a background thread.
+
+        A frame that fails to publish is skipped, counted in errors and
+        passed to on_error.
+        """
+        subscription = source.subscribe(maxsize=1)
+
+        def pump():
+            with subscription:
+                while not self._stop.is_set():
+                    frame = subscription.get(timeout=0.5)
+                    if frame is None:
+                        continue
+                    try:
+                        self.publish(frame.image)
+                    except Exception as e:
+                        self._errors += 1
+                        self._last_error = e
+                        if on_error is not None:
+                            on_error(e)
+
+        self._thread = threading.Thread(target=pump, name="pycam-framebus", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stops publishing and removes the shared memory block."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        try:
+            self._ring.release()
+        finally:
+            # Attached subscribers keep their mapping until they close
+            self._shm.unlink()
+
+    def __enter__(self) -> "FramePublisher":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class FrameSubscriber:
+    """
+    Maps the ring of a FramePublisher, possibly from another process.
+
+    read() returns views into shared memory, no copy is made. A view stays
+    valid until the publisher wraps around the ring (slots - 1 frames later);
+    use is_valid() or read(copy=True) when that matters. Views must be
+    dropped before close(), which raises BufferError otherwise.
+    """
+
+    def __init__(self, name: str):
+        self._shm = _attach(name)
+        header = np.ndarray((_HEADER_FIELDS,), np.int64, self._shm.buf, 0)
+        if header[0] != _MAGIC:
+            self._shm.close()
+            raise ValueError(f"Shared memory block {name} is not a pycam frame bus")
+        self._slots = int(header[_SLOTS])
+        self._shape = (int(header[_HEIGHT]), int(header[_WIDTH]), int(header[_CHANNELS]))
+        del header
+        self._ring = _FrameRing(self._shm, self._slots, self._shape)
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self._shape
+
+    @property
+    def latest_seq(self) -> int:
+        return int(self._ring.header[_LATEST])
+
+    def is_valid(self, seq: int) -> bool:
+        """Returns if the slot of frame seq has not been overwritten yet."""
+        return int(self._ring.slot_seq[seq % self._slots]) == seq
+
+    def read(
+        self, seq: Optional[int] = None, copy: bool = False
+    ) -> Optional[Tuple[int, np.ndarray]]:
+        """
+        Returns (seq, frame) for frame seq, or the latest frame if not given.
+
+        Returns None if the frame is not available (not published yet or overwritten).
+        """
+        if seq is None:
+            seq = self.latest_seq
+        if seq <= 0 or not self.is_valid(seq):
+            return None
+        frame = self._ring.frames[seq % self._slots]
+        if copy:
+            frame = frame.copy()
+            # The slot may have been rewritten while copying
+            if not self.is_valid(seq):
+                return None
+        return seq, frame
+
+    def wait(
+        self,
+        after_seq: int = 0,
+        timeout: Optional[float] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> Optional[Tuple[int, np.ndarray]]:
+        """Waits for a frame newer than after_seq and returns the latest one."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while deadline is None or time.monotonic() < deadline:
+            if self.latest_seq > after_seq:
+                result = self.read()
+                if result is not None:
+                    return result
+            time.sleep(poll_interval)
+        return None
+
+    def close(self):
+        """Unmaps the ring. Raises BufferError while views from read() are referenced."""
+        self._ring.release()
+
+    def __enter__(self) -> "FrameSubscriber":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
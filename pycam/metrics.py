@@ -0,0 +1,137 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+import threading
+
+# Upper bounds (seconds) of the latency histogram buckets, the last one is +Inf
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class CallStats:
+    """Latency histogram and counters of one method on one host."""
+
+    buckets: List[int]
+    count: int = 0
+    errors: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.count if self.count else 0.0
+
+
+@dataclass(frozen=True)
+class Span:
+    """OpenTelemetry-style record of one call."""
+
+    name: str
+    start_time: float  # time.time()
+    duration: float
+    error: Optional[str] = None
+    attributes: Dict[str, str] = field(default_factory=dict)
+
+
+SpanListener = Callable[[Span], None]
+
+
+class MetricsRegistry:
+    """
+    Collects latency and error counts per method and host.
+
+    Recording costs a lock and a bisect per call. Listeners receive a Span for
+    every call, and are only built when at least one listener is registered.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.enabled = True
+        self._bounds = buckets
+        self._stats: Dict[Tuple[str, str], CallStats] = {}
+        self._listeners: List[SpanListener] = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener: SpanListener):
+        with self._lock:
+            self._listeners = [*self._listeners, listener]
+
+    def remove_listener(self, listener: SpanListener):
+        with self._lock:
+            self._listeners = [l for l in self._listeners if l != listener]
+
+    def record(
+        self,
+        method: str,
+        host: str,
+        start: float,
+        duration: float,
+        error: Optional[Exception] = None,
+    ):
+        """Records a call that started at start (time.time()) and took duration seconds."""
+        with self._lock:
+            stats = self._stats.get((method, host))
+            if stats is None:
+                stats = CallStats([0] * (len(self._bounds) + 1))
+                self._stats[(method, host)] = stats
+            stats.buckets[bisect_left(self._bounds, duration)] += 1
+            stats.count += 1
+            stats.errors += error is not None
+            stats.total_time += duration
+            stats.max_time = max(stats.max_time, duration)
+            listeners = self._listeners
+
+        if listeners:
+            span = Span(
+                f"pycam.{method}",
+                start,
+                duration,
+                repr(error) if error is not None else None,
+                {"method": method, "host": host},
+            )
+            for listener in listeners:
+                listener(span)
+
+    def snapshot(self) -> Dict[Tuple[str, str], CallStats]:
+        """Copy of the statistics, keyed by (method, host)."""
+        with self._lock:
+            return {
+                key: CallStats(
+                    list(s.buckets), s.count, s.errors, s.total_time, s.max_time
+                )
+                for key, s in self._stats.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def to_prometheus(self, prefix: str = "pycam") -> str:
+        """Statistics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        bounds = [str(bound) for bound in self._bounds] + ["+Inf"]
+        name = f"{prefix}_call_duration_seconds"
+        lines = [
+            f"# HELP {name} Latency of camera API calls.",
+            f"# TYPE {name} histogram",
+        ]
+        for (method, host), stats in sorted(snapshot.items()):
+            labels = f'method="{method}",host="{host}"'
+            cumulative = 0
+            for bound, count in zip(bounds, stats.buckets):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {stats.total_time}")
+            lines.append(f"{name}_count{{{labels}}} {stats.count}")
+
+        errors = f"{prefix}_call_errors_total"
+        lines += [
+            f"# HELP {errors} Failed camera API calls.",
+            f"# TYPE {errors} counter",
+        ]
+        for (method, host), stats in sorted(snapshot.items()):
+            lines.append(f'{errors}{{method="{method}",host="{host}"}} {stats.errors}')
+        return "\n".join(lines) + "\n"
+
+
+# Registry used by handle_errors
+registry = MetricsRegistry()
@@ -0,0 +1,469 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+import asyncio
+import copy
+import threading
+import time
+
+from .utils import clamp
+
+DEFAULT_POLL_INTERVAL = 0.1
+
+
+class HomingMode(Enum):
+    AUTO = "auto"
+    POLL = "poll"
+    PROFILE = "profile"
+    FIXED = "fixed"
+
+
+@dataclass(frozen=True)
+class MotorTimingProfile:
+    """Motor speeds (degrees/second) and command latency (seconds) of a camera model."""
+
+    pan_speed: float
+    tilt_speed: float
+    latency: float = 0.3
+
+    def duration(self, pan: float, tilt: float) -> float:
+        """Estimated time for a move of (pan, tilt) degrees to settle."""
+        pan_time = abs(pan) / self.pan_speed if self.pan_speed > 0 else 0.0
+        tilt_time = abs(tilt) / self.tilt_speed if self.tilt_speed > 0 else 0.0
+        # Pan and tilt axes are driven at the same time
+        return self.latency + max(pan_time, tilt_time)
+
+    def with_margin(self, margin: float) -> "MotorTimingProfile":
+        """Profile whose durations are margin times longer."""
+        return MotorTimingProfile(
+            pan_speed=self.pan_speed / margin,
+            tilt_speed=self.tilt_speed / margin,
+            latency=self.latency * margin,
+        )
+
+
+# The vendor does not publish motor speeds, the nominal ones below are
+# estimates. Waits derived from them are stretched by this factor so a slower
+# unit still settles before the camera is used.
+PROFILE_SAFETY_MARGIN = 1.25
+
+# Timing profiles per device model, as reported by CameraAPI.get_info(). Add or
+# replace entries for other models, or set motion.profile in the settings YAML
+# to override the profile of one camera.
+MOTOR_PROFILES: Dict[str, MotorTimingProfile] = {
+    model: profile.with_margin(PROFILE_SAFETY_MARGIN)
+    for model, profile in {
+        "C200": MotorTimingProfile(pan_speed=120.0, tilt_speed=60.0),
+        "C210": MotorTimingProfile(pan_speed=120.0, tilt_speed=60.0),
+        "C500": MotorTimingProfile(pan_speed=100.0, tilt_speed=50.0),
+        "C510W": MotorTimingProfile(pan_speed=100.0, tilt_speed=50.0),
+    }.items()
+}
+
+
+# Used when the device model has no timing profile
+FALLBACK_MOTOR_PROFILE = MotorTimingProfile(pan_speed=60.0, tilt_speed=30.0, latency=0.5)
+
+
+def get_motor_profile(device_model: str) -> Optional[MotorTimingProfile]:
+    """Returns the timing profile for a device model, ignoring region suffixes."""
+    model = device_model.upper()
+    if model in MOTOR_PROFILES:
+        return MOTOR_PROFILES[model]
+    # Models are sometimes reported as e.g. "C200 2.0" or "C210(EU)"
+    for name, profile in MOTOR_PROFILES.items():
+        if model.startswith(name):
+            return profile
+    return None
+
+
+# Motor range (degrees), positions count from the corner the motor homes to
+PAN_RANGE = (0.0, 360.0)
+TILT_RANGE = (0.0, 90.0)
+
+Position = Tuple[float, float]
+
+
+def clamp_move(position: Position, pan: float, tilt: float) -> Position:
+    """Move of (pan, tilt) degrees from position, clamped to the motor range."""
+    return clamp(position[0], pan, *PAN_RANGE), clamp(position[1], tilt, *TILT_RANGE)
+
+
+def trusted_position(
+    stored: Optional[Position], info: Optional[Mapping[str, Any]]
+) -> Optional[Position]:
+    """
+    Stored position if it can be used instead of homing the motor.
+
+    Only a device reporting a calibrated motor kept the position it was left at.
+    """
+    if stored is None or not info or not info.get("is_calibrated"):
+        return None
+    return stored
+
+
+def start_move(
+    position: Position, start: Mapping[str, float], homed: bool
+) -> Optional[Position]:
+    """Move from position to the configured start position, None if there is none to send."""
+    pan = start["pan"] - position[0]
+    tilt = start["tilt"] - position[1]
+    if homed or pan or tilt:
+        return pan, tilt
+    return None
+
+
+@dataclass(frozen=True)
+class PresetMove:
+    """Move to a preset and when it is predicted to settle (time.monotonic())."""
+
+    pan: float
+    tilt: float
+    sent: float
+    arrival: float
+    # Sent before the previous move settled, so its own duration cannot be measured
+    queued: bool = False
+
+    @property
+    def empty(self) -> bool:
+        return self.pan == 0.0 and self.tilt == 0.0
+
+
+def plan_preset_move(
+    position: Position,
+    preset: Mapping[str, float],
+    sent: float,
+    previous_arrival: float,
+    model: "MotionTimeModel",
+) -> PresetMove:
+    """
+    Move from position to preset, sent at sent.
+
+    A move sent before the previous one settled at previous_arrival is
+    predicted to start once it did.
+    """
+    pan, tilt = clamp_move(position, preset["pan"] - position[0], preset["tilt"] - position[1])
+    start = max(sent, previous_arrival)
+    if pan == 0.0 and tilt == 0.0:
+        return PresetMove(0.0, 0.0, sent, start)
+    return PresetMove(pan, tilt, sent, start + model.predict(pan, tilt), sent < previous_arrival)
+
+
+def settle_preset_move(
+    move: PresetMove, settled: Optional[float], model: "MotionTimeModel"
+) -> float:
+    """
+    When move settled: the measured time, learned by model, or the prediction.
+
+    settled is when the motor was seen stopping, None if it was not observed.
+    """
+    if settled is None:
+        return move.arrival
+    if not move.queued:
+        model.observe(move.pan, move.tilt, settled - move.sent)
+    return settled
+
+
+def motor_wait(
+    mode: HomingMode,
+    profile: Optional[MotorTimingProfile],
+    pan: float,
+    tilt: float,
+    timeout: float,
+) -> float:
+    """
+    Seconds to wait for a move of (pan, tilt) degrees when the motor is not observed.
+
+    The timing profile prediction in AUTO and PROFILE modes, capped at timeout,
+    otherwise timeout.
+    """
+    if mode in (HomingMode.AUTO, HomingMode.PROFILE) and profile is not None:
+        return min(profile.duration(pan, tilt), timeout)
+    return timeout
+
+
+def wait_until_settled(
+    is_moving: Callable[[], bool],
+    timeout: float,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> bool:
+    """
+    Polls is_moving() until it reports the motor stopped.
+
+    Returns True if the motor settled before timeout, False otherwise.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not is_moving():
+            return True
+        time.sleep(poll_interval)
+    return False
+
+
+def wait_until_arrived(
+    is_moving: Callable[[], bool],
+    start_timeout: float,
+    timeout: float,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> Optional[float]:
+    """
+    Polls is_moving() until the motor starts, within start_timeout, then stops, within timeout.
+
+    Returns the time.monotonic() the motor was first seen stopped, None if it
+    was never seen moving or did not settle in time.
+    """
+    start = time.monotonic()
+    while not is_moving():
+        if time.monotonic() - start >= start_timeout:
+            return None
+        time.sleep(poll_interval)
+    while time.monotonic() - start < timeout:
+        time.sleep(poll_interval)
+        if not is_moving():
+            return time.monotonic()
+    return None
+
+
+async def async_wait_until_settled(
+    is_moving: Callable[[], Awaitable[bool]],
+    timeout: float,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> bool:
+    """Asyncio counterpart of wait_until_settled."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        if not await is_moving():
+            return True
+        await asyncio.sleep(poll_interval)
+    return False
+
+
+async def async_wait_until_arrived(
+    is_moving: Callable[[], Awaitable[bool]],
+    start_timeout: float,
+    timeout: float,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> Optional[float]:
+    """Asyncio counterpart of wait_until_arrived."""
+    start = time.monotonic()
+    while not await is_moving():
+        if time.monotonic() - start >= start_timeout:
+            return None
+        await asyncio.sleep(poll_interval)
+    while time.monotonic() - start < timeout:
+        await asyncio.sleep(poll_interval)
+        if not await is_moving():
+            return time.monotonic()
+    return None
+
+
+class MotionTimeModel:
+    """
+    Motion time of one camera, learned from timed moves.
+
+    Fits duration = latency + max(|pan| / pan_speed, |tilt| / tilt_speed) by
+    recursive least squares on (latency, 1 / pan_speed, 1 / tilt_speed). Both
+    axes move at once, so a sample updates the axis that takes longer under
+    the current estimate. The fit starts from a MotorTimingProfile, trusted
+    as much as prior_weight samples, and the forgetting factor discounts old
+    samples so the model follows a motor that wears or a changed load.
+
+    Samples need the time a move actually settled, which Camera only gets
+    from CameraAPI.is_motor_moving(). PytapoClient does not implement it, so
+    on real devices the model keeps predicting from its initial profile.
+    """
+
+    def __init__(
+        self,
+        profile: MotorTimingProfile = FALLBACK_MOTOR_PROFILE,
+        prior_weight: float = 1.0,
+        forgetting: float = 0.98,
+    ):
+        self._theta = [
+            profile.latency,
+            1.0 / profile.pan_speed if profile.pan_speed > 0 else 0.0,
+            1.0 / profile.tilt_speed if profile.tilt_speed > 0 else 0.0,
+        ]
+        # Covariance in units of the measurement noise, per parameter scale
+        # (a one-second move on either axis), so the prior counts as samples
+        self._cov = [
+            [1.0 / prior_weight if i == j else 0.0 for j in range(3)] for i in range(3)
+        ]
+        self._scale = [
+            1.0,
+            max(profile.pan_speed, 1.0),
+            max(profile.tilt_speed, 1.0),
+        ]
+        self._forgetting = forgetting
+        self._lock = threading.Lock()
+        self.samples = 0
+
+    @property
+    def profile(self) -> MotorTimingProfile:
+        """Current estimate as a timing profile."""
+        with self._lock:
+            latency, pan, tilt = self._theta
+        return MotorTimingProfile(
+            pan_speed=1.0 / pan if pan > 0 else 0.0,
+            tilt_speed=1.0 / tilt if tilt > 0 else 0.0,
+            latency=latency,
+        )
+
+    def predict(self, pan: float, tilt: float) -> float:
+        """Predicted seconds from sending a move of (pan, tilt) degrees until it settles."""
+        with self._lock:
+            return self._duration(self._theta, pan, tilt)
+
+    def observe(self, pan: float, tilt: float, duration: float):
+        """Learns from a move of (pan, tilt) degrees measured to take duration seconds."""
+        with self._lock:
+            x = self._features(pan, tilt)
+            cov, lam = self._cov, self._forgetting
+            cov_x = [sum(cov[i][j] * x[j] for j in range(3)) for i in range(3)]
+            gain_den = lam + sum(x[i] * cov_x[i] for i in range(3))
+            gain = [c / gain_den for c in cov_x]
+            residual = duration - self._duration(self._theta, pan, tilt)
+            theta = [self._theta[i] + gain[i] * residual / self._scale[i] for i in range(3)]
+            # Keep a physical model, a negative latency or speed is noise
+            self._theta = [max(value, 0.0) for value in theta]
+            self._cov = [
+                [(cov[i][j] - gain[i] * cov_x[j]) / lam for j in range(3)]
+                for i in range(3)
+            ]
+            self.samples += 1
+
+    ### INTERNAL
+
+    def _features(self, pan: float, tilt: float) -> List[float]:
+        """Regressors of a move, scaled like the covariance."""
+        _, pan_time, tilt_time = self._theta
+        pan, tilt = abs(pan), abs(tilt)
+        if pan * pan_time >= tilt * tilt_time:
+            return [1.0, pan / self._scale[1], 0.0]
+        return [1.0, 0.0, tilt / self._scale[2]]
+
+    @staticmethod
+    def _duration(theta: List[float], pan: float, tilt: float) -> float:
+        latency, pan_time, tilt_time = theta
+        return latency + max(abs(pan) * pan_time, abs(tilt) * tilt_time)
+
+
+@dataclass
+class MotionStats:
+    """Counters of a MotionScheduler."""
+
+    submitted: int = 0
+    sent: int = 0
+    merged: int = 0
+    errors: int = 0
+    last_latency: float = 0.0
+    max_latency: float = 0.0
+    total_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.sent if self.sent else 0.0
+
+
+class MotionScheduler:
+    """
+    Coalesces motor moves and rate limits them.
+
+    Deltas submitted while a command is pending are merged into a single
+    move, so the device always receives the most recent target. Commands are
+    sent from a background thread at most once every min_interval seconds.
+    Latency is measured from the oldest merged submit to the end of the send.
+    """
+
+    def __init__(self, send: Callable[[float, float], object], min_interval: float):
+        self._send = send
+        self._min_interval = min_interval
+        self._pending_pan = 0.0
+        self._pending_tilt = 0.0
+        self._pending_since: Optional[float] = None
+        self._last_sent = float("-inf")
+        self._in_flight = False
+        self._closed = False
+        self._stats = MotionStats()
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name="pycam-motion", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def stats(self) -> MotionStats:
+        with self._cond:
+            return copy.copy(self._stats)
+
+    def submit(self, pan: float, tilt: float):
+        """Queues a relative move, merging it with any pending one."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("MotionScheduler is closed")
+            self._stats.submitted += 1
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+            else:
+                self._stats.merged += 1
+            self._pending_pan += pan
+            self._pending_tilt += tilt
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits until every submitted move has been sent."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._pending_since is None and not self._in_flight, timeout
+            )
+
+    def close(self):
+        """Sends the pending move, if any, and stops the background thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    ### INTERNAL
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._pending_since is not None or self._closed
+                )
+                if self._pending_since is None:
+                    return
+                delay = self._last_sent + self._min_interval - time.monotonic()
+                if delay > 0 and not self._closed:
+                    # Keep merging until the device may take a new command
+                    self._cond.wait(delay)
+                    continue
+                pan, tilt = self._pending_pan, self._pending_tilt
+                since = self._pending_since
+                self._pending_pan = self._pending_tilt = 0.0
+                self._pending_since = None
+                if pan == 0.0 and tilt == 0.0:
+                    # Merged moves cancelled each other out
+                    self._cond.notify_all()
+                    continue
+                self._in_flight = True
+
+            error = False
+            try:
+                self._send(pan, tilt)
+            except Exception:
+                error = True
+
+            with self._cond:
+                now = time.monotonic()
+                self._last_sent = now
+                self._in_flight = False
+                latency = now - since
+                self._stats.sent += 1
+                self._stats.errors += int(error)
+                self._stats.last_latency = latency
+                self._stats.max_latency = max(self._stats.max_latency, latency)
+                self._stats.total_latency += latency
+                self._cond.notify_all()
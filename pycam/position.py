@@ -0,0 +1,134 @@
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows, stores are only shared within a process
+    fcntl = None  # type: ignore[assignment]
+
+# Seconds a saved position waits for further moves before it is written
+DEFAULT_SAVE_DELAY = 1.0
+
+
+class PositionStore:
+    """
+    Last known pan/tilt position of each camera, persisted to a JSON file.
+
+    Lets a restarted process trust the motor position instead of homing the
+    camera again. Writes are atomic, so a crash never leaves a torn file.
+
+    Several cameras can share one file: use PositionStore.shared() for one
+    store per path within a process, and every write re-reads the file and
+    merges its entries under a file lock, so other processes' entries are
+    kept. Saves are written by a background thread once no move was saved
+    for save_delay seconds, so frequent moves cost no disk I/O on the caller.
+    Call flush() before exiting to write pending positions.
+    """
+
+    _shared: Dict[Path, "PositionStore"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path: str, save_delay: float = DEFAULT_SAVE_DELAY):
+        self.path = Path(path)
+        self._save_delay = save_delay
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._pending: Dict[str, Tuple[float, float]] = {}
+        self._deadline = 0.0
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def shared(cls, path: str) -> "PositionStore":
+        """Store of path shared by every camera of the process."""
+        key = Path(path).resolve()
+        with cls._shared_lock:
+            store = cls._shared.get(key)
+            if store is None:
+                store = cls._shared[key] = cls(path)
+            return store
+
+    def load(self, host: str) -> Optional[Tuple[float, float]]:
+        """(pan, tilt) last saved for host, None if unknown."""
+        with self._lock:
+            pending = self._pending.get(host)
+        if pending is not None:
+            return pending
+        entry = self._read().get(host)
+        if entry is None:
+            return None
+        return float(entry["pan"]), float(entry["tilt"])
+
+    def save(self, host: str, pan: float, tilt: float):
+        """Schedules a write of the position of host, after save_delay without saves."""
+        with self._cond:
+            self._pending[host] = (pan, tilt)
+            self._deadline = time.monotonic() + self._save_delay
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="pycam-positions", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify_all()
+
+    def discard(self, host: str):
+        """Forgets the position of host, e.g. after a reboot re-homes the motor."""
+        with self._lock:
+            self._pending.pop(host, None)
+        self._update({}, discard=host)
+
+    def flush(self):
+        """Writes pending positions now."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if pending:
+            self._update(pending)
+
+    ### INTERNAL
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending)
+                delay = self._deadline - time.monotonic()
+                if delay > 0:
+                    # Moves keep coming, wait until they settle
+                    self._cond.wait(delay)
+                    continue
+            self.flush()
+
+    def _read(self) -> Dict[str, Dict[str, float]]:
+        try:
+            with open(self.path, "r") as f:
+                positions = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError):
+            # A corrupt store only costs a homing
+            return {}
+        return positions if isinstance(positions, dict) else {}
+
+    def _update(
+        self, pending: Dict[str, Tuple[float, float]], discard: Optional[str] = None
+    ):
+        """Merges pending into the file under an exclusive lock."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(self.path.name + ".lock"), "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            positions = self._read()
+            changed = discard is not None and positions.pop(discard, None) is not None
+            for host, (pan, tilt) in pending.items():
+                entry = positions.get(host)
+                if entry is not None and (entry["pan"], entry["tilt"]) == (pan, tilt):
+                    continue
+                positions[host] = {"pan": pan, "tilt": tilt, "timestamp": time.time()}
+                changed = True
+            if changed:
+                tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                with open(tmp, "w") as f:
+                    json.dump(positions, f)
+                os.replace(tmp, self.path)
@@ -0,0 +1,308 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, List, Optional
+import threading
+import time
+
+from .schemas import (
+    VideoBitrate,
+    VideoCapability,
+    VideoQuality,
+    VideoResolution,
+    VideoSettings,
+)
+from .stream import Frame, FrameSubscription
+
+if TYPE_CHECKING:
+    from .camera import Camera
+
+DEFAULT_INTERVAL = 1.0
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    """
+    One step of the quality ladder.
+
+    Levels of the high stream (stream1) set the main stream parameters, the
+    low stream (stream2) is the last resort and has fixed parameters.
+    """
+
+    stream: VideoQuality
+    resolution: Optional[VideoResolution] = None
+    bitrate: Optional[VideoBitrate] = None
+    frame_rate: Optional[int] = None
+
+    def settings(self) -> VideoSettings:
+        settings: VideoSettings = {}
+        if self.resolution is not None:
+            settings["resolution"] = self.resolution
+        if self.bitrate is not None:
+            settings["bitrate"] = self.bitrate
+        if self.frame_rate is not None:
+            settings["frame_rate"] = self.frame_rate
+        return settings
+
+
+def frames_per_second(frame_rate: int) -> int:
+    """Tapo devices report frame rates as 65536 + fps."""
+    return frame_rate & 0xFFFF
+
+
+def _pixels(resolution: VideoResolution) -> int:
+    width, height = map(int, resolution.value.split("*"))
+    return width * height
+
+
+def build_quality_ladder(capabilities: VideoCapability) -> List[QualityLevel]:
+    """
+    Levels from best to cheapest within the device capabilities.
+
+    Each lower resolution of the high stream is paired with the next lower
+    bitrate at the highest frame rate. Then the lowest frame rate is tried,
+    and finally the low stream.
+    """
+    resolutions = sorted(capabilities["resolutions"], key=_pixels, reverse=True)
+    bitrates = sorted(capabilities["bitrates"], reverse=True)
+    frame_rates = sorted(capabilities["frame_rates"], key=frames_per_second, reverse=True)
+
+    ladder: List[QualityLevel] = []
+    if resolutions and bitrates and frame_rates:
+        for i, resolution in enumerate(resolutions):
+            bitrate = bitrates[min(i, len(bitrates) - 1)]
+            ladder.append(
+                QualityLevel(VideoQuality.HIGH, resolution, bitrate, frame_rates[0])
+            )
+        if len(frame_rates) > 1:
+            last = ladder[-1]
+            ladder.append(
+                QualityLevel(
+                    VideoQuality.HIGH, last.resolution, last.bitrate, frame_rates[-1]
+                )
+            )
+    ladder.append(QualityLevel(VideoQuality.LOW))
+    return ladder
+
+
+@dataclass(frozen=True)
+class StreamSample:
+    """Consumer health measured over one controller interval."""
+
+    fps: float  # decoded frames per second
+    lag: float  # worst age (seconds) of the frames consumed
+    dropped: int  # frames dropped because the consumer fell behind
+
+
+@dataclass
+class QualityPolicy:
+    """
+    Thresholds of QualityController.
+
+    A sample is overloaded when lag exceeds max_lag, frames were dropped, or
+    the decode rate is below min_fps_ratio of the level frame rate. It is
+    healthy when lag stays under recover_lag and nothing was dropped.
+    Downgrades need downgrade_after overloaded samples in a row, upgrades
+    upgrade_after healthy ones, and no switch happens within min_dwell
+    seconds of the previous one. An upgrade undone within upgrade_backoff
+    seconds doubles upgrade_after for the next attempt.
+    """
+
+    max_lag: float = 0.5
+    recover_lag: float = 0.2
+    min_fps_ratio: float = 0.8
+    downgrade_after: int = 3
+    upgrade_after: int = 20
+    min_dwell: float = 10.0
+    upgrade_backoff: float = 60.0
+    max_upgrade_after: int = 320
+
+
+@dataclass
+class QualityStats:
+    level: int = 0
+    downgrades: int = 0
+    upgrades: int = 0
+    errors: int = 0
+    last_error: Optional[Exception] = None
+    last_sample: Optional[StreamSample] = None
+
+
+class QualityController:
+    """
+    Adapts the stream quality of a Camera to what its consumer keeps up with.
+
+    Measures the decode rate of camera.frame_source(), the frames dropped by
+    the consumer subscription and the lag reported through observe(). Steps
+    down the quality ladder when the consumer falls behind and back up once
+    it has been healthy for a while, with hysteresis so it does not flap.
+
+    On a device that cannot change its main stream parameters, the ladder
+    falls back to switching between the high and low streams. Errors of the
+    background thread are counted in stats and the next sample retries.
+    """
+
+    def __init__(
+        self,
+        camera: "Camera",
+        subscription: Optional[FrameSubscription] = None,
+        ladder: Optional[List[QualityLevel]] = None,
+        policy: Optional[QualityPolicy] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._camera = camera
+        self._subscription = subscription
+        self._ladder = ladder or build_quality_ladder(camera.get_video_capabilities())
+        self._policy = policy or QualityPolicy()
+        self._clock = clock
+
+        self._level = (
+            len(self._ladder) - 1 if camera.stream_quality == VideoQuality.LOW else 0
+        )
+        self._applied: Optional[VideoSettings] = None
+        self._overloaded = 0
+        self._healthy = 0
+        self._upgrade_after = self._policy.upgrade_after
+        self._last_switch = -float("inf")
+        self._last_upgrade = -float("inf")
+
+        self._lag = 0.0
+        self._dropped = 0 if subscription is None else subscription.dropped
+        self._lock = threading.Lock()
+        self._stats = QualityStats(level=self._level)
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ladder(self) -> List[QualityLevel]:
+        return list(self._ladder)
+
+    @property
+    def level(self) -> QualityLevel:
+        return self._ladder[self._level]
+
+    @property
+    def stats(self) -> QualityStats:
+        with self._lock:
+            return QualityStats(**vars(self._stats))
+
+    def observe(self, frame: Frame):
+        """Reports a frame the consumer finished processing, to measure its lag."""
+        lag = time.monotonic() - frame.timestamp
+        with self._lock:
+            self._lag = max(self._lag, lag)
+
+    def measure(self) -> StreamSample:
+        """Sample since the previous call."""
+        fps = self._camera.frame_source().stats.fps
+        with self._lock:
+            lag, self._lag = self._lag, 0.0
+        dropped = 0
+        if self._subscription is not None:
+            total = self._subscription.dropped
+            dropped, self._dropped = total - self._dropped, total
+        return StreamSample(fps, lag, dropped)
+
+    def update(self, sample: StreamSample) -> Optional[QualityLevel]:
+        """Feeds one sample. Returns the new level if the quality was switched."""
+        policy = self._policy
+        level = self.level
+        overloaded = (
+            sample.lag > policy.max_lag
+            or sample.dropped > 0
+            or (
+                level.frame_rate is not None
+                and sample.fps
+                < frames_per_second(level.frame_rate) * policy.min_fps_ratio
+            )
+        )
+        healthy = sample.lag <= policy.recover_lag and sample.dropped == 0
+
+        self._overloaded = self._overloaded + 1 if overloaded else 0
+        self._healthy = self._healthy + 1 if healthy else 0
+        with self._lock:
+            self._stats.last_sample = sample
+
+        now = self._clock()
+        held = now - self._last_upgrade >= policy.upgrade_backoff
+        if self._last_switch == self._last_upgrade and held:
+            # The last upgrade held, later ones are tried at the normal pace
+            self._upgrade_after = policy.upgrade_after
+        if now - self._last_switch < policy.min_dwell:
+            return None
+
+        last = len(self._ladder) - 1
+        if self._overloaded >= policy.downgrade_after and self._level < last:
+            if self._last_switch == self._last_upgrade and not held:
+                self._upgrade_after = min(
+                    self._upgrade_after * 2, policy.max_upgrade_after
+                )
+            return self._switch(self._level + 1, now)
+
+        if self._healthy >= self._upgrade_after and self._level > 0:
+            self._last_upgrade = now
+            return self._switch(self._level - 1, now)
+        return None
+
+    def step(self) -> Optional[QualityLevel]:
+        """Measures and updates once."""
+        return self.update(self.measure())
+
+    def start(self, interval: float = DEFAULT_INTERVAL) -> "QualityController":
+        """Runs step() every interval seconds on a background thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(interval,), name="pycam-quality", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    ### INTERNAL
+
+    def _run(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.step()
+            except Exception as e:
+                # A failed switch is retried on a later sample
+                with self._lock:
+                    self._stats.errors += 1
+                    self._stats.last_error = e
+
+    def _switch(self, index: int, now: float) -> QualityLevel:
+        previous, level = self._level, self._ladder[index]
+        downgrade = index > previous
+        if level.stream == VideoQuality.HIGH:
+            settings = level.settings()
+            if settings and settings != self._applied:
+                try:
+                    self._camera.set_video_specs(settings)
+                except NotImplementedError:
+                    # The device cannot change its main stream, only switch streams
+                    index = 1 if downgrade else 0
+                    self._ladder = [
+                        QualityLevel(VideoQuality.HIGH),
+                        QualityLevel(VideoQuality.LOW),
+                    ]
+                    level = self._ladder[index]
+                else:
+                    self._applied = settings
+        self._camera.switch_stream(level.stream)
+
+        self._level = index
+        self._last_switch = now
+        self._overloaded = 0
+        self._healthy = 0
+        with self._lock:
+            self._stats.level = index
+            if downgrade:
+                self._stats.downgrades += 1
+            else:
+                self._stats.upgrades += 1
+        return level
@@ -0,0 +1,498 @@
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Deque, List, Optional, Protocol, Tuple, Union
+import queue
+import threading
+import time
+
+import numpy as np
+
+from .stream import FrameSource
+from .utils import lazy_import
+
+cv2 = lazy_import("cv2")
+
+DEFAULT_PRE_ROLL = 5.0
+DEFAULT_POST_ROLL = 5.0
+DEFAULT_SEGMENT_SECONDS = 60.0
+DEFAULT_CONTAINER = "mkv"
+# Packets queued to the writer before new ones are dropped
+DEFAULT_WRITE_QUEUE = 4096
+# Seconds an event start or end waits for room in the writer queue
+CONTROL_TIMEOUT = 5.0
+
+
+@dataclass(frozen=True)
+class Packet:
+    """Encoded video packet, as demuxed from the stream."""
+
+    data: np.ndarray  # uint8 bytes
+    keyframe: bool
+    timestamp: float  # time.monotonic()
+
+
+@dataclass(frozen=True)
+class StreamFormat:
+    fourcc: int
+    fps: float
+    size: Tuple[int, int]
+
+
+class PacketReader:
+    """
+    Demuxes encoded packets of a stream without decoding them.
+
+    Uses cv2.VideoCapture in raw mode (CAP_PROP_FORMAT -1), so recording costs
+    no decode and the packets are written back as they arrived.
+    """
+
+    def __init__(self, source: str, realtime: Optional[bool] = None):
+        """
+        realtime: pace reads at the stream frame rate. Defaults to True for files.
+        """
+        self._source = source
+        self.live = "://" in source
+        self._realtime = (not self.live) if realtime is None else realtime
+        self._capture: Optional[cv2.VideoCapture] = None
+        self._period = 0.0
+        self._next_read = 0.0
+        self.format: Optional[StreamFormat] = None
+
+    def open(self):
+        self._capture = cv2.VideoCapture(
+            self._source, cv2.CAP_FFMPEG, [cv2.CAP_PROP_FORMAT, -1]
+        )
+        fps = self._capture.get(cv2.CAP_PROP_FPS)
+        self.format = StreamFormat(
+            int(self._capture.get(cv2.CAP_PROP_FOURCC)),
+            fps if fps > 0 else 15.0,
+            (
+                int(self._capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(self._capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            ),
+        )
+        self._period = 1.0 / fps if self._realtime and fps > 0 else 0.0
+        self._next_read = time.monotonic()
+
+    def read(self) -> Optional[Packet]:
+        if self._capture is None or not self._capture.isOpened():
+            return None
+        if self._period:
+            delay = self._next_read - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_read = max(self._next_read + self._period, time.monotonic())
+        ok, data = self._capture.read()
+        if not ok:
+            return None
+        keyframe = bool(self._capture.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME))
+        return Packet(data.reshape(-1).copy(), keyframe, time.monotonic())
+
+    def release(self):
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+
+
+class PreRollBuffer:
+    """
+    Most recent encoded packets, spanning at least `seconds` and starting at a keyframe.
+
+    Holds compressed packets, a few seconds cost a few megabytes at most.
+    """
+
+    def __init__(self, seconds: float = DEFAULT_PRE_ROLL):
+        self.seconds = seconds
+        # Groups of pictures, each starting at a keyframe
+        self._gops: Deque[List[Packet]] = deque()
+
+    def append(self, packet: Packet):
+        if packet.keyframe:
+            self._gops.append([packet])
+        elif self._gops:
+            self._gops[-1].append(packet)
+        else:
+            # Packets before the first keyframe cannot be decoded
+            return
+        # Drop the oldest GOP while the next one still starts before the window
+        horizon = packet.timestamp - self.seconds
+        while len(self._gops) > 1 and self._gops[1][0].timestamp <= horizon:
+            self._gops.popleft()
+
+    def drain(self) -> List[Packet]:
+        packets = [packet for gop in self._gops for packet in gop]
+        self._gops.clear()
+        return packets
+
+    def __len__(self) -> int:
+        return sum(len(gop) for gop in self._gops)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(packet.data.nbytes for gop in self._gops for packet in gop)
+
+
+class MotionDetector:
+    """
+    Frame-difference motion detector for small grayscale frames.
+
+    A pixel changed when it differs from the previous frame by more than
+    pixel_threshold. Motion is reported when the changed fraction of the frame
+    exceeds min_area.
+    """
+
+    def __init__(self, pixel_threshold: int = 25, min_area: float = 0.01):
+        self.pixel_threshold = pixel_threshold
+        self.min_area = min_area
+        self._previous: Optional[np.ndarray] = None
+        self._diff: Optional[np.ndarray] = None
+        self.score = 0.0
+
+    def update(self, image: np.ndarray) -> bool:
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        previous, self._previous = self._previous, image.copy()
+        if previous is None or previous.shape != image.shape:
+            self.score = 0.0
+            return False
+        if self._diff is None or self._diff.shape != image.shape:
+            self._diff = np.empty_like(image)
+        cv2.absdiff(image, previous, dst=self._diff)
+        changed = np.count_nonzero(self._diff > self.pixel_threshold)
+        self.score = changed / self._diff.size
+        return self.score > self.min_area
+
+
+class PacketSink(Protocol):
+    def write(self, data: np.ndarray) -> None: ...
+
+    def release(self) -> None: ...
+
+
+def open_video_file(path: str, fmt: StreamFormat) -> PacketSink:
+    """Container writer remuxing encoded packets without re-encoding."""
+    writer = cv2.VideoWriter(
+        path,
+        cv2.CAP_FFMPEG,
+        fmt.fourcc,
+        fmt.fps,
+        fmt.size,
+        [cv2.VIDEOWRITER_PROP_RAW_VIDEO, 1],
+    )
+    if not writer.isOpened():
+        raise OSError(f"Cannot open {path} for writing")
+    return writer
+
+
+@dataclass
+class RecorderStats:
+    events: int = 0
+    segments: int = 0
+    packets: int = 0
+    bytes: int = 0
+    dropped: int = 0
+    errors: int = 0
+    last_error: Optional[Exception] = None
+
+
+class SegmentWriter:
+    """
+    Writes recording events to segmented files on its own thread.
+
+    Each event starts a new file; a file is split at the first keyframe after
+    segment_seconds. The capture thread only enqueues packets. A file that
+    cannot be opened or written is closed and counted in stats.errors, and
+    writing resumes with a new file at the next keyframe.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        prefix: str = "motion",
+        container: str = DEFAULT_CONTAINER,
+        segment_seconds: float = DEFAULT_SEGMENT_SECONDS,
+        open_file: Callable[[str, StreamFormat], PacketSink] = open_video_file,
+        max_queue: int = DEFAULT_WRITE_QUEUE,
+    ):
+        self.directory = Path(directory)
+        self._prefix = prefix
+        self._container = container
+        self._segment_seconds = segment_seconds
+        self._open_file = open_file
+        self._queue: "queue.Queue[Tuple[str, object]]" = queue.Queue(max_queue)
+        self._closed = threading.Event()
+        self._stats = RecorderStats()
+        self._lock = threading.Lock()
+        self.files: List[Path] = []
+
+        self._sink: Optional[PacketSink] = None
+        self._format: Optional[StreamFormat] = None
+        self._event_start = ""
+        self._segment_index = 0
+        self._segment_start = 0.0
+
+        self._thread = threading.Thread(
+            target=self._run, name="pycam-recorder-writer", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def stats(self) -> RecorderStats:
+        with self._lock:
+            return RecorderStats(**vars(self._stats))
+
+    def start_event(self, fmt: StreamFormat):
+        self._control("start", fmt)
+
+    def write(self, packet: Packet):
+        try:
+            self._queue.put_nowait(("packet", packet))
+        except queue.Full:
+            with self._lock:
+                self._stats.dropped += 1
+
+    def end_event(self):
+        self._control("end", None)
+
+    def flush(self):
+        """Waits until every queued packet is written."""
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def close(self, timeout: Optional[float] = CONTROL_TIMEOUT):
+        """Writes the queued packets, within timeout, and closes the current file."""
+        self._closed.set()
+        self._thread.join(timeout)
+
+    ### INTERNAL
+
+    def _control(self, command: str, value: object):
+        try:
+            self._queue.put((command, value), timeout=CONTROL_TIMEOUT)
+        except queue.Full:
+            with self._lock:
+                self._stats.dropped += 1
+
+    def _run(self):
+        while True:
+            try:
+                command, value = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                if self._closed.is_set():
+                    self._close_segment()
+                    return
+                continue
+            try:
+                if command == "start":
+                    self._close_segment()
+                    self._format = value  # type: ignore[assignment]
+                    event_start = time.strftime("%Y%m%d-%H%M%S")
+                    if event_start != self._event_start:
+                        # Events starting within the same second keep numbering
+                        self._event_start = event_start
+                        self._segment_index = 0
+                    with self._lock:
+                        self._stats.events += 1
+                elif command == "packet":
+                    self._write(value)  # type: ignore[arg-type]
+                elif command == "end":
+                    self._close_segment()
+                    self._format = None
+            except Exception as e:
+                # A failing file must not stop the writer, the next keyframe opens a new one
+                self._report(e)
+                self._close_segment()
+            finally:
+                self._queue.task_done()
+
+    def _write(self, packet: Packet):
+        if self._format is None:
+            return
+        if self._sink is not None and packet.keyframe:
+            if packet.timestamp - self._segment_start >= self._segment_seconds:
+                self._close_segment()
+        if self._sink is None:
+            if not packet.keyframe:
+                return
+            self._open_segment(packet.timestamp)
+        assert self._sink is not None
+        self._sink.write(packet.data)
+        with self._lock:
+            self._stats.packets += 1
+            self._stats.bytes += packet.data.nbytes
+
+    def _open_segment(self, timestamp: float):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f"{self._prefix}_{self._event_start}_{self._segment_index:03d}.{self._container}"
+        path = self.directory / name
+        assert self._format is not None
+        self._sink = self._open_file(str(path), self._format)
+        self._segment_start = timestamp
+        self._segment_index += 1
+        self.files.append(path)
+        with self._lock:
+            self._stats.segments += 1
+
+    def _close_segment(self):
+        sink, self._sink = self._sink, None
+        if sink is not None:
+            try:
+                sink.release()
+            except Exception as e:
+                self._report(e)
+
+    def _report(self, error: Exception):
+        with self._lock:
+            self._stats.errors += 1
+            self._stats.last_error = error
+
+
+class MotionRecorder:
+    """
+    Records a stream only around motion, including a pre-roll before the trigger.
+
+    Encoded packets of record_source are kept in a PreRollBuffer. Motion is
+    detected on frames of detect_source, typically a downscaled grayscale
+    pipeline of the low stream, which the recorder starts and stops. On motion, the pre-roll and the following
+    packets are remuxed to segmented files by a SegmentWriter, until no motion
+    was seen for post_roll seconds.
+    """
+
+    def __init__(
+        self,
+        record_source: Union[PacketReader, str],
+        directory: str,
+        detect_source: Optional[FrameSource] = None,
+        detector: Optional[MotionDetector] = None,
+        pre_roll: float = DEFAULT_PRE_ROLL,
+        post_roll: float = DEFAULT_POST_ROLL,
+        segment_seconds: float = DEFAULT_SEGMENT_SECONDS,
+        container: str = DEFAULT_CONTAINER,
+        writer: Optional[SegmentWriter] = None,
+        reconnect_delay: float = 1.0,
+    ):
+        self._reader = (
+            PacketReader(record_source) if isinstance(record_source, str) else record_source
+        )
+        self._detect_source = detect_source
+        self._detector = detector or MotionDetector()
+        self._pre_roll = PreRollBuffer(pre_roll)
+        self._post_roll = post_roll
+        self._writer = writer or SegmentWriter(
+            directory, container=container, segment_seconds=segment_seconds
+        )
+        self._reconnect_delay = reconnect_delay
+
+        self._lock = threading.Lock()
+        self._record_until = 0.0
+        self._recording = False
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def recording(self) -> bool:
+        return self._recording
+
+    @property
+    def stats(self) -> RecorderStats:
+        return self._writer.stats
+
+    @property
+    def files(self) -> List[Path]:
+        return list(self._writer.files)
+
+    def trigger(self, timestamp: Optional[float] = None):
+        """Records from the pre-roll until post_roll seconds after timestamp."""
+        now = time.monotonic() if timestamp is None else timestamp
+        with self._lock:
+            self._record_until = max(self._record_until, now + self._post_roll)
+
+    def start(self) -> "MotionRecorder":
+        if self._threads:
+            return self
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._capture, name="pycam-recorder", daemon=True)
+        ]
+        if self._detect_source is not None:
+            self._threads.append(
+                threading.Thread(target=self._detect, name="pycam-motion", daemon=True)
+            )
+        for thread in self._threads:
+            thread.start()
+        if self._detect_source is not None:
+            self._detect_source.start()
+        return self
+
+    def stop(self):
+        """Stops capture and detection, and closes the current recording once written."""
+        self._stop.set()
+        if self._detect_source is not None:
+            self._detect_source.stop()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self._writer.close()
+
+    def wait(self, timeout: Optional[float] = None):
+        """Waits until the record source ended (files only) and everything is written."""
+        for thread in self._threads[:1]:
+            thread.join(timeout)
+        self._writer.flush()
+
+    def __enter__(self) -> "MotionRecorder":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    ### INTERNAL
+
+    def _capture(self):
+        try:
+            while not self._stop.is_set():
+                self._reader.open()
+                while not self._stop.is_set():
+                    packet = self._reader.read()
+                    if packet is None:
+                        break
+                    self._handle(packet)
+                self._reader.release()
+                if not self._reader.live:
+                    break
+                self._stop.wait(self._reconnect_delay)
+        finally:
+            if self._recording:
+                self._recording = False
+                self._writer.end_event()
+
+    def _handle(self, packet: Packet):
+        with self._lock:
+            active = packet.timestamp < self._record_until
+
+        if self._recording:
+            if active:
+                self._writer.write(packet)
+                return
+            self._recording = False
+            self._writer.end_event()
+
+        self._pre_roll.append(packet)
+        if active and self._reader.format is not None:
+            self._recording = True
+            self._writer.start_event(self._reader.format)
+            for buffered in self._pre_roll.drain():
+                self._writer.write(buffered)
+
+    def _detect(self):
+        assert self._detect_source is not None
+        with self._detect_source.subscribe() as frames:
+            while not self._stop.is_set():
+                frame = frames.get(timeout=0.5)
+                if frame is None:
+                    if not self._detect_source.running:
+                        return
+                    continue
+                if self._detector.update(frame.image):
+                    self.trigger(frame.timestamp)
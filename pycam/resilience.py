@@ -0,0 +1,159 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Optional, Tuple, Type, TypeVar
+import random
+import threading
+import time
+
+from .errors import CircuitOpenError, CommandError
+
+R = TypeVar("R")
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter: delay n is uniform in [0, min(max_delay, base_delay * 2**n)]."""
+
+    attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+    retry_on: Tuple[Type[Exception], ...] = (CommandError,)
+
+    def delay(self, attempt: int, rng: Callable[[], float] = random.random) -> float:
+        return rng() * min(self.max_delay, self.base_delay * (2**attempt))
+
+
+class BreakerState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class BreakerStats:
+    state: BreakerState
+    failures: int
+    total_failures: int
+    rejected: int
+    opened: int
+
+
+class CircuitBreaker:
+    """
+    Stops calling a device after failure_threshold consecutive failures.
+
+    While open, calls fail immediately with CircuitOpenError. After
+    reset_timeout a single trial call is let through (half open): success
+    closes the breaker, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._total_failures = 0
+        self._rejected = 0
+        self._opened = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> BreakerState:
+        with self._lock:
+            return self._current_state()
+
+    @property
+    def stats(self) -> BreakerStats:
+        with self._lock:
+            return BreakerStats(
+                self._current_state(),
+                self._failures,
+                self._total_failures,
+                self._rejected,
+                self._opened,
+            )
+
+    def call(self, fn: Callable[[], R]) -> R:
+        self._before_call()
+        try:
+            result = fn()
+        except Exception:
+            self._on_failure()
+            raise
+        self._on_success()
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._state = BreakerState.CLOSED
+            self._failures = 0
+            self._trial_running = False
+
+    ### INTERNAL
+
+    def _current_state(self) -> BreakerState:
+        if (
+            self._state == BreakerState.OPEN
+            and self._clock() - self._opened_at >= self._reset_timeout
+        ):
+            return BreakerState.HALF_OPEN
+        return self._state
+
+    def _before_call(self):
+        with self._lock:
+            state = self._current_state()
+            if state == BreakerState.CLOSED:
+                return
+            if state == BreakerState.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return
+            self._rejected += 1
+            retry_after = max(0.0, self._opened_at + self._reset_timeout - self._clock())
+        raise CircuitOpenError("Circuit breaker open, camera unavailable", retry_after)
+
+    def _on_success(self):
+        with self._lock:
+            self._state = BreakerState.CLOSED
+            self._failures = 0
+            self._trial_running = False
+
+    def _on_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._total_failures += 1
+            reopen = self._trial_running
+            trip = self._state == BreakerState.CLOSED and self._failures >= self._threshold
+            if reopen or trip:
+                self._state = BreakerState.OPEN
+                self._opened_at = self._clock()
+                self._opened += 1
+            self._trial_running = False
+
+
+def call_with_retry(
+    fn: Callable[[], R],
+    policy: RetryPolicy,
+    breaker: Optional[CircuitBreaker] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> R:
+    """Calls fn through the breaker, retrying policy.retry_on errors with backoff."""
+    attempt = 0
+    while True:
+        try:
+            return breaker.call(fn) if breaker else fn()
+        except CircuitOpenError:
+            # Retrying would only wait for the same answer
+            raise
+        except policy.retry_on:
+            attempt += 1
+            if attempt >= policy.attempts:
+                raise
+            sleep(policy.delay(attempt - 1))
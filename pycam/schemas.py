@@ -68,6 +68,15 @@ class VideoSpecs(TypedDict):
     quality: int
 
 
+class VideoSettings(TypedDict, total=False):
+    """Main stream parameters to change, omitted keys are left as they are."""
+
+    bitrate: VideoBitrate
+    frame_rate: int
+    resolution: VideoResolution
+    quality: VideoQuality
+
+
 class VideoCapability(TypedDict):
     encode_types: List[VideoEncodeType]
     frame_rates: List[int]
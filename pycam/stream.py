@@ -0,0 +1,353 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Iterator, List, Optional, Union
+import threading
+import time
+
+import numpy as np
+
+from .utils import lazy_import
+
+cv2 = lazy_import("cv2")
+
+DEFAULT_RECONNECT_DELAY = 1.0
+# Frames used to measure the decode rate
+STATS_WINDOW = 30
+
+
+@dataclass(frozen=True)
+class Frame:
+    """Decoded frame with its sequence number and capture time (time.monotonic())."""
+
+    image: np.ndarray
+    seq: int
+    timestamp: float
+
+
+@dataclass(frozen=True)
+class FrameSourceStats:
+    frames: int
+    fps: float  # decode rate over the last STATS_WINDOW frames
+    reconnects: int
+
+
+class FrameReader(ABC):
+    """Blocking producer of decoded frames."""
+
+    # Live readers are reopened on failure, others end the stream
+    live: bool = True
+
+    @abstractmethod
+    def open(self): ...
+
+    @abstractmethod
+    def read(self) -> Optional[np.ndarray]:
+        """Returns the next frame, or None if the stream failed or ended."""
+
+    def skip(self) -> bool:
+        """Advances past the next frame without returning it. False if the stream failed or ended."""
+        return self.read() is not None
+
+    @abstractmethod
+    def release(self): ...
+
+
+class CaptureReader(FrameReader):
+    """Reads frames with cv2.VideoCapture from an RTSP url or a local video file."""
+
+    def __init__(self, source: str, realtime: Optional[bool] = None):
+        """
+        source: RTSP url or video file path
+        realtime: pace reads at the stream frame rate. Defaults to True for files,
+                  live streams are already paced by the device.
+        """
+        self._source = source
+        self.live = "://" in source
+        self._realtime = (not self.live) if realtime is None else realtime
+        self._capture: Optional[cv2.VideoCapture] = None
+        self._period = 0.0
+        self._next_read = 0.0
+
+    def open(self):
+        self._capture = cv2.VideoCapture(self._source)
+        # Keep the decoder queue short, stale frames are useless
+        self._capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        fps = self._capture.get(cv2.CAP_PROP_FPS)
+        self._period = 1.0 / fps if self._realtime and fps > 0 else 0.0
+        self._next_read = time.monotonic()
+
+    def read(self) -> Optional[np.ndarray]:
+        if self._capture is None or not self._capture.isOpened():
+            return None
+        self._pace()
+        ok, image = self._capture.read()
+        return image if ok else None
+
+    def skip(self) -> bool:
+        # grab() demuxes and decodes, but skips the color conversion and copy of retrieve()
+        if self._capture is None or not self._capture.isOpened():
+            return False
+        self._pace()
+        return bool(self._capture.grab())
+
+    def release(self):
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+
+    def _pace(self):
+        if self._period:
+            delay = self._next_read - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_read = max(self._next_read + self._period, time.monotonic())
+
+
+class SyntheticReader(FrameReader):
+    """Generates frames of a moving gradient. Useful for tests and benchmarks."""
+
+    def __init__(
+        self,
+        width: int = 640,
+        height: int = 360,
+        fps: float = 30.0,
+        count: Optional[int] = None,
+    ):
+        self.live = count is None
+        self._width = width
+        self._height = height
+        self._period = 1.0 / fps if fps > 0 else 0.0
+        self._count = count
+        self._index = 0
+        self._next_read = 0.0
+        self._base = np.tile(
+            np.linspace(0, 255, width, dtype=np.uint8), (height, 1)
+        )
+
+    def open(self):
+        self._index = 0
+        self._next_read = time.monotonic()
+
+    def read(self) -> Optional[np.ndarray]:
+        if self._count is not None and self._index >= self._count:
+            return None
+        if self._period:
+            delay = self._next_read - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_read += self._period
+        shifted = np.roll(self._base, self._index * 4, axis=1)
+        self._index += 1
+        return np.dstack((shifted, shifted, shifted))
+
+    def release(self):
+        pass
+
+
+class FrameSubscription:
+    """Bounded queue of frames for one consumer. The oldest frame is dropped when full."""
+
+    def __init__(self, source: "FrameSource", maxsize: int):
+        self._source = source
+        self._frames: Deque[Frame] = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Frame]:
+        """Returns the oldest queued frame, or None on timeout or once closed."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._frames or self._closed, timeout)
+            return self._frames.popleft() if self._frames else None
+
+    def close(self):
+        self._source._unsubscribe(self)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __iter__(self) -> Iterator[Frame]:
+        while True:
+            frame = self.get()
+            if frame is None:
+                return
+            yield frame
+
+    def __enter__(self) -> "FrameSubscription":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _put(self, frame: Frame):
+        with self._cond:
+            if len(self._frames) == self._frames.maxlen:
+                self.dropped += 1
+            self._frames.append(frame)
+            self._cond.notify_all()
+
+
+class FrameSource:
+    """
+    Decodes a video stream once on a background thread and shares its frames.
+
+    Consumers either poll the latest frame or subscribe to a bounded queue.
+    Only the most recent frames are kept, so slow consumers never see a
+    growing backlog.
+    """
+
+    def __init__(
+        self,
+        reader: Union[FrameReader, str],
+        reconnect_delay: float = DEFAULT_RECONNECT_DELAY,
+    ):
+        """
+        reader: FrameReader, or RTSP url / video file path read with CaptureReader
+        """
+        self._reader = self._as_reader(reader)
+        self._next_reader: Optional[FrameReader] = None
+        self._reconnect_delay = reconnect_delay
+        self._latest: Optional[Frame] = None
+        self._seq = 0
+        self._subscribers: List[FrameSubscription] = []
+        self._publish_times: Deque[float] = deque(maxlen=STATS_WINDOW)
+        self._reconnects = 0
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._done = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "FrameSource":
+        if self.running:
+            return self
+        self._stop.clear()
+        self._done = False
+        self._thread = threading.Thread(
+            target=self._run, name="pycam-frames", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def stats(self) -> FrameSourceStats:
+        with self._cond:
+            times = list(self._publish_times)
+            frames, reconnects = self._seq, self._reconnects
+        fps = 0.0
+        if len(times) > 1:
+            # Measured up to now, so a stalled stream reads as slowing down
+            fps = (len(times) - 1) / max(time.monotonic() - times[0], 1e-9)
+        return FrameSourceStats(frames, fps, reconnects)
+
+    def switch(self, reader: Union[FrameReader, str]):
+        """
+        Replaces the stream being decoded, e.g. to change stream quality.
+
+        Subscribers and sequence numbers carry over. The current reader is
+        released after its next frame.
+        """
+        with self._cond:
+            self._next_reader = self._as_reader(reader)
+
+    def latest(self, max_age: Optional[float] = None) -> Optional[Frame]:
+        """Most recent frame, None if nothing has been decoded yet or it is older than max_age."""
+        with self._cond:
+            frame = self._latest
+        if frame is not None and max_age is not None:
+            if time.monotonic() - frame.timestamp > max_age:
+                return None
+        return frame
+
+    def wait_frame(
+        self, after_seq: int = 0, timeout: Optional[float] = None
+    ) -> Optional[Frame]:
+        """Waits for a frame newer than after_seq."""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: (self._latest is not None and self._latest.seq > after_seq)
+                or self._done,
+                timeout,
+            )
+            if self._latest is not None and self._latest.seq > after_seq:
+                return self._latest
+            return None
+
+    def subscribe(self, maxsize: int = 1) -> FrameSubscription:
+        """Returns a queue receiving every new frame, keeping at most maxsize."""
+        subscription = FrameSubscription(self, maxsize)
+        with self._cond:
+            self._subscribers.append(subscription)
+        return subscription
+
+    def __enter__(self) -> "FrameSource":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    ### INTERNAL
+
+    @staticmethod
+    def _as_reader(reader: Union[FrameReader, str]) -> FrameReader:
+        return CaptureReader(reader) if isinstance(reader, str) else reader
+
+    def _take_next_reader(self) -> bool:
+        with self._cond:
+            reader, self._next_reader = self._next_reader, None
+            if reader is None:
+                return False
+            self._reader = reader
+            self._publish_times.clear()
+            return True
+
+    def _unsubscribe(self, subscription: FrameSubscription):
+        with self._cond:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def _run(self):
+        try:
+            self._take_next_reader()
+            while not self._stop.is_set():
+                self._reader.open()
+                while not self._stop.is_set() and self._next_reader is None:
+                    image = self._reader.read()
+                    if image is None:
+                        break
+                    self._publish(image)
+                self._reader.release()
+                if self._take_next_reader():
+                    continue
+                if not self._reader.live:
+                    break
+                self._reconnects += 1
+                self._stop.wait(self._reconnect_delay)
+        finally:
+            with self._cond:
+                self._done = True
+                subscribers = list(self._subscribers)
+                self._cond.notify_all()
+            for subscription in subscribers:
+                subscription.close()
+
+    def _publish(self, image: np.ndarray):
+        with self._cond:
+            self._seq += 1
+            frame = Frame(image, self._seq, time.monotonic())
+            self._latest = frame
+            self._publish_times.append(frame.timestamp)
+            subscribers = list(self._subscribers)
+            self._cond.notify_all()
+        for subscription in subscribers:
+            subscription._put(frame)
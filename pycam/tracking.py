@@ -0,0 +1,304 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Deque, List, Optional, Tuple
+import math
+import threading
+import time
+
+import numpy as np
+
+from .calibration import CameraCalibration
+from .motion import MotorTimingProfile
+from .stream import FrameSource
+
+if TYPE_CHECKING:
+    from .camera import Camera
+
+DEFAULT_STATS_INTERVAL = 1.0
+
+Point = Tuple[float, float]
+# Returns the target pixel in a frame, or None when no target is seen
+Detector = Callable[[np.ndarray], Optional[Point]]
+
+
+def pixel_to_angles(
+    calibration: CameraCalibration,
+    point: Point,
+    image_size: Optional[Tuple[int, int]] = None,
+) -> Tuple[float, float]:
+    """
+    (pan, tilt) degrees from the optical axis to the view ray of a pixel.
+
+    Pan is positive to the right, tilt positive up. image_size is the (width,
+    height) of the frame point belongs to when it is not the calibrated size,
+    e.g. a downscaled detection frame.
+    """
+    x, y = point
+    if image_size is not None:
+        x *= calibration.width / image_size[0]
+        y *= calibration.height / image_size[1]
+    ray = calibration.pixel_to_ray(np.array([[x, y]], dtype=np.float64))[0]
+    pan = math.degrees(math.atan2(ray[0], ray[2]))
+    tilt = math.degrees(math.atan2(-ray[1], math.hypot(ray[0], ray[2])))
+    return pan, tilt
+
+
+@dataclass
+class TrackingPolicy:
+    """
+    Gains and limits of PTZTracker, angles in degrees.
+
+    kp scales the predicted error, below 1 the camera approaches the target
+    without overshooting. ki integrates the residual error (degree seconds),
+    bounded by max_integral. kd scales the lead on the target angular velocity
+    over the time a move takes to land. Errors within deadband are not
+    corrected. pan_direction and tilt_direction are -1 for a camera whose
+    motor axes are reversed, e.g. mounted upside down.
+    """
+
+    kp: float = 0.8
+    ki: float = 0.1
+    kd: float = 0.5
+    deadband: float = 2.0
+    max_integral: float = 10.0
+    velocity_smoothing: float = 0.5
+    lost_after: float = 1.0
+    pan_direction: float = 1.0
+    tilt_direction: float = 1.0
+
+
+@dataclass
+class TrackingStats:
+    updates: int = 0
+    commands: int = 0
+    error: float = 0.0  # last tracking error (degrees)
+    mean_error: float = 0.0  # over the last stats interval
+    commands_per_second: float = 0.0  # over the last stats interval
+
+
+@dataclass(frozen=True)
+class _Move:
+    pan: float
+    tilt: float
+    settled_at: float
+
+
+class PTZTracker:
+    """
+    Keeps a target centered by moving the pan/tilt motor.
+
+    Target pixels are converted to angles through the camera intrinsics. Each
+    frame shows the camera where it was when captured, so moves that had not
+    landed by then (motor latency plus travel, from the camera motion model) are
+    subtracted from the measured error instead of being sent again. The target
+    is led by its angular velocity over the time the next move takes to land.
+    A single move is in flight at a time and errors within the deadband are
+    ignored, which keeps the command rate low and avoids oscillation.
+
+    Without an explicit profile, the camera motion model is read on every
+    move, so what it learns applies to tracking right away.
+
+    Every stats_interval seconds the tracking error and command rate are
+    passed to on_stats.
+    """
+
+    def __init__(
+        self,
+        camera: "Camera",
+        calibration: Optional[CameraCalibration] = None,
+        policy: Optional[TrackingPolicy] = None,
+        profile: Optional[MotorTimingProfile] = None,
+        on_stats: Optional[Callable[[TrackingStats], None]] = None,
+        stats_interval: float = DEFAULT_STATS_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._camera = camera
+        self._calibration = calibration or camera.calibration
+        self._policy = policy or TrackingPolicy()
+        self._profile = profile
+        self._on_stats = on_stats
+        self._stats_interval = stats_interval
+        self._clock = clock
+
+        self._moves: Deque[_Move] = deque()
+        self._busy_until = -float("inf")
+        self._last_seen: Optional[float] = None
+        self._last_target: Optional[Tuple[float, float]] = None
+        self._velocity = (0.0, 0.0)
+        self._integral = [0.0, 0.0]
+
+        self._lock = threading.Lock()
+        self._stats = TrackingStats()
+        self._window_start = clock()
+        self._window_errors: List[float] = []
+        self._window_commands = 0
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def stats(self) -> TrackingStats:
+        with self._lock:
+            return TrackingStats(**vars(self._stats))
+
+    @property
+    def profile(self) -> MotorTimingProfile:
+        """Motor timing used for the next move."""
+        if self._profile is not None:
+            return self._profile
+        return self._camera.motion_model.profile
+
+    def update(
+        self,
+        point: Optional[Point],
+        timestamp: Optional[float] = None,
+        image_size: Optional[Tuple[int, int]] = None,
+    ) -> Optional[Tuple[float, float]]:
+        """
+        Feeds the target pixel seen in a frame captured at timestamp.
+
+        point is None when the frame has no target. Returns the (pan, tilt)
+        move sent, or None.
+        """
+        now = self._clock()
+        timestamp = now if timestamp is None else timestamp
+        move = None
+        if point is None:
+            if self._last_seen is not None and now - self._last_seen > self._policy.lost_after:
+                self._reset()
+        else:
+            move = self._track(point, timestamp, image_size, now)
+        self._report(now)
+        return move
+
+    def start(self, source: FrameSource, detect: Detector) -> "PTZTracker":
+        """Tracks the targets detect() finds in the frames of source, on a background thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(source, detect), name="pycam-tracking", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    ### INTERNAL
+
+    def _run(self, source: FrameSource, detect: Detector):
+        # Only the newest frame matters, older ones show a stale position
+        with source.subscribe(maxsize=1) as frames:
+            while not self._stop.is_set():
+                frame = frames.get(timeout=0.5)
+                if frame is None:
+                    if not source.running:
+                        return
+                    continue
+                height, width = frame.image.shape[:2]
+                self.update(detect(frame.image), frame.timestamp, (width, height))
+
+    def _track(
+        self,
+        point: Point,
+        timestamp: float,
+        image_size: Optional[Tuple[int, int]],
+        now: float,
+    ) -> Optional[Tuple[float, float]]:
+        policy = self._policy
+        pan_offset, tilt_offset = pixel_to_angles(self._calibration, point, image_size)
+        offset = (pan_offset * policy.pan_direction, tilt_offset * policy.tilt_direction)
+
+        # Where the motor was when the frame was captured
+        while self._moves and self._moves[0].settled_at <= timestamp:
+            self._moves.popleft()
+        pending_pan = sum(move.pan for move in self._moves)
+        pending_tilt = sum(move.tilt for move in self._moves)
+        commanded = (self._camera.pan, self._camera.tilt)
+        seen_from = (commanded[0] - pending_pan, commanded[1] - pending_tilt)
+        target = (seen_from[0] + offset[0], seen_from[1] + offset[1])
+
+        dt = 0.0
+        if self._last_seen is not None and self._last_target is not None:
+            dt = timestamp - self._last_seen
+            if 0 < dt <= policy.lost_after:
+                alpha = policy.velocity_smoothing
+                self._velocity = tuple(  # type: ignore[assignment]
+                    alpha * (t - last) / dt + (1 - alpha) * v
+                    for t, last, v in zip(target, self._last_target, self._velocity)
+                )
+            elif dt > policy.lost_after:
+                self._reset()
+                dt = 0.0
+        self._last_seen = timestamp
+        self._last_target = target
+
+        # Error left once the moves in flight land
+        error = [target[i] - commanded[i] for i in range(2)]
+        with self._lock:
+            self._stats.updates += 1
+            self._stats.error = math.hypot(*error)
+        self._window_errors.append(math.hypot(*error))
+
+        if 0 < dt:
+            for i in range(2):
+                self._integral[i] = max(
+                    -policy.max_integral,
+                    min(policy.max_integral, self._integral[i] + error[i] * dt),
+                )
+        if now < self._busy_until:
+            return None
+
+        # Lead the target by the time the correction takes to land
+        profile = self.profile
+        travel = profile.duration(error[0], error[1])
+        horizon = (now - timestamp) + travel
+        command = [
+            policy.kp * (error[i] + policy.kd * self._velocity[i] * horizon)
+            + policy.ki * self._integral[i]
+            for i in range(2)
+        ]
+        command = [c if abs(e) > policy.deadband else 0.0 for c, e in zip(command, error)]
+        if command == [0.0, 0.0]:
+            return None
+
+        before = (self._camera.pan, self._camera.tilt)
+        self._camera.move_motor(command[0], command[1])
+        # The camera clamps moves to its range
+        pan = self._camera.pan - before[0]
+        tilt = self._camera.tilt - before[1]
+        if pan == 0.0 and tilt == 0.0:
+            return None
+
+        settled_at = now + profile.duration(pan, tilt)
+        self._moves.append(_Move(pan, tilt, settled_at))
+        self._busy_until = settled_at
+        self._integral = [0.0, 0.0]
+        self._window_commands += 1
+        with self._lock:
+            self._stats.commands += 1
+        return pan, tilt
+
+    def _reset(self):
+        self._last_seen = None
+        self._last_target = None
+        self._velocity = (0.0, 0.0)
+        self._integral = [0.0, 0.0]
+
+    def _report(self, now: float):
+        elapsed = now - self._window_start
+        if elapsed < self._stats_interval:
+            return
+        errors = self._window_errors
+        with self._lock:
+            self._stats.mean_error = sum(errors) / len(errors) if errors else 0.0
+            self._stats.commands_per_second = self._window_commands / elapsed
+            stats = TrackingStats(**vars(self._stats))
+        self._window_start = now
+        self._window_errors = []
+        self._window_commands = 0
+        if self._on_stats is not None:
+            self._on_stats(stats)
@@ -1,3 +1,8 @@
+import importlib
+import sys
+import types
+
+
 def clamp(current: float, delta: float, min_val: float, max_val: float) -> float:
     """
     Clamp  a delta so that (current + delta) stays within [min_val, max_val].
@@ -14,3 +19,25 @@ def clamp(current: float, delta: float, min_val: float, max_val: float) -> float
     target = max(min_val, min(current + delta, max_val))
     clamped = target - current
     return clamped
+
+
+class LazyModule(types.ModuleType):
+    """
+    Module imported on first attribute access.
+
+    Once loaded, the module attributes are copied into the proxy, so later
+    lookups cost the same as on the real module.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+
+    def __getattr__(self, attr: str):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Returns the module if already imported, a LazyModule otherwise."""
+    return sys.modules.get(name) or LazyModule(name)
@@ -0,0 +1,113 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pycam.async_camera import AsyncCamera
+from pycam.api.async_api import ExecutorCameraAPI
+from pycam.motion import HomingMode
+from pycam.schemas import DayNightMode, VideoQuality
+
+from .test_camera import make_api, make_config
+
+
+def test_async_camera_create():
+    api = make_api(moving_polls=[True, False])
+
+    async def run():
+        async_api = ExecutorCameraAPI(api)
+        camera = await AsyncCamera.create(
+            async_api, make_config(homing_mode=HomingMode.POLL)
+        )
+        info = await camera.get_info()
+        return camera, info
+
+    camera, info = asyncio.run(run())
+
+    api.flip_image.assert_called_once_with(True)
+    api.set_daynight_mode.assert_called_once_with(DayNightMode.DAY)
+    api.move_motor.assert_called_with(10.0, 25.0)
+    assert (camera.pan, camera.tilt) == (10.0, 25.0)
+    assert info["device_model"] == "C200"
+    assert camera.calibration.width == 1920
+
+
+def test_async_camera_homing_fallback(monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr("pycam.async_camera.asyncio.sleep", fake_sleep)
+    api = make_api(device_model="UNKNOWN")
+
+    asyncio.run(AsyncCamera.create(ExecutorCameraAPI(api), make_config()))
+
+    assert sleeps == [pytest.approx(5.0, abs=0.1)]
+
+
+def test_executor_api_runs_cameras_concurrently():
+    apis = [make_api() for _ in range(8)]
+
+    async def run():
+        executor = ThreadPoolExecutor(max_workers=8)
+        clients = [ExecutorCameraAPI(api, executor) for api in apis]
+        return await asyncio.gather(*(client.get_info() for client in clients))
+
+    infos = asyncio.run(run())
+
+    assert len(infos) == 8
+    assert all(api.get_info.call_count == 1 for api in apis)
+
+
+def test_async_camera_lazy_create():
+    api = make_api(moving_polls=[True, False])
+
+    async def run():
+        camera = await AsyncCamera.create(
+            ExecutorCameraAPI(api), make_config(homing_mode=HomingMode.POLL), lazy=True
+        )
+        assert camera.get_url() is not None
+        await camera.ready()
+        assert camera.initialized
+        calibration = await camera.get_calibration()
+        return camera, calibration
+
+    camera, calibration = asyncio.run(run())
+
+    api.flip_image.assert_called_once_with(True)
+    assert (camera.pan, camera.tilt) == (10.0, 25.0)
+    assert calibration.width == 1920
+
+
+def test_async_goto_preset_learns_motion_time(monkeypatch):
+    async def fake_sleep(delay):
+        pass
+
+    monkeypatch.setattr("pycam.async_camera.asyncio.sleep", fake_sleep)
+    api = make_api(moving_polls=[False, True, False])
+    presets = {"door": {"pan": 100.0, "tilt": 40.0}}
+
+    async def run():
+        camera = await AsyncCamera.create(
+            ExecutorCameraAPI(api),
+            make_config(homing_mode=HomingMode.POLL, presets=presets),
+        )
+        arrival = await camera.goto_preset("door", wait=True)
+        return camera, arrival, await camera.get_motion_model()
+
+    camera, arrival, model = asyncio.run(run())
+
+    api.move_motor.assert_called_with(90.0, 15.0)
+    assert (camera.pan, camera.tilt) == (100.0, 40.0)
+    assert model.samples == 1
+
+
+def test_async_camera_url_of_stream():
+    api = make_api(moving_polls=[True, False])
+    config = make_config(homing_mode=HomingMode.POLL)
+    camera = AsyncCamera(ExecutorCameraAPI(api), config)
+
+    camera.get_url(VideoQuality.LOW)
+
+    api.get_url.assert_called_with(config, VideoQuality.LOW)
@@ -0,0 +1,93 @@
+from pycam.api.cached import CachedCameraAPI
+from pycam.schemas import DayNightMode, VideoResolution
+
+from .test_camera import make_api
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_hits_until_ttl_expires():
+    api = make_api()
+    clock = FakeClock()
+    cached = CachedCameraAPI(api, ttls={"get_info": 10.0}, clock=clock)
+
+    cached.get_info()
+    cached.get_info()
+    assert api.get_info.call_count == 1
+
+    clock.now = 11.0
+    cached.get_info()
+    assert api.get_info.call_count == 2
+    assert cached.stats["get_info"].hits == 1
+    assert cached.stats["get_info"].misses == 2
+
+
+def test_cached_values_are_copies():
+    api = make_api()
+    cached = CachedCameraAPI(api)
+
+    cached.get_info()["device_model"] = "changed"
+
+    assert cached.get_info()["device_model"] == "C200"
+
+
+def test_cached_nested_values_are_copies():
+    api = make_api()
+    api.get_video_capabilities.return_value = {"resolutions": [VideoResolution.RES_1080P]}
+    cached = CachedCameraAPI(api)
+
+    cached.get_video_capabilities()["resolutions"].clear()
+
+    assert cached.get_video_capabilities()["resolutions"] == [VideoResolution.RES_1080P]
+
+
+def test_setters_invalidate_matching_query():
+    api = make_api()
+    api.get_daynight_mode.return_value = DayNightMode.DAY
+    cached = CachedCameraAPI(api)
+
+    cached.get_daynight_mode()
+    cached.get_info()
+    cached.set_daynight_mode(DayNightMode.NIGHT)
+    cached.get_daynight_mode()
+    cached.get_info()
+
+    assert api.get_daynight_mode.call_count == 2
+    assert api.get_info.call_count == 1
+
+    cached.get_video_specs()
+    cached.set_video_specs({"frame_rate": 15})
+    cached.get_video_specs()
+    assert api.get_video_specs.call_count == 2
+
+
+def test_reboot_invalidates_everything():
+    api = make_api()
+    cached = CachedCameraAPI(api)
+
+    cached.get_info()
+    cached.get_video_specs()
+    cached.reboot()
+    cached.get_info()
+    cached.get_video_specs()
+
+    assert api.get_info.call_count == 2
+    assert api.get_video_specs.call_count == 2
+    assert cached.hits == 0
+    assert cached.misses == 4
+
+
+def test_zero_ttl_disables_cache():
+    api = make_api()
+    cached = CachedCameraAPI(api, ttls={"is_image_flipped": 0})
+
+    cached.is_image_flipped()
+    cached.is_image_flipped()
+
+    assert api.is_image_flipped.call_count == 2
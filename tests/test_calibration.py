@@ -0,0 +1,212 @@
+import numpy as np
+import pytest
+import cv2
+
+from pycam.calibration import (
+    CameraCalibration,
+    CornerCache,
+    StreamingCalibrator,
+    compute_calibration,
+    detect_corners,
+)
+from pycam.stream import FrameSource, SyntheticReader
+
+
+def distorted_calibration():
+    calibration = CameraCalibration.default(64, 48)
+    calibration.D = np.array([-0.3, 0.1, 0.0, 0.0, 0.0])
+    return calibration
+
+
+def test_rectify_matches_cv2_undistort():
+    calibration = distorted_calibration()
+    frame = np.random.default_rng(0).integers(0, 255, (48, 64, 3), dtype=np.uint8)
+
+    rectified = calibration.rectify(frame)
+    expected = cv2.undistort(frame, calibration.K, calibration.D)
+
+    assert rectified.shape == frame.shape
+    assert np.abs(rectified.astype(int) - expected.astype(int)).mean() < 2.0
+
+
+def test_rectify_maps_are_cached_per_size():
+    calibration = distorted_calibration()
+
+    maps = calibration.rectify_maps()
+    assert calibration.rectify_maps() is maps
+    assert calibration.rectify_maps((32, 24)) is not maps
+    assert maps[0].dtype == np.int16 and maps[0].shape == (48, 64, 2)
+
+
+def test_rectify_maps_invalidated_on_change():
+    calibration = distorted_calibration()
+
+    maps = calibration.rectify_maps()
+    calibration.K[0, 0] = 900.0
+    assert calibration.rectify_maps() is not maps
+
+    maps = calibration.rectify_maps()
+    calibration.D = np.zeros((5,))
+    assert calibration.rectify_maps() is not maps
+
+
+def test_yaml_round_trip(tmp_path):
+    calibration = distorted_calibration()
+    path = str(tmp_path / "calibration.yaml")
+
+    calibration.to_yaml(path)
+    loaded = CameraCalibration.from_yaml(path)
+
+    assert (loaded.width, loaded.height) == (64, 48)
+    assert np.allclose(loaded.K, calibration.K)
+    assert np.allclose(loaded.D, calibration.D)
+
+
+def test_project_and_pixel_to_ray_round_trip():
+    calibration = CameraCalibration.default(640, 480)
+    points = np.array([[0.1, -0.2, 2.0], [0.0, 0.0, 1.0], [-1.0, 0.5, 4.0]])
+
+    pixels = calibration.project(points)
+    rays = calibration.pixel_to_ray(pixels)
+
+    assert np.allclose(pixels[1], [320.0, 240.0])
+    expected = points / np.linalg.norm(points, axis=1, keepdims=True)
+    assert np.allclose(rays, expected)
+
+
+def test_undistort_points_matches_cv2_and_fills_out():
+    calibration = distorted_calibration()
+    pixels = np.random.default_rng(1).uniform(0, 48, (100, 2))
+    out = np.empty((100, 2))
+
+    result = calibration.undistort_points(pixels, out=out)
+    expected = cv2.undistortPoints(
+        pixels.reshape(-1, 1, 2), calibration.K, calibration.D, R=calibration.R, P=calibration.P
+    ).reshape(-1, 2)
+
+    assert result is out
+    assert np.allclose(out, expected)
+
+
+def test_point_apis_validate_shapes():
+    calibration = CameraCalibration.default(640, 480)
+
+    assert calibration.project(np.empty((0, 3))).shape == (0, 2)
+    with pytest.raises(ValueError):
+        calibration.pixel_to_ray(np.zeros((4, 3)))
+    with pytest.raises(ValueError):
+        calibration.project(np.zeros((4, 3)), out=np.empty((3, 2)))
+
+
+def write_chessboard_images(directory, count=6, size=(1280, 960)):
+    square = 60
+    board = np.kron(
+        (np.indices((7, 10)).sum(axis=0) % 2).astype(np.uint8) * 255,
+        np.ones((square, square), dtype=np.uint8),
+    )
+    board = cv2.copyMakeBorder(board, 60, 60, 60, 60, cv2.BORDER_CONSTANT, value=255)
+    h, w = board.shape
+    src = np.float32([[0, 0], [w, 0], [w, h], [0, h]])
+    rng = np.random.default_rng(2)
+    for i in range(count):
+        offset = np.float32([200, 150]) + rng.uniform(-40, 40, 2).astype(np.float32)
+        dst = src * 1.3 + offset + rng.uniform(-60, 60, (4, 2)).astype(np.float32)
+        H = cv2.getPerspectiveTransform(src, dst.astype(np.float32))
+        image = cv2.warpPerspective(board, H, size, borderValue=255)
+        cv2.imwrite(str(directory / f"board_{i:02d}.png"), image)
+    cv2.imwrite(str(directory / "empty.png"), np.full((size[1], size[0]), 255, np.uint8))
+
+
+def test_compute_calibration_parallel_is_deterministic(tmp_path):
+    write_chessboard_images(tmp_path)
+    pattern = str(tmp_path / "*.png")
+
+    serial, serial_stats = compute_calibration(pattern, workers=1, return_stats=True)
+    parallel, stats = compute_calibration(pattern, workers=2, return_stats=True)
+
+    assert [d.path for d in stats.detections] == sorted(d.path for d in stats.detections)
+    assert stats.found == 6
+    assert not stats.detections[-1].found
+    assert all(d.elapsed > 0 for d in stats.detections)
+    assert (parallel.width, parallel.height) == (1280, 960)
+    assert np.allclose(parallel.K, serial.K)
+
+
+def test_downscaled_detection_is_refined_at_full_resolution(tmp_path):
+    write_chessboard_images(tmp_path, count=1)
+    path = str(tmp_path / "board_00.png")
+
+    downscaled = detect_corners(path, detect_width=640)
+    full = detect_corners(path, detect_width=None)
+
+    assert downscaled.found and full.found
+    assert np.abs(downscaled.corners - full.corners).max() < 0.1
+
+
+def test_corner_cache_only_detects_new_images(tmp_path):
+    images = tmp_path / "images"
+    images.mkdir()
+    write_chessboard_images(images, count=4)
+    pattern = str(images / "board_*.png")
+    cache_path = str(tmp_path / "corners.npz")
+
+    first, first_stats = compute_calibration(
+        pattern, workers=1, return_stats=True, cache_path=cache_path
+    )
+    (images / "board_03.png").rename(images / "board_09.png")
+    second, second_stats = compute_calibration(
+        pattern, workers=1, return_stats=True, cache_path=cache_path
+    )
+
+    assert first_stats.cached == 0
+    assert second_stats.cached == 3
+    assert not second_stats.detections[-1].cached
+    assert np.allclose(first.K, second.K)
+
+
+def test_corner_cache_discarded_when_board_changes(tmp_path):
+    write_chessboard_images(tmp_path, count=1)
+    path = str(tmp_path / "board_00.png")
+    cache_path = str(tmp_path / "corners.npz")
+
+    cache = CornerCache(cache_path)
+    cache.put(detect_corners(path))
+    cache.save()
+
+    assert CornerCache(cache_path).get(path).found
+    assert CornerCache(cache_path, board_size=(7, 5)).get(path) is None
+
+
+def test_streaming_calibrator_keeps_distinct_views(tmp_path):
+    write_chessboard_images(tmp_path, count=8)
+    frames = [cv2.imread(str(path)) for path in sorted(tmp_path.glob("board_*.png"))]
+    calibrator = StreamingCalibrator(
+        min_views=3, update_every=2, max_views=20, min_pose_distance=0.05
+    )
+
+    calibration = calibrator.run(frame for frame in frames + frames)
+
+    assert calibrator.frames == 16
+    # Repeated frames are never kept twice
+    assert 3 <= calibrator.views <= 8
+    assert calibration is not None
+    assert (calibration.width, calibration.height) == (1280, 960)
+    assert calibrator.rms is not None
+    assert 0 < calibrator.coverage <= 1
+
+
+def test_streaming_calibrator_from_frame_source(tmp_path):
+    write_chessboard_images(tmp_path, count=1)
+    image = cv2.imread(str(tmp_path / "board_00.png"))
+
+    class StillReader(SyntheticReader):
+        def read(self):
+            frame = super().read()
+            return None if frame is None else image
+
+    with FrameSource(StillReader(count=5, fps=0)) as source:
+        calibrator = StreamingCalibrator(min_views=1)
+        calibrator.run(source.subscribe(maxsize=10), timeout=5.0)
+
+    # The same view repeated is kept only once
+    assert calibrator.views == 1
@@ -0,0 +1,316 @@
+import time
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from pycam.camera import Camera
+from pycam.errors import CommandError
+from pycam.api.api import CameraAPI
+from pycam.motion import HomingMode, MotionScheduler, MotorTimingProfile
+from pycam.schemas import DayNightMode, VideoResolution
+
+
+def make_config(**overrides):
+    values = dict(
+        host="192.168.1.42",
+        port=554,
+        flip_image=True,
+        daynight_mode=DayNightMode.DAY,
+        start_position={"pan": 10.0, "tilt": 25.0},
+        homing_mode=HomingMode.AUTO,
+        homing_timeout=5.0,
+        motion_min_interval=None,
+        motor_profile=None,
+        state_path=None,
+        presets={},
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def make_api(device_model="C200", moving_polls=None):
+    api = MagicMock(spec=CameraAPI)
+    api.get_info.return_value = {
+        "device_model": device_model,
+        "sw_version": "1.0",
+        "hw_version": "1.0",
+        "is_calibrated": True,
+    }
+    api.get_video_specs.return_value = {"resolution": VideoResolution.RES_1080P}
+    if moving_polls is None:
+        api.is_motor_moving.side_effect = NotImplementedError
+    else:
+        api.is_motor_moving.side_effect = moving_polls
+    return api
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    calls = []
+    monkeypatch.setattr("pycam.camera.time.sleep", calls.append)
+    return calls
+
+
+def test_init_applies_config_and_moves_to_start(sleeps):
+    api = make_api()
+    camera = Camera(api, make_config())
+
+    api.flip_image.assert_called_once_with(True)
+    api.set_daynight_mode.assert_called_once_with(DayNightMode.DAY)
+    api.move_motor.assert_any_call(-360.0, -90.0)
+    api.move_motor.assert_called_with(10.0, 25.0)
+    assert camera.pan == 10.0
+    assert camera.tilt == 25.0
+    assert (camera.calibration.width, camera.calibration.height) == (1920, 1080)
+
+
+def test_homing_polls_motor_status(sleeps, monkeypatch):
+    monkeypatch.setattr("pycam.motion.time.sleep", lambda _: None)
+    api = make_api(moving_polls=[True, True, False])
+    camera = Camera(api, make_config())
+
+    assert api.is_motor_moving.call_count == 3
+    assert sleeps == []
+    assert camera.homing_time < 5.0
+
+
+def test_homing_uses_model_profile(sleeps):
+    api = make_api(device_model="C200")
+    Camera(api, make_config(homing_mode=HomingMode.PROFILE))
+
+    assert len(sleeps) == 1
+    assert 0 < sleeps[0] < 5.0
+    api.is_motor_moving.assert_not_called()
+
+
+def test_homing_uses_configured_profile(sleeps):
+    api = make_api(device_model="UNKNOWN")
+    profile = MotorTimingProfile(pan_speed=360.0, tilt_speed=90.0, latency=0.5)
+    camera = Camera(api, make_config(homing_mode=HomingMode.PROFILE, motor_profile=profile))
+
+    assert sleeps == [pytest.approx(1.5, abs=0.1)]
+    assert camera.motion_model.profile == profile
+
+
+def test_homing_falls_back_to_fixed_sleep(sleeps):
+    api = make_api(device_model="UNKNOWN")
+    Camera(api, make_config())
+
+    assert sleeps == [pytest.approx(5.0, abs=0.1)]
+
+
+def test_homing_fixed_mode(sleeps):
+    api = make_api()
+    Camera(api, make_config(homing_mode=HomingMode.FIXED, homing_timeout=2.0))
+
+    assert sleeps == [pytest.approx(2.0, abs=0.1)]
+    api.get_info.assert_not_called()
+
+
+def test_motion_scheduler_coalesces_moves(sleeps):
+    api = make_api(moving_polls=[True, False])
+    camera = Camera(api, make_config(motion_min_interval=0.05))
+    api.move_motor.reset_mock()
+
+    for _ in range(10):
+        camera.move_motor(1.0, 0.5)
+    assert camera.wait_motion(timeout=2.0)
+    camera.close()
+
+    sent_pan = sum(call.args[0] for call in api.move_motor.call_args_list)
+    sent_tilt = sum(call.args[1] for call in api.move_motor.call_args_list)
+    assert (sent_pan, sent_tilt) == (10.0, 5.0)
+    assert api.move_motor.call_count < 10
+    assert (camera.pan, camera.tilt) == (20.0, 30.0)
+
+
+def test_scheduled_move_errors_are_counted(sleeps):
+    api = make_api(moving_polls=[True, False])
+    camera = Camera(api, make_config(motion_min_interval=0.05))
+    api.move_motor.side_effect = CommandError("move failed")
+
+    camera.move_motor(1.0, 0.5)
+    assert camera.wait_motion(timeout=2.0)
+
+    assert camera.motion_stats.errors == 1
+    camera.close()
+
+
+def test_motion_scheduler_rate_limits():
+    sent = []
+    scheduler = MotionScheduler(lambda pan, tilt: sent.append(pan), min_interval=0.05)
+
+    scheduler.submit(1.0, 0.0)
+    scheduler.flush(timeout=1.0)
+    scheduler.submit(2.0, 0.0)
+    scheduler.submit(3.0, 0.0)
+    scheduler.flush(timeout=1.0)
+    scheduler.close()
+
+    stats = scheduler.stats
+    assert sent == [1.0, 5.0]
+    assert stats.submitted == 3
+    assert stats.sent == 2
+    assert stats.merged == 1
+    assert stats.max_latency > 0
+
+
+def test_lazy_camera_defers_device_calls(sleeps):
+    api = make_api()
+    camera = Camera(api, make_config(), lazy=True)
+
+    api.flip_image.assert_not_called()
+    api.move_motor.assert_not_called()
+    api.get_video_specs.assert_not_called()
+    assert not camera.initialized
+
+    camera.get_info()
+    api.flip_image.assert_not_called()
+
+    camera.move_motor(5.0, 0.0)
+    assert camera.initialized
+    api.flip_image.assert_called_once_with(True)
+    api.move_motor.assert_called_with(5.0, 0.0)
+    assert (camera.pan, camera.tilt) == (15.0, 25.0)
+
+
+def test_lazy_camera_start_and_ready(sleeps):
+    api = make_api()
+    camera = Camera(api, make_config(), lazy=True)
+
+    assert camera.start() is camera
+    assert camera.ready(timeout=5.0)
+    api.set_daynight_mode.assert_called_once_with(DayNightMode.DAY)
+    api.move_motor.assert_called_with(10.0, 25.0)
+    camera.close()
+
+
+def test_lazy_camera_reports_and_retries_init_error(sleeps):
+    api = make_api()
+    api.flip_image.side_effect = [RuntimeError("offline"), None]
+    camera = Camera(api, make_config(), lazy=True)
+
+    with pytest.raises(RuntimeError):
+        camera.ready()
+    with pytest.raises(RuntimeError):
+        camera.move_motor(1.0, 1.0)
+
+    assert camera.start().ready()
+    assert camera.initialized
+
+
+def test_calibration_resolved_on_first_access(sleeps):
+    api = make_api()
+    camera = Camera(api, make_config())
+
+    api.get_video_specs.assert_not_called()
+    assert camera.calibration.width == 1920
+    assert camera.calibration is camera.calibration
+    api.get_video_specs.assert_called_once()
+
+
+def test_init_skips_settings_already_applied(sleeps):
+    api = make_api()
+    api.is_image_flipped.return_value = True
+    api.get_daynight_mode.return_value = DayNightMode.NIGHT
+    camera = Camera(api, make_config())
+
+    api.flip_image.assert_not_called()
+    api.set_daynight_mode.assert_called_once_with(DayNightMode.DAY)
+    assert not camera.init_result.flip_written
+    assert camera.init_result.daynight_written
+
+
+def test_init_writes_when_state_cannot_be_read(sleeps):
+    api = make_api()
+    api.is_image_flipped.side_effect = NotImplementedError
+    Camera(api, make_config())
+
+    api.flip_image.assert_called_once_with(True)
+
+
+def test_init_skips_homing_at_known_position(sleeps, tmp_path):
+    state_path = str(tmp_path / "positions.json")
+    api = make_api()
+    first = Camera(api, make_config(state_path=state_path))
+    assert first.init_result.homed
+    first.move_motor(5.0, 5.0)
+
+    api = make_api()
+    camera = Camera(api, make_config(state_path=state_path))
+
+    assert not camera.init_result.homed
+    assert camera.homing_time == 0.0
+    api.move_motor.assert_called_once_with(-5.0, -5.0)
+    assert (camera.pan, camera.tilt) == (10.0, 25.0)
+
+
+def test_init_homes_when_device_not_calibrated(sleeps, tmp_path):
+    state_path = str(tmp_path / "positions.json")
+    Camera(make_api(), make_config(state_path=state_path))
+
+    api = make_api()
+    api.get_info.return_value = {**api.get_info.return_value, "is_calibrated": False}
+    camera = Camera(api, make_config(state_path=state_path))
+
+    assert camera.init_result.homed
+    api.move_motor.assert_any_call(-360.0, -90.0)
+
+
+def test_reboot_forgets_position(sleeps, tmp_path):
+    state_path = str(tmp_path / "positions.json")
+    Camera(make_api(), make_config(state_path=state_path)).reboot()
+
+    camera = Camera(make_api(), make_config(state_path=state_path))
+    assert camera.init_result.homed
+
+
+PRESETS = {"door": {"pan": 100.0, "tilt": 40.0}, "desk": {"pan": 10.0, "tilt": 25.0}}
+
+
+def test_goto_preset_moves_by_delta_and_predicts_arrival(sleeps):
+    api = make_api()
+    camera = Camera(api, make_config(presets=PRESETS))
+
+    before = time.monotonic()
+    arrival = camera.goto_preset("door")
+
+    api.move_motor.assert_called_with(90.0, 15.0)
+    assert (camera.pan, camera.tilt) == (100.0, 40.0)
+    # C200 profile: latency plus 90 degrees of pan at 120 degrees/second, with margin
+    assert arrival - before == pytest.approx(0.3 * 1.25 + 90 / 120 * 1.25, abs=0.05)
+
+    api.move_motor.reset_mock()
+    assert camera.goto_preset("door") == arrival
+    api.move_motor.assert_not_called()
+
+    with pytest.raises(KeyError):
+        camera.goto_preset("garage")
+
+
+def test_goto_preset_learns_motion_time(sleeps):
+    api = make_api()
+    camera = Camera(
+        api, make_config(presets=PRESETS, homing_mode=HomingMode.FIXED, homing_timeout=0.0)
+    )
+    api.is_motor_moving.side_effect = [True, True, False]
+    predicted = camera.motion_model.predict(90.0, 15.0)
+
+    arrival = camera.goto_preset("door", wait=True)
+
+    assert arrival <= time.monotonic()
+    assert camera.motion_model.samples == 1
+    # Sleeps are skipped, the move measured shorter than predicted
+    assert camera.motion_model.predict(90.0, 15.0) < predicted
+
+
+def test_goto_preset_waits_prediction_without_motor_status(sleeps):
+    api = make_api()
+    camera = Camera(api, make_config(presets=PRESETS))
+
+    arrival = camera.goto_preset("door", wait=True)
+
+    assert arrival > time.monotonic()
+    assert sleeps[-1] == pytest.approx(arrival - time.monotonic(), abs=0.05)
+    assert camera.motion_model.samples == 0
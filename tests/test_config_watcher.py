@@ -0,0 +1,175 @@
+import os
+import threading
+import time
+
+import pytest
+import yaml
+
+from pycam.camera import Camera
+from pycam.config.config import CameraConfig
+from pycam.config.watcher import ConfigWatcher
+from pycam.schemas import DayNightMode
+
+from .test_cached_api import FakeClock
+from .test_camera import make_api
+
+SETTINGS = {
+    "host": "192.168.1.42",
+    "flip_image": True,
+    "daynight_mode": "day",
+    "start_position": {"pan": 10.0, "tilt": 25.0},
+    "homing": {"mode": "fixed", "timeout": 0.0},
+}
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("PASSWORD_CAMERA", "pass_cam")
+    monkeypatch.setenv("PASSWORD_CLOUD", "pass_cloud")
+    path = tmp_path / "config.yaml"
+    write(path, SETTINGS, mtime=1)
+    return path
+
+
+def write(path, data, mtime):
+    path.write_text(yaml.dump(data))
+    os.utime(path, ns=(mtime * 10**9, mtime * 10**9))
+
+
+def test_watcher_debounces_and_reports_changes(config_path):
+    config = CameraConfig(str(config_path))
+    clock = FakeClock()
+    diffs = []
+    watcher = ConfigWatcher(config, diffs.append, debounce=0.5, clock=clock)
+
+    assert watcher.check() is None
+
+    write(config_path, {**SETTINGS, "flip_image": False}, mtime=2)
+    assert watcher.check() is None
+    clock.now = 0.3
+    write(config_path, {**SETTINGS, "flip_image": False, "daynight_mode": "night"}, mtime=3)
+    assert watcher.check() is None
+    clock.now = 0.6
+    assert watcher.check() is None
+
+    clock.now = 1.0
+    changes = watcher.check()
+    assert set(changes) == {"flip_image", "daynight_mode"}
+    assert changes["daynight_mode"].new == DayNightMode.NIGHT
+    assert config.flip_image is False
+    assert diffs == [changes]
+    assert watcher.reloads == 1
+
+    clock.now = 5.0
+    assert watcher.check() is None
+
+
+def test_watcher_keeps_settings_on_parse_error(config_path):
+    config = CameraConfig(str(config_path))
+    clock = FakeClock()
+    errors = []
+    watcher = ConfigWatcher(
+        config, lambda _: None, debounce=0.0, clock=clock, on_error=errors.append
+    )
+
+    config_path.write_text("host: [unclosed")
+    os.utime(config_path, ns=(2 * 10**9, 2 * 10**9))
+    watcher.check()
+    assert watcher.check() is None
+
+    assert len(errors) == 1
+    assert config.host == "192.168.1.42"
+
+
+def test_camera_applies_changed_fields(config_path):
+    config = CameraConfig(str(config_path))
+    api = make_api()
+    camera = Camera(api, config)
+    api.reset_mock()
+
+    clock = FakeClock()
+    watcher = ConfigWatcher(config, camera.apply_config_changes, debounce=0.0, clock=clock)
+    write(
+        config_path,
+        {**SETTINGS, "daynight_mode": "night", "start_position": {"pan": 20.0, "tilt": 25.0}},
+        mtime=2,
+    )
+    watcher.check()
+    watcher.check()
+
+    api.set_daynight_mode.assert_called_once_with(DayNightMode.NIGHT)
+    api.flip_image.assert_not_called()
+    api.move_motor.assert_called_once_with(10.0, 0.0)
+    assert camera.pan == 20.0
+
+
+def test_camera_watch_config_thread(config_path):
+    config = CameraConfig(str(config_path))
+    api = make_api()
+    camera = Camera(api, config)
+    watcher = camera.watch_config(poll_interval=0.01, debounce=0.02)
+
+    write(config_path, {**SETTINGS, "flip_image": False}, mtime=2)
+    deadline = time.monotonic() + 5.0
+    while watcher.reloads == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    camera.close()
+
+    api.flip_image.assert_called_with(False)
+
+
+def test_watcher_retries_failed_change(config_path):
+    config = CameraConfig(str(config_path))
+    clock = FakeClock()
+    applied = []
+
+    def on_change(changes):
+        if not applied:
+            applied.append(None)
+            raise RuntimeError("device offline")
+        applied.append(changes)
+
+    watcher = ConfigWatcher(config, on_change, debounce=0.0, clock=clock)
+    write(config_path, {**SETTINGS, "flip_image": False}, mtime=2)
+    watcher.check()
+
+    with pytest.raises(RuntimeError):
+        watcher.check()
+    assert config.flip_image is True
+
+    changes = watcher.check()
+    assert set(changes) == {"flip_image"}
+    assert config.flip_image is False
+    assert watcher.reloads == 1
+
+
+def test_moves_during_scheduler_swap(config_path):
+    write(config_path, {**SETTINGS, "motion": {"min_interval": 0.01}}, mtime=1)
+    config = CameraConfig(str(config_path))
+    api = make_api()
+    camera = Camera(api, config)
+    api.reset_mock()
+    sending = threading.Event()
+
+    def slow_move(pan, tilt):
+        sending.set()
+        time.sleep(0.2)
+
+    api.move_motor.side_effect = slow_move
+    clock = FakeClock()
+    watcher = ConfigWatcher(config, camera.apply_config_changes, debounce=0.0, clock=clock)
+    write(config_path, {**SETTINGS, "motion": {"min_interval": 0.02}}, mtime=2)
+    watcher.check()
+
+    camera.move_motor(1.0, 0.0)
+    sending.wait(1.0)
+    # The previous scheduler is still sending while it is replaced
+    swap = threading.Thread(target=watcher.check)
+    swap.start()
+    time.sleep(0.05)
+    camera.move_motor(2.0, 0.0)
+    swap.join()
+    camera.close()
+
+    sent = sum(call.args[0] for call in api.move_motor.call_args_list)
+    assert sent == 3.0
@@ -0,0 +1,99 @@
+import threading
+
+import pytest
+
+from pycam.camera import Camera
+from pycam.fleet import CameraFleet
+from pycam.errors import AuthenticationError
+from pycam.motion import HomingMode
+from pycam.schemas import DayNightMode
+
+from .test_camera import make_api, make_config
+
+
+def make_fleet(hosts, failing=(), max_workers=4):
+    apis = {}
+
+    def factory(config):
+        if config.host in failing:
+            raise AuthenticationError(f"login failed for {config.host}")
+        apis[config.host] = make_api(moving_polls=[True, False])
+        return Camera(apis[config.host], config)
+
+    configs = [make_config(host=host, homing_mode=HomingMode.POLL) for host in hosts]
+    return CameraFleet(configs, max_workers=max_workers, camera_factory=factory), apis
+
+
+def test_fleet_start_isolates_failures():
+    fleet, apis = make_fleet(["a", "b", "c"], failing=["b"])
+    with fleet:
+        results = fleet.start()
+        assert set(fleet.cameras) == {"a", "c"}
+
+    assert results["a"].ok and results["c"].ok
+    assert not results["b"].ok
+    assert isinstance(results["b"].error, AuthenticationError)
+
+
+def test_fleet_bulk_operations():
+    fleet, apis = make_fleet(["a", "b"])
+    with fleet:
+        fleet.start()
+        apis["b"].reboot.side_effect = RuntimeError("offline")
+
+        infos = fleet.get_info_all()
+        reboots = fleet.reboot_all()
+        fleet.set_daynight_mode_all(DayNightMode.NIGHT)
+
+    assert infos["a"].value["device_model"] == "C200"
+    assert reboots["a"].ok
+    assert not reboots["b"].ok
+    apis["a"].set_daynight_mode.assert_called_with(DayNightMode.NIGHT)
+
+
+def test_fleet_respects_parallelism_limit():
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def factory(config):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        threading.Event().wait(0.01)
+        with lock:
+            active -= 1
+        return config
+
+    configs = [make_config(host=str(i)) for i in range(12)]
+    with CameraFleet(configs, max_workers=3, camera_factory=factory) as fleet:
+        results = fleet.start()
+
+    assert len(results) == 12
+    assert peak <= 3
+
+
+def test_fleet_rejects_duplicate_hosts():
+    configs = [make_config(host=host) for host in ("a", "b", "a")]
+    with pytest.raises(ValueError, match="a"):
+        CameraFleet(configs)
+
+
+def test_fleet_close_closes_cameras():
+    closed = []
+
+    class ClosingCamera(Camera):
+        def close(self):
+            closed.append(self.get_config().host)
+            super().close()
+
+    def factory(config):
+        return ClosingCamera(make_api(moving_polls=[True, False]), config)
+
+    configs = [make_config(host=host, homing_mode=HomingMode.POLL) for host in ("a", "b")]
+    with CameraFleet(configs, camera_factory=factory) as fleet:
+        fleet.start()
+
+    assert sorted(closed) == ["a", "b"]
+    assert fleet.cameras == {}
@@ -0,0 +1,98 @@
+import multiprocessing
+import time
+import uuid
+
+import numpy as np
+import pytest
+
+from pycam.camera import Camera
+from pycam.framebus import FramePublisher, FrameSubscriber
+from pycam.schemas import VideoResolution
+from pycam.stream import FrameSource, SyntheticReader
+
+from .test_camera import make_api, make_config
+
+
+@pytest.fixture
+def bus_name():
+    return f"pycam-test-{uuid.uuid4().hex[:8]}"
+
+
+def test_publish_and_read_without_copy(bus_name):
+    with FramePublisher(bus_name, (4, 6, 3), slots=3) as publisher:
+        with FrameSubscriber(bus_name) as subscriber:
+            assert subscriber.read() is None
+
+            seq = publisher.publish(np.full((4, 6, 3), 7, dtype=np.uint8))
+            read_seq, frame = subscriber.read()
+
+            assert subscriber.shape == (4, 6, 3)
+            assert read_seq == seq == 1
+            assert frame[0, 0, 0] == 7
+            assert not frame.flags.owndata
+            del frame
+
+
+def test_overwritten_slot_is_invalid(bus_name):
+    with FramePublisher(bus_name, (2, 2, 3), slots=2) as publisher:
+        with FrameSubscriber(bus_name) as subscriber:
+            for value in range(3):
+                publisher.publish(np.full((2, 2, 3), value, dtype=np.uint8))
+
+            assert subscriber.read(seq=1) is None
+            assert subscriber.is_valid(3)
+            seq, frame = subscriber.read(seq=2, copy=True)
+            assert frame[0, 0, 0] == 1
+
+
+def _read_in_child(name, queue):
+    with FrameSubscriber(name) as subscriber:
+        result = subscriber.wait(timeout=5.0)
+        queue.put((result[0], int(result[1].sum())))
+
+
+def test_subscriber_in_other_process(bus_name):
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    with FramePublisher(bus_name, (8, 8, 3)) as publisher:
+        child = context.Process(target=_read_in_child, args=(bus_name, queue))
+        child.start()
+        publisher.publish(np.ones((8, 8, 3), dtype=np.uint8))
+        seq, total = queue.get(timeout=10.0)
+        child.join()
+
+    assert seq == 1
+    assert total == 8 * 8 * 3
+
+
+def test_publisher_from_camera(bus_name, monkeypatch):
+    monkeypatch.setattr("pycam.camera.time.sleep", lambda _: None)
+    api = make_api()
+    # The decoded stream does not have the main stream resolution
+    api.get_video_specs.return_value = {"resolution": VideoResolution.RES_1080P}
+    camera = Camera(api, make_config())
+    camera.attach_frame_source(FrameSource(SyntheticReader(640, 360, fps=100)))
+
+    with FramePublisher.from_camera(camera, bus_name) as publisher:
+        with FrameSubscriber(bus_name) as subscriber:
+            seq, frame = subscriber.wait(timeout=2.0)
+            assert frame.shape == (360, 640, 3)
+            del frame
+        assert publisher.errors == 0
+    camera.close()
+
+
+def test_pump_survives_frames_of_another_shape(bus_name):
+    errors = []
+    source = FrameSource(SyntheticReader(8, 4, fps=200)).start()
+    with FramePublisher(bus_name, (2, 2, 3)) as publisher:
+        publisher.attach(source, on_error=errors.append)
+        deadline = time.monotonic() + 2.0
+        while publisher.errors < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert publisher.errors >= 2
+        assert isinstance(publisher.last_error, ValueError)
+        assert errors
+        publisher.publish(np.zeros((2, 2, 3), dtype=np.uint8))
+    source.stop()
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+import pytest
+
+import pycam
+
+HEAVY_MODULES = ("cv2", "numpy", "pytapo")
+
+
+def loaded_after(statement: str):
+    script = (
+        f"import sys\n{statement}\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules\n"
+        "    and type(sys.modules[m]).__name__ != 'LazyModule'))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout.strip()
+    return set(out.split(",")) - {""}
+
+
+def test_import_pycam_does_not_load_heavy_modules():
+    assert loaded_after("import pycam") == set()
+
+
+def test_config_does_not_load_heavy_modules():
+    assert loaded_after("from pycam import CameraConfig") == set()
+
+
+def test_camera_does_not_load_opencv_or_pytapo():
+    assert loaded_after("from pycam import Camera").isdisjoint({"cv2", "pytapo"})
+
+
+def test_lazy_exports_resolve():
+    for name in pycam.__all__:
+        assert getattr(pycam, name) is not None
+    assert "Camera" in dir(pycam)
+
+
+def test_unknown_attribute_raises():
+    with pytest.raises(AttributeError):
+        pycam.DoesNotExist
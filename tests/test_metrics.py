@@ -0,0 +1,71 @@
+import pytest
+from unittest.mock import patch
+
+from pycam import metrics
+from pycam.api.tapo import PytapoClient
+from pycam.errors import CommandError
+from pycam.metrics import MetricsRegistry
+
+from .test_session import make_config
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics, "registry", registry)
+    return registry
+
+
+def test_api_calls_are_recorded_per_method_and_host(registry):
+    with patch("pycam.api.tapo.Tapo") as MockTapo:
+        MockTapo.return_value.getDayNightMode.return_value = "on"
+        MockTapo.return_value.reboot.side_effect = Exception("offline")
+        client = PytapoClient(make_config(host="10.0.0.7"))
+        client.get_daynight_mode()
+        client.get_daynight_mode()
+        with pytest.raises(CommandError):
+            client.reboot()
+
+    snapshot = registry.snapshot()
+    daynight = snapshot[("get_daynight_mode", "10.0.0.7")]
+    assert daynight.count == 2
+    assert daynight.errors == 0
+    assert sum(daynight.buckets) == 2
+    assert snapshot[("reboot", "10.0.0.7")].errors == 1
+    assert ("connect", "10.0.0.7") in snapshot
+
+
+def test_span_listener(registry):
+    spans = []
+    registry.add_listener(spans.append)
+
+    registry.record("move_motor", "cam", 100.0, 0.02)
+    registry.record("move_motor", "cam", 101.0, 0.5, CommandError("timeout"))
+    registry.remove_listener(spans.append)
+    registry.record("move_motor", "cam", 102.0, 0.5)
+
+    assert [span.name for span in spans] == ["pycam.move_motor"] * 2
+    assert spans[0].error is None
+    assert "timeout" in spans[1].error
+    assert spans[1].attributes == {"method": "move_motor", "host": "cam"}
+
+
+def test_prometheus_export(registry):
+    registry.record("get_info", "cam", 0.0, 0.003)
+    registry.record("get_info", "cam", 0.0, 0.3, CommandError("boom"))
+
+    text = registry.to_prometheus()
+
+    assert '# TYPE pycam_call_duration_seconds histogram' in text
+    assert 'pycam_call_duration_seconds_bucket{method="get_info",host="cam",le="0.005"} 1' in text
+    assert 'pycam_call_duration_seconds_bucket{method="get_info",host="cam",le="+Inf"} 2' in text
+    assert 'pycam_call_duration_seconds_count{method="get_info",host="cam"} 2' in text
+    assert 'pycam_call_errors_total{method="get_info",host="cam"} 1' in text
+
+
+def test_disabled_registry_records_nothing(registry):
+    registry.enabled = False
+    with patch("pycam.api.tapo.Tapo"):
+        PytapoClient(make_config()).get_info()
+
+    assert registry.snapshot() == {}
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from pycam.motion import (
+    MotionTimeModel,
+    MotorTimingProfile,
+    clamp_move,
+    plan_preset_move,
+    settle_preset_move,
+    start_move,
+    trusted_position,
+)
+
+PRIOR = MotorTimingProfile(pan_speed=120.0, tilt_speed=60.0, latency=0.3)
+
+
+def test_model_starts_from_profile():
+    model = MotionTimeModel(PRIOR)
+
+    assert model.predict(60.0, 10.0) == pytest.approx(PRIOR.duration(60.0, 10.0))
+    assert model.predict(-10.0, -30.0) == pytest.approx(PRIOR.duration(10.0, 30.0))
+    assert model.profile == PRIOR
+
+
+def test_model_learns_from_timed_moves():
+    actual = MotorTimingProfile(pan_speed=80.0, tilt_speed=40.0, latency=0.6)
+    model = MotionTimeModel(PRIOR)
+    rng = random.Random(1)
+
+    for _ in range(40):
+        pan, tilt = rng.uniform(-90, 90), rng.uniform(-30, 30)
+        model.observe(pan, tilt, actual.duration(pan, tilt) + rng.gauss(0, 0.05))
+
+    assert model.samples == 40
+    for pan, tilt in [(90.0, 0.0), (10.0, 30.0), (45.0, 10.0)]:
+        assert model.predict(pan, tilt) == pytest.approx(actual.duration(pan, tilt), abs=0.1)
+
+
+def test_model_stays_physical():
+    model = MotionTimeModel(PRIOR)
+    for _ in range(10):
+        model.observe(5.0, 0.0, 0.0)
+
+    profile = model.profile
+    assert profile.latency >= 0.0
+    assert profile.pan_speed > 0.0
+
+
+def test_clamp_move_keeps_motor_range():
+    assert clamp_move((350.0, 10.0), 20.0, -20.0) == (10.0, -10.0)
+
+
+def test_trusted_position_needs_calibrated_motor():
+    assert trusted_position((10.0, 20.0), {"is_calibrated": True}) == (10.0, 20.0)
+    assert trusted_position((10.0, 20.0), {"is_calibrated": False}) is None
+    assert trusted_position((10.0, 20.0), None) is None
+    assert trusted_position(None, {"is_calibrated": True}) is None
+
+
+def test_start_move_only_when_needed():
+    start = {"pan": 10.0, "tilt": 25.0}
+    assert start_move((10.0, 25.0), start, homed=False) is None
+    assert start_move((10.0, 25.0), start, homed=True) == (0.0, 0.0)
+    assert start_move((0.0, 0.0), start, homed=False) == (10.0, 25.0)
+
+
+def test_preset_move_queued_behind_previous_one():
+    model = MotionTimeModel(PRIOR)
+    move = plan_preset_move((0.0, 0.0), {"pan": 120.0, "tilt": 0.0}, 10.0, 0.0, model)
+    assert (move.pan, move.tilt, move.queued) == (120.0, 0.0, False)
+    assert move.arrival == pytest.approx(10.0 + 1.3)
+
+    queued = plan_preset_move((120.0, 0.0), {"pan": 0.0, "tilt": 0.0}, 11.0, move.arrival, model)
+    assert queued.queued
+    assert queued.arrival == pytest.approx(move.arrival + 1.3)
+
+    # A queued move cannot be measured, the model does not learn from it
+    assert settle_preset_move(queued, 14.0, model) == 14.0
+    assert model.samples == 0
+    assert settle_preset_move(move, None, model) == move.arrival
+    settle_preset_move(move, 12.0, model)
+    assert model.samples == 1
@@ -0,0 +1,206 @@
+import numpy as np
+import pytest
+
+from pycam.camera import Camera
+from pycam.pipeline import (
+    BufferPool,
+    DecodeMode,
+    FFmpegReader,
+    FramePipeline,
+    find_ffmpeg,
+    open_pipeline,
+    output_size,
+    probe_size,
+)
+from pycam.schemas import VideoQuality
+from pycam.stream import FrameSource, SyntheticReader
+
+from .test_camera import make_api, make_config
+
+
+class CountingReader(SyntheticReader):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.decoded = 0
+        self.skipped = 0
+
+    def read(self):
+        self.decoded += 1
+        return super().read()
+
+    def skip(self):
+        ok = super().read() is not None
+        self.skipped += ok
+        return ok
+
+
+def test_output_size_keeps_aspect_ratio():
+    assert output_size((2304, 1296)) == (2304, 1296)
+    assert output_size((2304, 1296), width=640) == (640, 360)
+    assert output_size((2304, 1296), roi=(100, 100, 800, 400), width=400) == (400, 200)
+    assert output_size((640, 360), width=1280) == (640, 360)
+
+
+def address(image):
+    return image.__array_interface__["data"][0]
+
+
+def test_pool_reuses_only_released_buffers():
+    pool = BufferPool((4, 4), size=2)
+    first = pool.acquire()
+    second = pool.acquire()
+    held = [first, second[1:]]
+
+    extra = pool.acquire()
+    assert pool.misses == 1
+    assert not any(np.shares_memory(extra, buffer) for buffer in (first, second))
+
+    del first, held
+    assert pool.free == 1
+    # second is still referenced
+    assert not np.shares_memory(pool.acquire(), second)
+
+
+def test_pool_explicit_release():
+    pool = BufferPool((4, 4), size=1)
+    buffer = pool.acquire()
+    address_before = address(buffer)
+
+    pool.release(buffer)
+
+    assert pool.free == 1
+    assert address(pool.acquire()) == address_before
+    assert pool.misses == 0
+
+
+def test_every_nth_frame_skips_decoding():
+    reader = CountingReader(width=64, height=32, fps=0, count=10)
+    pipeline = FramePipeline(reader, every=5)
+    pipeline.open()
+    frames = [pipeline.read() for _ in range(3)]
+
+    assert frames[0] is not None and frames[1] is not None
+    assert frames[2] is None
+    assert reader.decoded == 2
+    assert reader.skipped == 8
+
+
+def test_roi_downscale_and_grayscale():
+    reader = SyntheticReader(width=640, height=360, fps=0, count=4)
+    pipeline = FramePipeline(reader, roi=(320, 0, 320, 360), width=160, grayscale=True)
+    pipeline.open()
+    image = pipeline.read()
+
+    assert image.shape == (180, 160)
+    assert image.dtype == np.uint8
+    # Right half of the gradient
+    assert image[:, 0].mean() > 100
+
+
+def test_pipeline_buffers_are_recycled():
+    reader = SyntheticReader(width=320, height=180, fps=0, count=20)
+    pipeline = FramePipeline(reader, width=160, pool_size=4)
+    pipeline.open()
+    seen = {address(pipeline.read()) for _ in range(20)}
+
+    assert len(seen) <= 4
+    assert pipeline.pool.misses == 0
+
+
+def test_pipeline_frames_survive_in_frame_source():
+    source = FrameSource(FramePipeline(SyntheticReader(64, 32, fps=0, count=30), width=32))
+    with source.subscribe(maxsize=30) as subscription:
+        source.start()
+        frames = list(subscription)
+    source.stop()
+
+    assert len(frames) == 30
+    # Queued frames were never overwritten by later ones
+    assert len({address(frame.image) for frame in frames}) == 30
+
+
+def test_keyframes_mode_requires_input_size():
+    with pytest.raises(ValueError):
+        open_pipeline("rtsp://camera/stream1", DecodeMode.KEYFRAMES)
+
+
+def test_ffmpeg_command():
+    reader = FFmpegReader(
+        "rtsp://camera/stream1",
+        (2304, 1296),
+        keyframes_only=True,
+        roi=(0, 0, 1152, 648),
+        width=576,
+        grayscale=True,
+        ffmpeg="ffmpeg",
+    )
+    command = reader.command()
+
+    assert reader.size == (576, 324)
+    assert command.index("-skip_frame") < command.index("-i")
+    assert "crop=1152:648:0:0,scale=576:324:flags=area" in command
+    assert command[command.index("-pix_fmt") + 1] == "gray"
+
+
+@pytest.mark.skipif(find_ffmpeg() is None, reason="ffmpeg not installed")
+def test_ffmpeg_reader_decodes_file(tmp_path):
+    import cv2
+
+    path = str(tmp_path / "clip.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (64, 32))
+    reader = SyntheticReader(64, 32, fps=0, count=10)
+    reader.open()
+    for _ in range(10):
+        writer.write(reader.read())
+    writer.release()
+
+    ffmpeg = FFmpegReader(path, (64, 32), width=32)
+    ffmpeg.open()
+    frames = [ffmpeg.read() for _ in range(11)]
+    ffmpeg.release()
+
+    assert frames[0].shape == (16, 32, 3)
+    assert frames[-1] is None
+
+
+def test_probe_size_of_file(tmp_path):
+    import cv2
+
+    path = str(tmp_path / "clip.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (64, 32))
+    reader = SyntheticReader(64, 32, fps=0, count=2)
+    reader.open()
+    for _ in range(2):
+        writer.write(reader.read())
+    writer.release()
+
+    assert probe_size(path) == (64, 32)
+    with pytest.raises(OSError):
+        probe_size(str(tmp_path / "missing.avi"))
+
+
+def test_keyframes_pipeline_of_low_stream(monkeypatch):
+    monkeypatch.setattr("pycam.camera.time.sleep", lambda _: None)
+    probed = []
+    opened = []
+
+    def fake_probe(url):
+        probed.append(url)
+        return (640, 360)
+
+    def fake_open(url, mode, every, roi, width, grayscale, input_size):
+        opened.append(input_size)
+        return SyntheticReader(64, 32, fps=0, count=1)
+
+    monkeypatch.setattr("pycam.camera.probe_size", fake_probe)
+    monkeypatch.setattr("pycam.camera.open_pipeline", fake_open)
+    api = make_api()
+    api.get_url.return_value = "rtsp://camera/stream2"
+    camera = Camera(api, make_config(video_quality=VideoQuality.LOW))
+
+    for _ in range(2):
+        camera.open_pipeline(DecodeMode.KEYFRAMES).stop()
+    camera.close()
+
+    assert opened == [(640, 360), (640, 360)]
+    assert len(probed) == 1
@@ -0,0 +1,69 @@
+import json
+import time
+
+from pycam.position import PositionStore
+
+
+def test_position_store_round_trip(tmp_path):
+    path = tmp_path / "state" / "positions.json"
+    store = PositionStore(str(path))
+    assert store.load("cam") is None
+
+    store.save("cam", 10.0, 25.0)
+    store.save("other", 1.0, 2.0)
+    assert store.load("cam") == (10.0, 25.0)
+    store.flush()
+
+    reloaded = PositionStore(str(path))
+    assert reloaded.load("cam") == (10.0, 25.0)
+    assert reloaded.load("other") == (1.0, 2.0)
+
+    reloaded.discard("cam")
+    assert PositionStore(str(path)).load("cam") is None
+
+
+def test_position_store_ignores_corrupt_file(tmp_path):
+    path = tmp_path / "positions.json"
+    path.write_text("{not json")
+    store = PositionStore(str(path))
+
+    assert store.load("cam") is None
+    store.save("cam", 3.0, 4.0)
+    store.flush()
+    assert json.loads(path.read_text())["cam"]["pan"] == 3.0
+
+
+def test_stores_sharing_a_file_keep_each_other_entries(tmp_path):
+    path = str(tmp_path / "positions.json")
+    first, second = PositionStore(path), PositionStore(path)
+
+    first.save("a", 1.0, 2.0)
+    first.flush()
+    second.save("b", 3.0, 4.0)
+    second.flush()
+    first.save("a", 5.0, 6.0)
+    first.flush()
+
+    reloaded = PositionStore(path)
+    assert reloaded.load("a") == (5.0, 6.0)
+    assert reloaded.load("b") == (3.0, 4.0)
+
+
+def test_shared_store_per_path(tmp_path):
+    path = str(tmp_path / "positions.json")
+    assert PositionStore.shared(path) is PositionStore.shared(path)
+    assert PositionStore.shared(path) is not PositionStore.shared(path + ".other")
+
+
+def test_saves_are_debounced(tmp_path):
+    path = tmp_path / "positions.json"
+    store = PositionStore(str(path), save_delay=0.05)
+
+    for pan in range(10):
+        store.save("cam", float(pan), 0.0)
+    assert not path.exists()
+
+    deadline = time.monotonic() + 5
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert json.loads(path.read_text())["cam"]["pan"] == 9.0
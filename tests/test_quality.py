@@ -0,0 +1,211 @@
+from unittest.mock import MagicMock
+import time
+
+from pycam.api.simulated import SimulatedCameraAPI
+from pycam.camera import Camera
+from pycam.motion import HomingMode
+from pycam.quality import (
+    QualityController,
+    QualityLevel,
+    QualityPolicy,
+    StreamSample,
+    build_quality_ladder,
+)
+from pycam.schemas import VideoBitrate, VideoQuality, VideoResolution
+from pycam.stream import FrameSource, SyntheticReader
+
+from .test_cached_api import FakeClock
+from .test_camera import make_config
+
+OVERLOADED = StreamSample(fps=5.0, lag=1.0, dropped=3)
+HEALTHY = StreamSample(fps=25.0, lag=0.05, dropped=0)
+
+
+def make_camera():
+    api = SimulatedCameraAPI()
+    config = make_config(
+        homing_mode=HomingMode.FIXED, homing_timeout=0.0, video_quality=VideoQuality.HIGH
+    )
+    return api, Camera(api, config)
+
+
+def make_controller(camera, clock, **policy):
+    defaults = dict(downgrade_after=2, upgrade_after=3, min_dwell=5.0, upgrade_backoff=30.0)
+    defaults.update(policy)
+    return QualityController(camera, policy=QualityPolicy(**defaults), clock=clock)
+
+
+def test_ladder_follows_capabilities():
+    ladder = build_quality_ladder(
+        {
+            "resolutions": [VideoResolution.RES_720P, VideoResolution.RES_SUPER_HD],
+            "bitrates": [VideoBitrate.BR_512, VideoBitrate.BR_2048],
+            "frame_rates": [15, 25],
+            "encode_types": [],
+            "bitrate_types": [],
+            "qualitys": [],
+        }
+    )
+
+    assert ladder == [
+        QualityLevel(VideoQuality.HIGH, VideoResolution.RES_SUPER_HD, VideoBitrate.BR_2048, 25),
+        QualityLevel(VideoQuality.HIGH, VideoResolution.RES_720P, VideoBitrate.BR_512, 25),
+        QualityLevel(VideoQuality.HIGH, VideoResolution.RES_720P, VideoBitrate.BR_512, 15),
+        QualityLevel(VideoQuality.LOW),
+    ]
+
+
+def test_downgrades_after_sustained_overload_and_sets_specs():
+    api, camera = make_camera()
+    clock = FakeClock()
+    controller = make_controller(camera, clock)
+
+    assert controller.update(OVERLOADED) is None
+    level = controller.update(OVERLOADED)
+
+    assert level == controller.ladder[1]
+    assert api.get_video_specs()["resolution"] == level.resolution
+    assert api.get_video_specs()["bitrate"] == level.bitrate
+    assert controller.stats.downgrades == 1
+
+
+def test_dwell_time_prevents_flapping():
+    _, camera = make_camera()
+    clock = FakeClock()
+    controller = make_controller(camera, clock)
+    controller.update(OVERLOADED)
+    controller.update(OVERLOADED)
+
+    for _ in range(10):
+        clock.now += 0.1
+        assert controller.update(HEALTHY) is None
+
+    clock.now = 10.0
+    assert controller.update(HEALTHY) == controller.ladder[0]
+
+
+def test_failed_upgrade_backs_off():
+    _, camera = make_camera()
+    clock = FakeClock()
+    controller = make_controller(camera, clock)
+    controller.update(OVERLOADED)
+    controller.update(OVERLOADED)
+
+    clock.now = 10.0
+    for _ in range(3):
+        controller.update(HEALTHY)
+    assert controller.level == controller.ladder[0]
+
+    clock.now = 16.0
+    controller.update(OVERLOADED)
+    controller.update(OVERLOADED)
+    assert controller.level == controller.ladder[1]
+
+    clock.now = 22.0
+    for _ in range(5):
+        assert controller.update(HEALTHY) is None
+    assert controller.update(HEALTHY) == controller.ladder[0]
+
+
+def test_low_stream_switches_frame_source():
+    _, camera = make_camera()
+    source = FrameSource(SyntheticReader(fps=0))
+    camera.attach_frame_source(source)
+    clock = FakeClock()
+    controller = make_controller(camera, clock)
+
+    for _ in range(len(controller.ladder) - 1):
+        clock.now += 10.0
+        controller.update(OVERLOADED)
+        controller.update(OVERLOADED)
+
+    assert controller.level.stream == VideoQuality.LOW
+    assert camera.stream_quality == VideoQuality.LOW
+    assert camera.get_url().endswith("stream2")
+    camera.close()
+
+
+def test_measure_reports_drops_and_lag():
+    _, camera = make_camera()
+    source = FrameSource(SyntheticReader(fps=200.0))
+    camera.attach_frame_source(source)
+    subscription = camera.frame_source().subscribe(maxsize=1)
+    controller = QualityController(camera, subscription)
+
+    frame = source.wait_frame(timeout=5.0)
+    assert source.wait_frame(frame.seq + 5, timeout=5.0) is not None
+    controller.observe(frame)
+    sample = controller.measure()
+    camera.close()
+
+    assert sample.fps > 0
+    assert sample.dropped > 0
+    assert sample.lag > 0
+
+
+def test_tapo_frame_rates_are_decoded():
+    ladder = build_quality_ladder(
+        {
+            "resolutions": [VideoResolution.RES_1080P],
+            "bitrates": [VideoBitrate.BR_1024],
+            "frame_rates": [65551, 65561],
+            "encode_types": [],
+            "bitrate_types": [],
+            "qualitys": [],
+        }
+    )
+
+    assert [level.frame_rate for level in ladder] == [65561, 65551, None]
+
+
+def test_falls_back_to_stream_switching_without_set_video_specs():
+    api, camera = make_camera()
+    api.set_video_specs = MagicMock(side_effect=NotImplementedError)
+    clock = FakeClock()
+    controller = make_controller(camera, clock)
+
+    controller.update(OVERLOADED)
+    assert controller.update(OVERLOADED) == QualityLevel(VideoQuality.LOW)
+    assert camera.stream_quality == VideoQuality.LOW
+    assert len(controller.ladder) == 2
+
+    clock.now += 10.0
+    for _ in range(3):
+        controller.update(HEALTHY)
+    assert camera.stream_quality == VideoQuality.HIGH
+    camera.close()
+
+
+def test_background_errors_are_counted():
+    _, camera = make_camera()
+    controller = QualityController(camera)
+    errors = iter([RuntimeError("boom")])
+
+    def step():
+        error = next(errors, None)
+        if error is not None:
+            raise error
+
+    controller.step = MagicMock(side_effect=step)
+
+    controller.start(interval=0.01)
+    deadline = time.monotonic() + 2.0
+    while controller.step.call_count < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    controller.stop()
+
+    assert controller.stats.errors == 1
+    assert isinstance(controller.stats.last_error, RuntimeError)
+    camera.close()
+
+
+def test_set_video_specs_refreshes_resolution():
+    api, camera = make_camera()
+    width, _ = camera.resolution
+    assert camera.calibration.width == width
+
+    camera.set_video_specs({"resolution": VideoResolution.RES_720P})
+
+    assert camera.resolution == (1280, 720)
+    assert camera.calibration.width == 1280
+    camera.close()
@@ -0,0 +1,276 @@
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from pycam.recorder import (
+    MotionDetector,
+    MotionRecorder,
+    Packet,
+    PacketReader,
+    PreRollBuffer,
+    SegmentWriter,
+    StreamFormat,
+    open_video_file,
+)
+from pycam.stream import Frame
+
+FORMAT = StreamFormat(0, 10.0, (64, 48))
+
+
+def packet(timestamp, keyframe=False, size=10):
+    return Packet(np.zeros(size, np.uint8), keyframe, timestamp)
+
+
+class FakeSink:
+    def __init__(self, path, fmt):
+        self.path = path
+        self.packets = []
+        self.released = False
+
+    def write(self, data):
+        self.packets.append(data)
+
+    def release(self):
+        self.released = True
+
+
+class FakeSinks(list):
+    def __call__(self, path, fmt):
+        sink = FakeSink(path, fmt)
+        self.append(sink)
+        return sink
+
+
+class ListReader:
+    """Packet reader replaying packets, one GOP of `gop` packets per keyframe."""
+
+    live = False
+
+    def __init__(self, count, gop=5, period=0.1):
+        self.format = FORMAT
+        self._packets = [
+            packet(i * period, keyframe=i % gop == 0) for i in range(count)
+        ]
+        self._index = 0
+
+    def open(self):
+        self._index = 0
+
+    def read(self):
+        if self._index >= len(self._packets):
+            return None
+        self._index += 1
+        return self._packets[self._index - 1]
+
+    def release(self):
+        pass
+
+
+def test_pre_roll_starts_at_keyframe_covering_window():
+    buffer = PreRollBuffer(seconds=1.0)
+    buffer.append(packet(0.0))  # no keyframe yet, undecodable
+    for i in range(1, 31):
+        buffer.append(packet(i * 0.1, keyframe=i % 10 == 0))
+
+    packets = buffer.drain()
+    assert packets[0].keyframe
+    # The 2.0 keyframe is the latest one at least a second old at 3.0
+    assert packets[0].timestamp == pytest.approx(2.0)
+    assert len(packets) == 11
+    assert len(buffer) == 0
+
+
+def test_pre_roll_keeps_single_gop():
+    buffer = PreRollBuffer(seconds=0.5)
+    for i in range(20):
+        buffer.append(packet(i * 0.1, keyframe=i == 0))
+    assert len(buffer) == 20
+    assert buffer.nbytes == 200
+
+
+def test_detector_reports_changed_area():
+    detector = MotionDetector(pixel_threshold=20, min_area=0.05)
+    still = np.full((40, 40), 100, np.uint8)
+    assert not detector.update(still)
+    assert not detector.update(still.copy())
+
+    moved = still.copy()
+    moved[:10, :10] = 200  # 6% of the frame
+    assert detector.update(moved)
+    assert detector.score == pytest.approx(100 / 1600)
+
+    noisy = moved + 10  # below the pixel threshold
+    assert not detector.update(noisy)
+
+
+def test_writer_splits_segments_at_keyframes(tmp_path):
+    sinks = FakeSinks()
+    writer = SegmentWriter(str(tmp_path), segment_seconds=1.0, open_file=sinks)
+    writer.start_event(FORMAT)
+    writer.write(packet(0.0))  # dropped until a keyframe
+    for i in range(1, 26):
+        writer.write(packet(i * 0.1, keyframe=i % 7 == 1))
+    writer.end_event()
+    writer.close()
+
+    # Keyframes at 0.1, 0.8, 1.5, 2.2: split at the first one a second in
+    assert [len(sink.packets) for sink in sinks] == [14, 11]
+    assert all(sink.released for sink in sinks)
+    assert [path.name for path in writer.files] == [
+        sink.path.rsplit("/", 1)[-1] for sink in sinks
+    ]
+    assert writer.files[0].name.endswith("_000.mkv")
+    stats = writer.stats
+    assert (stats.events, stats.segments, stats.packets) == (1, 2, 25)
+
+
+def test_writer_survives_file_errors(tmp_path):
+    class FailingSinks(FakeSinks):
+        def __call__(self, path, fmt):
+            if not self:
+                self.append(None)
+                raise OSError("disk full")
+            return super().__call__(path, fmt)
+
+    sinks = FailingSinks()
+    writer = SegmentWriter(str(tmp_path), open_file=sinks)
+    writer.start_event(FORMAT)
+    for i in range(10):
+        writer.write(packet(i * 0.1, keyframe=i % 5 == 0))
+    writer.end_event()
+    writer.flush()
+
+    stats = writer.stats
+    assert stats.errors == 1 and isinstance(stats.last_error, OSError)
+    # The failed file is not reported, writing resumed at the next keyframe
+    assert stats.segments == 1 and len(writer.files) == 1
+    assert len(sinks[1].packets) == 5
+    writer.close()
+
+
+def test_open_video_file_reports_bad_path(tmp_path):
+    with pytest.raises(OSError):
+        open_video_file(str(tmp_path / "missing" / "out.mkv"), FORMAT)
+
+
+def test_recorder_writes_pre_roll_and_post_roll(tmp_path):
+    class TriggeringReader(ListReader):
+        def read(self):
+            packet = super().read()
+            if packet is not None and self._index == 42:
+                recorder.trigger(packet.timestamp)
+            return packet
+
+    sinks = FakeSinks()
+    writer = SegmentWriter(str(tmp_path), open_file=sinks)
+    recorder = MotionRecorder(
+        TriggeringReader(100),
+        str(tmp_path),
+        pre_roll=1.0,
+        post_roll=0.95,
+        writer=writer,
+    )
+    recorder.start()
+    recorder.wait()
+    recorder.stop()
+
+    # Triggered at 4.1: from the keyframe at 3.0, the last one a second
+    # before, through 5.0
+    assert len(sinks) == 1
+    assert sinks[0].released
+    assert len(sinks[0].packets) == 21
+    assert not recorder.recording
+    assert recorder.stats.events == 1
+
+
+def test_recorder_detects_motion_on_frames(tmp_path):
+    class Frames:
+        running = True
+
+        def __init__(self):
+            images = [np.zeros((8, 8), np.uint8)] * 3 + [np.full((8, 8), 255, np.uint8)]
+            self._frames = [Frame(image, i + 1, 1.0 + i) for i, image in enumerate(images)]
+
+        def start(self):
+            return self
+
+        def stop(self):
+            self.running = False
+
+        def subscribe(self):
+            return self
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            pass
+
+        def get(self, timeout=None):
+            if self._frames:
+                return self._frames.pop(0)
+            self.running = False
+            return None
+
+    class Recorder(MotionRecorder):
+        triggers = []
+
+        def trigger(self, timestamp=None):
+            self.triggers.append(timestamp)
+
+    recorder = Recorder(ListReader(1), str(tmp_path), detect_source=Frames())
+    recorder.start()
+    deadline = time.monotonic() + 5
+    while not recorder.triggers and time.monotonic() < deadline:
+        time.sleep(0.01)
+    recorder.stop()
+    assert recorder.triggers == [4.0]
+
+
+def write_video(path, frames=40, size=(64, 48), fps=10.0):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+    if not writer.isOpened():
+        pytest.skip("OpenCV cannot encode mp4v")
+    for i in range(frames):
+        image = np.zeros((size[1], size[0], 3), np.uint8)
+        image[:, : i % size[0]] = 255
+        writer.write(image)
+    writer.release()
+
+
+def count_frames(path):
+    capture = cv2.VideoCapture(str(path))
+    count = 0
+    while capture.read()[0]:
+        count += 1
+    capture.release()
+    return count
+
+
+def test_remuxes_packets_without_reencoding(tmp_path):
+    source = tmp_path / "source.mkv"
+    write_video(source)
+    reader = PacketReader(str(source), realtime=False)
+    reader.open()
+    packets = []
+    while (p := reader.read()) is not None:
+        packets.append(p)
+    reader.release()
+    assert len(packets) == 40
+    assert packets[0].keyframe
+    assert reader.format is not None and reader.format.size == (64, 48)
+
+    recorder = MotionRecorder(
+        PacketReader(str(source), realtime=False),
+        str(tmp_path / "out"),
+        post_roll=3600,
+    )
+    recorder.trigger(timestamp=time.monotonic())
+    recorder.start()
+    recorder.wait()
+    recorder.stop()
+
+    assert len(recorder.files) == 1
+    assert count_frames(recorder.files[0]) == 40
@@ -0,0 +1,73 @@
+import pytest
+
+from pycam.api.resilient import ResilientCameraAPI
+from pycam.errors import CircuitOpenError, CommandError
+from pycam.resilience import BreakerState, CircuitBreaker, RetryPolicy
+
+from .test_camera import make_api
+from .test_cached_api import FakeClock
+
+
+def make_resilient(api, attempts=3, threshold=3, clock=None):
+    sleeps = []
+    resilient = ResilientCameraAPI(
+        api,
+        policy=RetryPolicy(attempts=attempts, base_delay=0.1),
+        breaker=CircuitBreaker(threshold, reset_timeout=10.0, clock=clock or FakeClock()),
+        sleep=sleeps.append,
+    )
+    return resilient, sleeps
+
+
+def test_idempotent_calls_are_retried_with_backoff():
+    api = make_api()
+    info = api.get_info.return_value
+    api.get_info.side_effect = [CommandError("timeout"), CommandError("timeout"), info]
+    resilient, sleeps = make_resilient(api)
+
+    assert resilient.get_info() == info
+    assert api.get_info.call_count == 3
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 0.1 and 0 <= sleeps[1] <= 0.2
+
+
+def test_relative_moves_are_not_retried():
+    api = make_api()
+    api.move_motor.side_effect = CommandError("timeout")
+    resilient, sleeps = make_resilient(api)
+
+    with pytest.raises(CommandError):
+        resilient.move_motor(10.0, 0.0)
+    assert api.move_motor.call_count == 1
+
+
+def test_breaker_opens_and_fails_fast():
+    api = make_api()
+    api.reboot.side_effect = CommandError("unreachable")
+    clock = FakeClock()
+    resilient, _ = make_resilient(api, threshold=2, clock=clock)
+
+    for _ in range(2):
+        with pytest.raises(CommandError):
+            resilient.reboot()
+    with pytest.raises(CircuitOpenError) as exc_info:
+        resilient.get_info()
+
+    assert exc_info.value.retry_after == 10.0
+    assert api.get_info.call_count == 0
+    stats = resilient.breaker.stats
+    assert stats.state == BreakerState.OPEN
+    assert stats.rejected == 1 and stats.opened == 1
+
+
+def test_breaker_half_open_trial():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5.0, clock=clock)
+
+    with pytest.raises(ValueError):
+        breaker.call(lambda: (_ for _ in ()).throw(ValueError("down")))
+    clock.now = 5.0
+    assert breaker.state == BreakerState.HALF_OPEN
+
+    assert breaker.call(lambda: "up") == "up"
+    assert breaker.state == BreakerState.CLOSED
@@ -0,0 +1,76 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from pycam.api.session import SessionManager, TapoSession
+from pycam.api.tapo import PytapoClient
+from pycam.errors import CommandError
+
+from .test_tapo_api import FAKE_BASIC_INFO
+
+
+def make_config(host="192.168.1.42"):
+    return SimpleNamespace(host=host, user_cloud="admin", password_cloud="secret")
+
+
+def test_clients_of_same_host_share_session():
+    manager = SessionManager()
+    with patch("pycam.api.tapo.Tapo") as MockTapo:
+        first = PytapoClient(make_config(), session_manager=manager)
+        second = PytapoClient(make_config(), session_manager=manager)
+        other = PytapoClient(make_config(host="10.0.0.1"), session_manager=manager)
+
+    assert MockTapo.call_count == 2
+    assert first.session_stats.logins == 1
+    assert set(manager.stats()) == {"192.168.1.42", "10.0.0.1"}
+    del first, second, other
+    assert manager.stats() == {}
+
+
+def test_expired_session_is_reauthenticated():
+    manager = SessionManager()
+    with patch("pycam.api.tapo.Tapo") as MockTapo:
+        instance = MockTapo.return_value
+        instance.getBasicInfo.side_effect = [
+            Exception("Error: Invalid stok value, Response: {}"),
+            FAKE_BASIC_INFO,
+        ]
+        client = PytapoClient(make_config(), session_manager=manager)
+        info = client.get_info()
+
+    assert info["device_model"] == "C510W"
+    instance.close.assert_called_once()
+    stats = client.session_stats
+    assert stats.reauths == 1
+    assert stats.logins == 2
+    assert stats.last_reauth_latency >= 0
+
+
+def test_other_errors_are_not_retried():
+    manager = SessionManager()
+    with patch("pycam.api.tapo.Tapo") as MockTapo:
+        MockTapo.return_value.reboot.side_effect = Exception("device busy")
+        client = PytapoClient(make_config(), session_manager=manager)
+
+        with pytest.raises(CommandError):
+            client.reboot()
+
+    assert MockTapo.return_value.reboot.call_count == 1
+    assert client.session_stats.reauths == 0
+
+
+def test_relogin_rebuilds_client_without_close():
+    clients = []
+
+    def factory():
+        client = MagicMock(spec=["getBasicInfo"])
+        client.getBasicInfo.side_effect = (
+            [Exception("-40401")] if not clients else [FAKE_BASIC_INFO]
+        )
+        clients.append(client)
+        return client
+
+    session = TapoSession(factory)
+
+    assert session.client.getBasicInfo() == FAKE_BASIC_INFO
+    assert len(clients) == 2
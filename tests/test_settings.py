@@ -2,6 +2,7 @@ import tempfile
 import yaml
 from pycam.config.settings import CameraSettings
 from pycam.schemas import DayNightMode, VideoQuality
+from pycam.motion import HomingMode, MotorTimingProfile
 
 
 def test_camera_settings_loading():
@@ -33,3 +34,32 @@ def test_camera_settings_loading():
     assert settings.video_quality == VideoQuality.HIGH
     assert settings.start_position["pan"] == 10.5
     assert settings.start_position["tilt"] == 20.0
+    assert settings.homing_mode == HomingMode.AUTO
+    assert settings.homing_timeout == 5.0
+    assert settings.motion_min_interval is None
+    assert settings.motor_profile is None
+    assert settings.state_path is None
+    assert settings.presets == {}
+
+
+def test_presets_loading(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        yaml.dump({"presets": {"door": {"pan": 120, "tilt": 30.5}, "desk": {"pan": 10, "tilt": 0}}})
+    )
+
+    settings = CameraSettings(str(path))
+
+    assert settings.presets == {
+        "door": {"pan": 120.0, "tilt": 30.5},
+        "desk": {"pan": 10.0, "tilt": 0.0},
+    }
+
+
+def test_motor_profile_loading(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.dump({"motion": {"profile": {"pan_speed": 90, "tilt_speed": 45}}}))
+
+    settings = CameraSettings(str(path))
+
+    assert settings.motor_profile == MotorTimingProfile(pan_speed=90.0, tilt_speed=45.0)
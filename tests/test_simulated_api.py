@@ -0,0 +1,38 @@
+import pytest
+
+from pycam.api.simulated import SimulatedCameraAPI
+from pycam.camera import Camera
+from pycam.errors import CommandError
+from pycam.motion import HomingMode, MotorTimingProfile
+from pycam.schemas import DayNightMode, VideoResolution
+
+from .test_camera import make_config
+
+
+def test_simulated_device_state():
+    api = SimulatedCameraAPI(resolution=VideoResolution.RES_720P)
+
+    api.set_daynight_mode(DayNightMode.NIGHT)
+    api.flip_image(True)
+
+    assert api.get_daynight_mode() == DayNightMode.NIGHT
+    assert api.is_image_flipped() is True
+    assert api.get_video_specs()["resolution"] == VideoResolution.RES_720P
+    assert api.calls == 5
+
+
+def test_simulated_failures():
+    api = SimulatedCameraAPI(failure_rate=1.0)
+
+    with pytest.raises(CommandError):
+        api.get_info()
+
+
+def test_simulated_motor_homing_is_polled():
+    profile = MotorTimingProfile(pan_speed=1800.0, tilt_speed=900.0, latency=0.0)
+    api = SimulatedCameraAPI(motor_profile=profile)
+    camera = Camera(api, make_config(homing_mode=HomingMode.POLL))
+
+    # 360 degrees at 1800 deg/s
+    assert 0.2 <= camera.homing_time < 1.0
+    assert api.is_motor_moving()
@@ -0,0 +1,78 @@
+import cv2
+import numpy as np
+
+from pycam.camera import Camera
+from pycam.stream import FrameSource, SyntheticReader
+
+from .test_camera import make_api, make_config
+
+
+def test_synthetic_source_publishes_frames():
+    with FrameSource(SyntheticReader(64, 32, fps=0, count=5)) as source:
+        with source.subscribe(maxsize=10) as subscription:
+            frames = list(subscription)
+
+    assert [frame.seq for frame in frames] == [1, 2, 3, 4, 5]
+    assert frames[0].image.shape == (32, 64, 3)
+    assert source.latest().seq == 5
+
+
+def test_slow_subscriber_drops_oldest_frames():
+    source = FrameSource(SyntheticReader(16, 16, fps=0, count=20))
+    subscription = source.subscribe(maxsize=2)
+    source.start()
+    source.wait_frame(after_seq=19, timeout=1.0)
+
+    frames = list(subscription)
+    source.stop()
+
+    assert [frame.seq for frame in frames] == [19, 20]
+    assert subscription.dropped == 18
+
+
+def test_wait_frame_and_max_age():
+    with FrameSource(SyntheticReader(16, 16, fps=100)) as source:
+        frame = source.wait_frame(timeout=1.0)
+        newer = source.wait_frame(after_seq=frame.seq, timeout=1.0)
+
+    assert newer.seq > frame.seq
+    assert source.latest(max_age=0.0) is None
+
+
+def test_file_source(tmp_path):
+    path = str(tmp_path / "clip.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (32, 24))
+    for i in range(3):
+        writer.write(np.full((24, 32, 3), i * 50, dtype=np.uint8))
+    writer.release()
+
+    source = FrameSource(path).start()
+    frames = list(source.subscribe(maxsize=10))
+    source.stop()
+
+    assert len(frames) <= 3
+    assert source.latest().image.shape == (24, 32, 3)
+
+
+def test_camera_frame_source_is_shared(monkeypatch):
+    monkeypatch.setattr("pycam.camera.time.sleep", lambda _: None)
+    camera = Camera(make_api(), make_config())
+    camera.attach_frame_source(FrameSource(SyntheticReader(16, 16, fps=100)))
+
+    assert camera.frame_source() is camera.frame_source()
+    assert camera.frame_source().wait_frame(timeout=1.0) is not None
+    camera.close()
+
+
+def test_switch_keeps_subscribers():
+    source = FrameSource(SyntheticReader(16, 16, fps=200))
+    with source, source.subscribe(maxsize=100) as subscription:
+        first = subscription.get(timeout=1.0)
+        source.switch(SyntheticReader(32, 32, fps=200))
+
+        frame = subscription.get(timeout=1.0)
+        while frame is not None and frame.image.shape[0] != 32:
+            frame = subscription.get(timeout=1.0)
+
+    assert frame is not None and frame.seq > first.seq
+    assert source.stats.frames >= frame.seq
@@ -142,3 +142,24 @@ def test_is_image_flipped(mock_tapo, temp_config_file) -> None:
     client = PytapoClient(config)
     flipped = client.is_image_flipped()
     assert flipped is True
+
+
+def test_set_video_specs(mock_tapo, temp_config_file) -> None:
+    config = CameraConfig(config_path=str(temp_config_file))
+    client = PytapoClient(config)
+    client.set_video_specs(
+        {"resolution": VideoResolution.RES_720P, "bitrate": VideoBitrate.BR_512}
+    )
+
+    mock_tapo.executeFunction.assert_called_once_with(
+        "setVideoQualities",
+        {"video": {"main": {"bitrate": "512", "resolution": "1280*720"}}},
+    )
+
+
+def test_get_url_quality_override(mock_tapo, temp_config_file) -> None:
+    config = CameraConfig(config_path=str(temp_config_file))
+    client = PytapoClient(config)
+
+    assert client.get_url(config).endswith("/stream1")
+    assert client.get_url(config, VideoQuality.LOW).endswith("/stream2")
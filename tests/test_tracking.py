@@ -0,0 +1,190 @@
+import math
+import time
+
+import numpy as np
+import pytest
+
+from pycam.calibration import CameraCalibration
+from pycam.motion import MotionTimeModel, MotorTimingProfile
+from pycam.stream import Frame
+from pycam.tracking import PTZTracker, TrackingPolicy, pixel_to_angles
+
+from .test_cached_api import FakeClock
+
+CALIBRATION = CameraCalibration.default(1000, 800)  # fx = fy = 1000
+PROFILE = MotorTimingProfile(pan_speed=100.0, tilt_speed=50.0, latency=0.3)
+FPS = 10.0
+
+
+class PlantCamera:
+    """
+    Camera whose motor lands moves after the profile duration.
+
+    pan/tilt are the commanded position, like Camera; the view follows once
+    a move settled.
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.calibration = CALIBRATION
+        self.pan = 180.0
+        self.tilt = 45.0
+        self.commands = []
+        self._moves = []
+
+    def move_motor(self, pan, tilt):
+        self.commands.append((pan, tilt))
+        self._moves.append((self.clock() + PROFILE.duration(pan, tilt), pan, tilt))
+        self.pan += pan
+        self.tilt += tilt
+
+    def view(self, timestamp):
+        pan, tilt = self.pan, self.tilt
+        for settled_at, move_pan, move_tilt in self._moves:
+            if settled_at > timestamp:
+                pan -= move_pan
+                tilt -= move_tilt
+        return pan, tilt
+
+
+def target_pixel(camera, target, timestamp):
+    """Pixel where a target at absolute (pan, tilt) degrees is seen."""
+    view_pan, view_tilt = camera.view(timestamp)
+    fx, cx, cy = CALIBRATION.K[0, 0], CALIBRATION.K[0, 2], CALIBRATION.K[1, 2]
+    x = cx + fx * math.tan(math.radians(target[0] - view_pan))
+    y = cy - fx * math.tan(math.radians(target[1] - view_tilt))
+    return x, y
+
+
+def simulate(tracker, camera, clock, target, seconds, processing=0.05):
+    """Feeds frames captured at FPS, each processed `processing` seconds later."""
+    errors = []
+    for _ in range(int(seconds * FPS)):
+        captured = clock()
+        position = target(captured)
+        clock.now += processing
+        tracker.update(target_pixel(camera, position, captured), captured)
+        clock.now += 1 / FPS - processing
+        view = camera.view(clock())
+        errors.append((position[0] - view[0], position[1] - view[1]))
+    return errors
+
+
+def make_tracker(clock, **policy):
+    camera = PlantCamera(clock)
+    tracker = PTZTracker(
+        camera, policy=TrackingPolicy(**policy), profile=PROFILE, clock=clock
+    )
+    return camera, tracker
+
+
+def test_pixel_to_angles():
+    assert pixel_to_angles(CALIBRATION, (500, 400)) == pytest.approx((0.0, 0.0))
+    assert pixel_to_angles(CALIBRATION, (1500, 400)) == pytest.approx((45.0, 0.0))
+    assert pixel_to_angles(CALIBRATION, (500, 0)) == pytest.approx((0.0, 21.80), abs=0.01)
+    # A half size detection frame maps to the same angles
+    assert pixel_to_angles(CALIBRATION, (750, 200), (500, 400)) == pytest.approx((45.0, 0.0))
+
+
+def test_centers_static_target_without_overshoot():
+    clock = FakeClock()
+    camera, tracker = make_tracker(clock)
+
+    errors = simulate(tracker, camera, clock, lambda t: (200.0, 50.0), seconds=5)
+
+    pan_errors = [e[0] for e in errors]
+    assert abs(pan_errors[-1]) <= 2.0 and abs(errors[-1][1]) <= 2.0
+    assert min(pan_errors) > -2.0  # never overshot beyond the deadband
+    # Frames captured while a move is in flight do not trigger more moves
+    assert len(camera.commands) <= 3
+
+
+def test_ignores_errors_within_deadband():
+    clock = FakeClock()
+    camera, tracker = make_tracker(clock, deadband=2.0)
+
+    simulate(tracker, camera, clock, lambda t: (181.5, 44.0), seconds=2)
+
+    assert camera.commands == []
+    assert tracker.stats.updates == 20
+    assert tracker.stats.error == pytest.approx(math.hypot(1.5, 1.0), abs=0.01)
+
+
+def test_leads_moving_target():
+    def moving(t):
+        return 180.0 + 10.0 * t, 45.0
+
+    lagging = []
+    for kd in (0.0, 1.0):
+        clock = FakeClock()
+        camera, tracker = make_tracker(clock, kd=kd, ki=0.0)
+        errors = simulate(tracker, camera, clock, moving, seconds=6)
+        lagging.append(np.mean([abs(e[0]) for e in errors[30:]]))
+
+    assert lagging[1] < lagging[0]
+
+
+def test_reports_stats_every_interval():
+    clock = FakeClock()
+    reports = []
+    camera = PlantCamera(clock)
+    tracker = PTZTracker(
+        camera, profile=PROFILE, on_stats=reports.append, stats_interval=1.0, clock=clock
+    )
+
+    simulate(tracker, camera, clock, lambda t: (200.0, 45.0), seconds=3.5)
+
+    assert len(reports) == 3
+    assert reports[0].commands_per_second == pytest.approx(2.0, abs=0.1)
+    assert reports[-1].commands_per_second == 0.0
+    assert reports[0].mean_error > reports[-1].mean_error
+    assert tracker.stats.commands == len(camera.commands)
+
+
+def test_tracks_frames_of_source():
+    clock = FakeClock()
+    camera, tracker = make_tracker(clock)
+
+    class Frames:
+        running = True
+
+        def __init__(self):
+            self._frames = [Frame(np.zeros((400, 500), np.uint8), 1, 0.0)]
+
+        def subscribe(self, maxsize=1):
+            return self
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            pass
+
+        def get(self, timeout=None):
+            if self._frames:
+                return self._frames.pop(0)
+            self.running = False
+            return None
+
+    source = Frames()
+    tracker.start(source, lambda image: (750, 200))
+    deadline = time.monotonic() + 5
+    while source.running and time.monotonic() < deadline:
+        time.sleep(0.01)
+    tracker.stop()
+
+    # (750, 200) in a half size frame is 45 degrees right of center
+    assert camera.commands == [(pytest.approx(36.0), 0.0)]
+
+
+def test_tracker_follows_learned_motion_model():
+    clock = FakeClock()
+    camera = PlantCamera(clock)
+    camera.motion_model = MotionTimeModel(PROFILE)
+    tracker = PTZTracker(camera, clock=clock)
+    assert tracker.profile == PROFILE
+
+    for _ in range(20):
+        camera.motion_model.observe(90.0, 0.0, 2.0)
+
+    assert tracker.profile.duration(90.0, 0.0) == pytest.approx(2.0, abs=0.1)